@@ -5,8 +5,10 @@ cue ball contacts the object ball on the aim line. Cut- and spin-induced throw i
 ignored. Bank shots are not supported. Interfering balls are not detected.
 """
 
+from __future__ import annotations
+
 import math
-from typing import Dict, Iterable, List, Optional, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 import attrs
 import numpy as np
@@ -58,7 +60,202 @@ pocket_jaw_map: Dict[str, Jaw] = {
 }
 
 
-def potting_point_side(_: Ball, table: Table, pocket: Pocket) -> Coordinate:
+def _jaw_tip(table: Table, rail_id: str, edge_id: str) -> Coordinate:
+    """The intersection of a pocket's rail and edge cushion segments"""
+    rail = table.cushion_segments.linear[rail_id]
+    edge = table.cushion_segments.linear[edge_id]
+    return np.array(
+        find_intersection_2D(
+            l1x=rail.lx,
+            l1y=rail.ly,
+            l10=rail.l0,
+            l2x=edge.lx,
+            l2y=edge.ly,
+            l20=edge.l0,
+        )
+    )
+
+
+@attrs.define(frozen=True, eq=False)
+class PocketGeometry:
+    """The ball-independent geometry of a table's pockets
+
+    Everything about a pot that depends only on the table (jaw tips, potting points of
+    side pockets, etc.) is computed once and stored here as arrays, with one row per
+    pocket. Get the geometry of a table with :func:`get_pocket_geometry`, which caches
+    it.
+
+    Attributes:
+        pocket_ids:
+            The pocket IDs, in row order.
+        corner:
+            Whether each pocket is a corner pocket. Shape (P,).
+        center:
+            The pocket centers. Shape (P, 2).
+        left_tip:
+            The left jaw tips, *i.e.* the intersection of each pocket's left rail and
+            left edge. Shape (P, 2).
+        right_tip:
+            The right jaw tips. Shape (P, 2).
+        side_point:
+            The potting points of side pockets, which don't depend on the ball. NaN for
+            corner pockets. Shape (P, 2).
+        rail_intersection:
+            The intersection of the two rails of corner pockets. NaN for side pockets.
+            Shape (P, 2).
+        left_rail_unit:
+            The unit vectors of the left rails of corner pockets. NaN for side
+            pockets. Shape (P, 2).
+        right_rail_unit:
+            The unit vectors of the right rails of corner pockets. Shape (P, 2).
+        left_jaw_center:
+            The centers of the circular left jaw tip segments of side pockets. NaN for
+            corner pockets. Shape (P, 3).
+        right_jaw_center:
+            The centers of the circular right jaw tip segments. Shape (P, 3).
+        left_jaw_radius:
+            The radii of the circular left jaw tip segments. Shape (P,).
+        right_jaw_radius:
+            The radii of the circular right jaw tip segments. Shape (P,).
+        w:
+            The table width (see :attr:`pooltool.objects.table.datatypes.Table.w`).
+        l:
+            The table length (see :attr:`pooltool.objects.table.datatypes.Table.l`).
+    """
+
+    pocket_ids: Tuple[str, ...]
+    corner: NDArray[np.bool_]
+    center: NDArray[np.float64]
+    left_tip: NDArray[np.float64]
+    right_tip: NDArray[np.float64]
+    side_point: NDArray[np.float64]
+    rail_intersection: NDArray[np.float64]
+    left_rail_unit: NDArray[np.float64]
+    right_rail_unit: NDArray[np.float64]
+    left_jaw_center: NDArray[np.float64]
+    right_jaw_center: NDArray[np.float64]
+    left_jaw_radius: NDArray[np.float64]
+    right_jaw_radius: NDArray[np.float64]
+    w: float
+    l: float  # noqa F743
+
+    def index(self, pocket_id: str) -> int:
+        """Return the row of a pocket"""
+        return self.pocket_ids.index(pocket_id)
+
+    @classmethod
+    def from_table(cls, table: Table) -> PocketGeometry:
+        """Compute the pocket geometry of a table
+
+        Raises:
+            KeyError:
+                If the pocket and cushion segment IDs don't follow the layout of
+                :data:`pocket_jaw_map`.
+        """
+        pockets = list(table.pockets.values())
+        num_pockets = len(pockets)
+
+        def nans(*shape: int) -> NDArray[np.float64]:
+            return np.full((num_pockets, *shape), np.nan)
+
+        corner = np.zeros(num_pockets, dtype=np.bool_)
+        center = nans(2)
+        left_tip, right_tip = nans(2), nans(2)
+        side_point, rail_intersection = nans(2), nans(2)
+        left_rail_unit, right_rail_unit = nans(2), nans(2)
+        left_jaw_center, right_jaw_center = nans(3), nans(3)
+        left_jaw_radius, right_jaw_radius = nans(), nans()
+
+        for i, pocket in enumerate(pockets):
+            jaw = pocket_jaw_map[pocket.id]
+            lrail = table.cushion_segments.linear[jaw.left_rail]
+            rrail = table.cushion_segments.linear[jaw.right_rail]
+
+            corner[i] = jaw.corner
+            center[i] = pocket.center[:2]
+            left_tip[i] = _jaw_tip(table, jaw.left_rail, jaw.left_edge)
+            right_tip[i] = _jaw_tip(table, jaw.right_rail, jaw.right_edge)
+
+            if jaw.corner:
+                rail_intersection[i] = find_intersection_2D(
+                    l1x=lrail.lx,
+                    l1y=lrail.ly,
+                    l10=lrail.l0,
+                    l2x=rrail.lx,
+                    l2y=rrail.ly,
+                    l20=rrail.l0,
+                )
+                left_rail_unit[i] = unit_vector(lrail.p2 - lrail.p1)[:2]
+                right_rail_unit[i] = unit_vector(rrail.p2 - rrail.p1)[:2]
+            else:
+                side_point[i] = _midpoint_between_jaws(table, pocket)
+                ljaw_tip = table.cushion_segments.circular[jaw.left_tip]
+                rjaw_tip = table.cushion_segments.circular[jaw.right_tip]
+                left_jaw_center[i] = ljaw_tip.center
+                right_jaw_center[i] = rjaw_tip.center
+                left_jaw_radius[i] = ljaw_tip.radius
+                right_jaw_radius[i] = rjaw_tip.radius
+
+        return cls(
+            pocket_ids=tuple(pocket.id for pocket in pockets),
+            corner=corner,
+            center=center,
+            left_tip=left_tip,
+            right_tip=right_tip,
+            side_point=side_point,
+            rail_intersection=rail_intersection,
+            left_rail_unit=left_rail_unit,
+            right_rail_unit=right_rail_unit,
+            left_jaw_center=left_jaw_center,
+            right_jaw_center=right_jaw_center,
+            left_jaw_radius=left_jaw_radius,
+            right_jaw_radius=right_jaw_radius,
+            w=table.w,
+            l=table.l,
+        )
+
+
+_GEOMETRY_CACHE_SIZE = 64
+_geometry_cache: Dict[Tuple[int, ...], Tuple[Tuple[object, ...], PocketGeometry]] = {}
+
+
+def get_pocket_geometry(table: Table) -> PocketGeometry:
+    """Return the pocket geometry of a table, computing it only if it isn't cached
+
+    Copies of a table (:meth:`pooltool.objects.table.datatypes.Table.copy`) share
+    their cushion segments and pocket centers, which are immutable. So the cache is
+    keyed by the identity of those objects, and the geometry is computed once for a
+    table and all of its copies.
+    """
+    sources: List[object] = []
+    for pocket in table.pockets.values():
+        sources.append(pocket.center)
+        jaw = pocket_jaw_map.get(pocket.id)
+        if jaw is None:
+            continue
+        for segment_id in (
+            jaw.left_rail,
+            jaw.left_edge,
+            jaw.right_rail,
+            jaw.right_edge,
+        ):
+            sources.append(table.cushion_segments.linear.get(segment_id))
+        for segment_id in (jaw.left_tip, jaw.right_tip):
+            sources.append(table.cushion_segments.circular.get(segment_id))
+
+    # The cache entry holds references to the sources, so their IDs can't be reused
+    key = tuple(id(source) for source in sources)
+    if (entry := _geometry_cache.get(key)) is not None:
+        return entry[1]
+
+    geometry = PocketGeometry.from_table(table)
+    if len(_geometry_cache) >= _GEOMETRY_CACHE_SIZE:
+        _geometry_cache.clear()
+    _geometry_cache[key] = (tuple(sources), geometry)
+    return geometry
+
+
+def _midpoint_between_jaws(table: Table, pocket: Pocket) -> Coordinate:
     jaw = pocket_jaw_map[pocket.id]
     lrail = table.cushion_segments.linear[jaw.left_rail]
     rrail = table.cushion_segments.linear[jaw.right_rail]
@@ -84,6 +281,10 @@ def potting_point_side(_: Ball, table: Table, pocket: Pocket) -> Coordinate:
     return MBJ
 
 
+def potting_point_side(_: Ball, table: Table, pocket: Pocket) -> Coordinate:
+    return _midpoint_between_jaws(table, pocket)
+
+
 def potting_point_corner(ball: Ball, table: Table, pocket: Pocket) -> Coordinate:
     # Treatment varies if ball is considered "in the jaws of the pocket"
     potting_point = potting_point_jaw_treatment(ball, table, pocket)
@@ -323,15 +524,10 @@ def open_pockets(ball: Ball, table: Table, balls: Iterable[Ball]) -> Set[str]:
     An open pocket means that the ball has an unobscured path to the pocket, and that
     there is room to place a cue ball behind the object ball.
 
-    See also: viable_pockets
+    See also: viable_pockets, analyze_pots
     """
-    return set(
-        pocket.id
-        for pocket in table.pockets.values()
-        if not is_pocket_occluded(ball, table, pocket, balls)
-        and is_room_for_cue_ball(ball, table, pocket, balls)
-        and not is_jaw_in_way(ball, table, pocket)
-    )
+    # Which pockets are open doesn't depend on the cue ball
+    return analyze_pots(ball, list(balls), table, [ball]).open_pockets(ball.id)
 
 
 def required_precision(
@@ -347,34 +543,14 @@ def required_precision(
     value is exactly the variance in phi, within which you will still pot the ball. But,
     it _is_ still a proxy for how difficult the pot is.
     """
-    jaw = pocket_jaw_map[pocket.id]
-    lrail = table.cushion_segments.linear[jaw.left_rail]
-    ledge = table.cushion_segments.linear[jaw.left_edge]
-    rrail = table.cushion_segments.linear[jaw.right_rail]
-    redge = table.cushion_segments.linear[jaw.right_edge]
-
-    ltip = find_intersection_2D(
-        l1x=lrail.lx,
-        l1y=lrail.ly,
-        l10=lrail.l0,
-        l2x=ledge.lx,
-        l2y=ledge.ly,
-        l20=ledge.l0,
-    )
-    rtip = find_intersection_2D(
-        l1x=rrail.lx,
-        l1y=rrail.ly,
-        l10=rrail.l0,
-        l2x=redge.lx,
-        l2y=redge.ly,
-        l20=redge.l0,
-    )
+    geometry = get_pocket_geometry(table)
+    idx = geometry.index(pocket.id)
 
     phi_left = np.abs(
         calc_cut_angle(
             cue_state.rvw[0][:2],
             ball_state.rvw[0][:2],
-            np.array([*ltip]),
+            geometry.left_tip[idx],
         )
     )
 
@@ -382,7 +558,7 @@ def required_precision(
         calc_cut_angle(
             cue_state.rvw[0][:2],
             ball_state.rvw[0][:2],
-            np.array([*rtip]),
+            geometry.right_tip[idx],
         )
     )
 
@@ -410,31 +586,10 @@ def viable_pockets(
     Returns:
         list of (pocket_id, required_precision), ordered with lowest precision first
 
-    See also: open_pockets
+    See also: open_pockets, analyze_pots
     """
-
-    viable = []
-    for pocket in table.pockets.values():
-        cut_angle = np.abs(
-            calc_cut_angle(
-                cue.xyz[:2],
-                ball.xyz[:2],
-                get_potting_point(ball, table, pocket),
-            )
-        )
-
-        if (
-            not is_pocket_occluded(ball, table, pocket, balls)
-            and is_room_for_cue_ball(ball, table, pocket, balls)
-            and not is_jaw_in_way(ball, table, pocket)
-            and not is_object_ball_occluded(cue, ball, table, pocket, balls)
-            and cut_angle <= max_cut
-        ):
-            viable.append(
-                (pocket.id, required_precision(cue.state, ball.state, table, pocket))
-            )
-
-    return sorted(viable, key=lambda x: x[1])
+    analysis = analyze_pots(cue, list(balls), table, [ball])
+    return analysis.viable_pockets(ball.id, max_cut)
 
 
 def calc_shadow_ball_center(ball: Ball, table: Table, pocket: Pocket) -> Coordinate:
@@ -485,3 +640,316 @@ def pick_easiest_pot(
         return None
 
     return system.table.pockets[pocket_options[0][0]]
+
+
+def _angles_between(v1: NDArray[np.float64], v2: NDArray[np.float64]) -> NDArray:
+    """Vectorized :func:`pooltool.ptmath.angle_between_vectors` over the last axis"""
+    det = v1[..., 0] * v2[..., 1] - v1[..., 1] * v2[..., 0]
+    dot = v1[..., 0] * v2[..., 0] + v1[..., 1] * v2[..., 1]
+    return np.degrees(np.arctan2(det, dot))
+
+
+def _cut_angles(
+    cueball: NDArray[np.float64],
+    ghost_ball: NDArray[np.float64],
+    potting_point: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Vectorized :func:`calc_cut_angle`"""
+    return _angles_between(ghost_ball - cueball, potting_point - ghost_ball)
+
+
+def _occluded(
+    start: NDArray[np.float64],
+    end: NDArray[np.float64],
+    xy: NDArray[np.float64],
+    R: NDArray[np.float64],
+    ignore: NDArray[np.bool_],
+) -> NDArray[np.bool_]:
+    """Vectorized :func:`ball_ids_occluding_ballpath`
+
+    Args:
+        start: The starts of the ball paths. Shape (B, P, 2).
+        end: The ends of the ball paths. Shape (B, P, 2).
+        xy: The positions of the potentially occluding balls. Shape (N, 2).
+        R: The radii of the potentially occluding balls. Shape (N,).
+        ignore: Which balls to ignore for each path. Shape (B, N).
+
+    Returns:
+        Whether each path is occluded by any ball. Shape (B, P).
+    """
+    diff = end - start
+    rel = xy[None, None, :, :] - start[:, :, None, :]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (rel * diff[:, :, None, :]).sum(axis=-1) / (diff * diff).sum(axis=-1)[
+            ..., None
+        ]
+
+    closest = start[:, :, None, :] + diff[:, :, None, :] * t[..., None]
+    distance = np.sqrt(((closest - xy[None, None, :, :]) ** 2).sum(axis=-1))
+
+    occluding = (t >= 0) & (t <= 1) & (distance < 2 * R)
+    occluding &= ~ignore[:, None, :]
+    return occluding.any(axis=-1)
+
+
+@attrs.define(frozen=True, eq=False)
+class PotAnalysis:
+    """The pot geometry of every (object ball, pocket) pair on a table
+
+    Each array has one row per object ball (see :attr:`ball_ids`) and one column per
+    pocket (see :attr:`pocket_ids`). Create with :func:`analyze_pots`.
+
+    Attributes:
+        ball_ids:
+            The object ball IDs, in row order.
+        pocket_ids:
+            The pocket IDs, in column order.
+        potting_point:
+            The point the object ball should be sent towards (see
+            :func:`get_potting_point`). Shape (B, P, 2).
+        shadow_ball:
+            Where the cue ball contacts the object ball (see
+            :func:`calc_shadow_ball_center`). Shape (B, P, 2).
+        cut_angle:
+            The absolute cut angle, in degrees (see :func:`calc_cut_angle`).
+        precision:
+            The required precision (see :func:`required_precision`).
+        pocket_occluded:
+            Whether the object ball's path is occluded (see
+            :func:`is_pocket_occluded`).
+        room_for_cue_ball:
+            Whether there's room for the cue ball at the shadow ball (see
+            :func:`is_room_for_cue_ball`).
+        jaw_in_way:
+            Whether the closest jaw is in the way (see :func:`is_jaw_in_way`).
+        object_ball_occluded:
+            Whether the cue ball's path is occluded (see
+            :func:`is_object_ball_occluded`).
+    """
+
+    ball_ids: Tuple[str, ...]
+    pocket_ids: Tuple[str, ...]
+    potting_point: NDArray[np.float64]
+    shadow_ball: NDArray[np.float64]
+    cut_angle: NDArray[np.float64]
+    precision: NDArray[np.float64]
+    pocket_occluded: NDArray[np.bool_]
+    room_for_cue_ball: NDArray[np.bool_]
+    jaw_in_way: NDArray[np.bool_]
+    object_ball_occluded: NDArray[np.bool_]
+
+    @property
+    def open(self) -> NDArray[np.bool_]:
+        """Whether each pocket is open to each object ball (see :func:`open_pockets`)"""
+        return ~self.pocket_occluded & self.room_for_cue_ball & ~self.jaw_in_way
+
+    def viable(self, max_cut: float = 80) -> NDArray[np.bool_]:
+        """Whether each pot is viable (see :func:`viable_pockets`)"""
+        return self.open & ~self.object_ball_occluded & (self.cut_angle <= max_cut)
+
+    def open_pockets(self, ball_id: str) -> Set[str]:
+        """The IDs of pockets open to an object ball (see :func:`open_pockets`)"""
+        row = self.open[self.ball_ids.index(ball_id)]
+        return {
+            pocket_id for pocket_id, is_open in zip(self.pocket_ids, row) if is_open
+        }
+
+    def viable_pockets(
+        self, ball_id: str, max_cut: float = 80
+    ) -> List[Tuple[str, float]]:
+        """The viable pockets for an object ball (see :func:`viable_pockets`)
+
+        Returns:
+            list of (pocket_id, required_precision), ordered with lowest precision first
+        """
+        idx = self.ball_ids.index(ball_id)
+        viable = self.viable(max_cut)[idx]
+        precision = self.precision[idx]
+
+        return sorted(
+            (
+                (pocket_id, float(precision[j]))
+                for j, pocket_id in enumerate(self.pocket_ids)
+                if viable[j]
+            ),
+            key=lambda x: x[1],
+        )
+
+
+def analyze_pots(
+    cue: Ball,
+    balls: Sequence[Ball],
+    table: Table,
+    object_balls: Optional[Sequence[Ball]] = None,
+) -> PotAnalysis:
+    """Score every (object ball, pocket) pair at once
+
+    This is a vectorized equivalent of calling :func:`get_potting_point`,
+    :func:`calc_shadow_ball_center`, :func:`calc_cut_angle`,
+    :func:`required_precision`, :func:`is_pocket_occluded`,
+    :func:`is_room_for_cue_ball`, :func:`is_jaw_in_way`, and
+    :func:`is_object_ball_occluded` for each object ball and pocket. Rather than
+    looping over balls and pockets in Python, each test is computed for all pairs with
+    array operations, and the table geometry comes from :func:`get_pocket_geometry`.
+
+    Args:
+        cue:
+            The cue ball.
+        balls:
+            All of the balls on the table, which can occlude paths or take up the
+            shadow ball position.
+        table:
+            The table.
+        object_balls:
+            The object balls to analyze. By default, all balls in ``balls`` besides
+            ``cue``.
+
+    Returns:
+        PotAnalysis: The analysis.
+
+    Example:
+
+        >>> import pooltool as pt
+        >>> from pooltool.ai.pot.core import analyze_pots
+        >>> system = pt.System.example()
+        >>> cue_ball = system.balls["cue"]
+        >>> analysis = analyze_pots(cue_ball, list(system.balls.values()), system.table)
+        >>> analysis.viable_pockets("1")
+    """
+    geometry = get_pocket_geometry(table)
+
+    if object_balls is None:
+        object_balls = [ball for ball in balls if ball.id != cue.id]
+
+    # Object balls, shape (B, ...)
+    xyz = np.array([ball.xyz for ball in object_balls], dtype=np.float64).reshape(-1, 3)
+    xy = xyz[:, :2]
+    R = np.array([ball.params.R for ball in object_balls], dtype=np.float64)
+    pocketed = np.array([ball.state.s == const.pocketed for ball in object_balls])
+    ids = [ball.id for ball in object_balls]
+
+    # All balls, shape (N, ...)
+    others_xy = np.array([ball.xyz[:2] for ball in balls], dtype=np.float64)
+    others_xy = others_xy.reshape(-1, 2)
+    others_R = np.array([ball.params.R for ball in balls], dtype=np.float64)
+    others_ids = np.array([ball.id for ball in balls], dtype=object)
+    same_ball = others_ids[None, :] == np.array(ids, dtype=object)[:, None]
+
+    cue_xy = cue.xyz[:2]
+
+    # Potting points, shape (B, P, 2)
+    potting_point = np.broadcast_to(
+        geometry.side_point, (len(object_balls), *geometry.side_point.shape)
+    ).copy()
+
+    # Corner pockets. See potting_point_jaw_treatment
+    ltip, rtip = geometry.left_tip[None], geometry.right_tip[None]
+
+    def cross(c: NDArray[np.float64]) -> NDArray[np.float64]:
+        return (rtip[..., 0] - ltip[..., 0]) * (c[..., 1] - ltip[..., 1]) - (
+            c[..., 0] - ltip[..., 0]
+        ) * (rtip[..., 1] - ltip[..., 1])
+
+    in_jaws = cross(xy[:, None, :]) * cross(geometry.center[None]) >= 0
+
+    # See potting_point_corner
+    ball_to_ACI = geometry.rail_intersection[None] - xy[:, None, :]
+    lrail_unit = np.broadcast_to(geometry.left_rail_unit[None], ball_to_ACI.shape)
+    rrail_unit = np.broadcast_to(geometry.right_rail_unit[None], ball_to_ACI.shape)
+    lrail_unit = np.where(
+        ((ball_to_ACI * lrail_unit).sum(axis=-1) < 0)[..., None],
+        -lrail_unit,
+        lrail_unit,
+    )
+    rrail_unit = np.where(
+        ((ball_to_ACI * rrail_unit).sum(axis=-1) < 0)[..., None],
+        -rrail_unit,
+        rrail_unit,
+    )
+    theta_lrail = np.abs(_angles_between(ball_to_ACI, lrail_unit))
+    theta_rrail = np.abs(_angles_between(ball_to_ACI, rrail_unit))
+    closer_to_left = theta_lrail < theta_rrail
+    theta = 45.0 - np.where(closer_to_left, theta_lrail, theta_rrail)
+    offset_dir = np.where(closer_to_left[..., None], -rrail_unit, -lrail_unit)
+    offset_mag = np.sin(np.pi / 90 * theta) * R[:, None]
+    corner_point = geometry.rail_intersection[None] + offset_dir * offset_mag[..., None]
+    corner_point = np.where(in_jaws[..., None], geometry.center[None], corner_point)
+    potting_point[:, geometry.corner] = corner_point[:, geometry.corner]
+
+    # Shadow balls, shape (B, P, 2). See calc_shadow_ball_center
+    ball_to_pocket = potting_point - xy[:, None, :]
+    ball_to_pocket /= np.linalg.norm(ball_to_pocket, axis=-1, keepdims=True)
+    shadow_ball = xy[:, None, :] - ball_to_pocket * 2 * R[:, None, None]
+
+    # Cut angles and required precisions, shape (B, P)
+    cue_xy_b = np.broadcast_to(cue_xy, xy.shape)[:, None, :]
+    cut_angle = np.abs(_cut_angles(cue_xy_b, xy[:, None, :], potting_point))
+    precision = np.abs(
+        np.abs(_cut_angles(cue_xy_b, xy[:, None, :], geometry.left_tip[None]))
+        - np.abs(_cut_angles(cue_xy_b, xy[:, None, :], geometry.right_tip[None]))
+    )
+
+    # See is_pocket_occluded. Pocketed balls are never occluded
+    pocket_occluded = _occluded(
+        start=np.broadcast_to(xy[:, None, :], potting_point.shape),
+        end=potting_point,
+        xy=others_xy,
+        R=others_R,
+        ignore=same_ball | pocketed[:, None],
+    )
+
+    # See is_object_ball_occluded. Paths of a pocketed cue ball are never occluded
+    object_ball_occluded = _occluded(
+        start=np.broadcast_to(cue_xy, shadow_ball.shape),
+        end=shadow_ball,
+        xy=others_xy,
+        R=others_R,
+        ignore=same_ball
+        | (others_ids == cue.id)[None, :]
+        | (cue.state.s == const.pocketed),
+    )
+
+    # See is_room_for_cue_ball
+    x, y = shadow_ball[..., 0], shadow_ball[..., 1]
+    Rb = R[:, None]
+    in_bounds = (x >= Rb) & (x <= geometry.w - Rb) & (y >= Rb) & (y <= geometry.l - Rb)
+    shadow_to_others = np.linalg.norm(
+        others_xy[None, None, :, :] - shadow_ball[:, :, None, :], axis=-1
+    )
+    blocked = (shadow_to_others < 2 * others_R) & ~same_ball[:, None, :]
+    room_for_cue_ball = in_bounds & ~blocked.any(axis=-1)
+
+    # See is_jaw_in_way. Only side pockets have this problem
+    left_closer = np.linalg.norm(
+        geometry.left_jaw_center[None] - xyz[:, None, :], axis=-1
+    ) < np.linalg.norm(geometry.right_jaw_center[None] - xyz[:, None, :], axis=-1)
+    jaw_center = np.where(
+        left_closer[..., None],
+        geometry.left_jaw_center[None, :, :2],
+        geometry.right_jaw_center[None, :, :2],
+    )
+    jaw_radius = np.where(
+        left_closer, geometry.left_jaw_radius[None], geometry.right_jaw_radius[None]
+    )
+    diff = potting_point - xy[:, None, :]
+    t = ((jaw_center - xy[:, None, :]) * diff).sum(axis=-1) / (diff * diff).sum(
+        axis=-1
+    )
+    closest = xy[:, None, :] + diff * t[..., None]
+    jaw_in_way = (~geometry.corner)[None] & (
+        np.linalg.norm(closest - jaw_center, axis=-1) < jaw_radius + R[:, None]
+    )
+
+    return PotAnalysis(
+        ball_ids=tuple(ids),
+        pocket_ids=geometry.pocket_ids,
+        potting_point=potting_point,
+        shadow_ball=shadow_ball,
+        cut_angle=cut_angle,
+        precision=precision,
+        pocket_occluded=pocket_occluded,
+        room_for_cue_ball=room_for_cue_ball,
+        jaw_in_way=jaw_in_way,
+        object_ball_occluded=object_ball_occluded,
+    )
@@ -0,0 +1,338 @@
+"""An AI player that searches for shots by simulating them
+
+The geometric tools in :mod:`pooltool.ai.aim` and :mod:`pooltool.ai.pot` suggest where
+to aim, but they can't tell what a shot will actually lead to. :class:`CEMPlayer`
+instead samples candidate :class:`pooltool.ai.action.Action` objects, simulates them
+in batches (see :func:`pooltool.evolution.simulate_many`), scores each outcome with
+the game's ruleset (see :func:`score_shot`), and refines its sampling distribution
+around the best candidates with the cross-entropy method (CEM).
+
+Example:
+
+    >>> import pooltool as pt
+    >>> from pooltool.ai.search import CEMPlayer
+    >>> game = pt.get_ruleset(pt.GameType.NINEBALL)(
+    >>>     players=[pt.Player("Computer", ai=CEMPlayer(time_budget=2.0))]
+    >>> )
+    >>> system = pt.System(
+    >>>     cue=pt.Cue(cue_ball_id="cue"),
+    >>>     table=(table := pt.Table.from_game_type(pt.GameType.NINEBALL)),
+    >>>     balls=pt.get_rack(pt.GameType.NINEBALL, table),
+    >>> )
+    >>> ai = game.active_player.ai
+    >>> ai.apply(system, ai.decide(system, game))
+    >>> pt.simulate(system, inplace=True)
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, List, Optional, Tuple
+
+import attrs
+import numpy as np
+from numpy.typing import NDArray
+
+import pooltool.constants as const
+from pooltool.ai.action import Action
+from pooltool.ai.aim import at_ball
+from pooltool.ai.pot.core import calc_potting_angle, pick_easiest_pot
+from pooltool.evolution.event_based.simulate import simulate_many
+from pooltool.evolution.parallel import simulate_pool
+from pooltool.physics.engine import PhysicsEngine
+from pooltool.ruleset.datatypes import Ruleset
+from pooltool.system.datatypes import System
+
+WIN_SCORE = 100.0
+"""The score of a shot that wins the game (or minus this, if it loses the game)"""
+
+FOUL_SCORE = -10.0
+"""The score of an illegal shot"""
+
+CONTINUE_SCORE = 10.0
+"""The score of a legal shot after which the player continues shooting"""
+
+_PHI = 1
+"""The column of phi in an array of (V0, phi, theta, a, b) action parameters"""
+
+
+def score_shot(shot: System, game: Ruleset) -> float:
+    """Score a simulated shot from the perspective of the game's active player
+
+    The shot is judged with :meth:`pooltool.ruleset.datatypes.Ruleset.build_shot_info`,
+    which doesn't modify the game. Winning or losing the game scores
+    :data:`WIN_SCORE` or ``-WIN_SCORE``. Otherwise, an illegal shot scores
+    :data:`FOUL_SCORE`, a legal shot that keeps the turn scores
+    :data:`CONTINUE_SCORE`, and any other legal shot scores 0. The points the player
+    gained from the shot are added to the latter three.
+
+    Args:
+        shot:
+            A simulated shot.
+        game:
+            The game, in the state before the shot was played.
+
+    Returns:
+        float: The score. Higher is better.
+    """
+    info = game.build_shot_info(shot)
+    player = game.active_player.name
+
+    if info.game_over:
+        won = info.winner is not None and info.winner.name == player
+        return WIN_SCORE if won else -WIN_SCORE
+
+    points = info.score[player] - game.score[player]
+
+    if not info.legal:
+        return FOUL_SCORE + points
+
+    return (0.0 if info.turn_over else CONTINUE_SCORE) + points
+
+
+@attrs.define(frozen=True)
+class ActionBounds:
+    """The ranges that :class:`CEMPlayer` samples actions from
+
+    :attr:`pooltool.ai.action.Action.phi` is unbounded (it wraps around 360 degrees).
+
+    Attributes:
+        V0:
+            The range of cue speeds (see :attr:`pooltool.objects.cue.datatypes.Cue.V0`).
+        theta:
+            The range of cue elevations (see
+            :attr:`pooltool.objects.cue.datatypes.Cue.theta`).
+        a:
+            The range of side spins (see :attr:`pooltool.objects.cue.datatypes.Cue.a`).
+        b:
+            The range of top/bottom spins (see
+            :attr:`pooltool.objects.cue.datatypes.Cue.b`).
+    """
+
+    V0: Tuple[float, float] = (0.5, 5.0)
+    theta: Tuple[float, float] = (0.0, 20.0)
+    a: Tuple[float, float] = (-0.5, 0.5)
+    b: Tuple[float, float] = (-0.5, 0.5)
+
+    @property
+    def low(self) -> NDArray[np.float64]:
+        """The lower bounds of (V0, phi, theta, a, b)"""
+        return np.array([self.V0[0], 0.0, self.theta[0], self.a[0], self.b[0]])
+
+    @property
+    def high(self) -> NDArray[np.float64]:
+        """The upper bounds of (V0, phi, theta, a, b)"""
+        return np.array([self.V0[1], 360.0, self.theta[1], self.a[1], self.b[1]])
+
+    def clip(self, params: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Clip rows of (V0, phi, theta, a, b) into bounds, wrapping phi"""
+        clipped = np.clip(params, self.low, self.high)
+        clipped[:, _PHI] = params[:, _PHI] % 360
+        return clipped
+
+
+def _to_action(params: NDArray[np.float64]) -> Action:
+    return Action(*(float(param) for param in params))
+
+
+@attrs.define
+class CEMPlayer:
+    """An AI player that searches for the best shot with the cross-entropy method
+
+    Each call to :meth:`decide` runs a number of iterations. In each iteration, a
+    population of actions is sampled, every action is simulated, and the outcomes are
+    scored with :attr:`scorer`. The sampling distribution (an independent normal per
+    action parameter) is then refit to the top-scoring actions (the elites), and the
+    next iteration samples from it.
+
+    The first population is seeded with one action per legally hittable ball, aimed
+    to pot the ball into its easiest pocket (see
+    :func:`pooltool.ai.pot.core.pick_easiest_pot`) or, failing that, to hit it
+    full-ball. The remainder of the first population is sampled uniformly from
+    :attr:`bounds`.
+
+    The system is copied (and its history reset) once per decision. Every candidate is
+    simulated from a copy of that copy, which is cheap, since ball histories are
+    copy-on-write (see :meth:`pooltool.system.datatypes.System.copy`).
+
+    Note:
+        This player only chooses strike parameters. It doesn't place the cue ball when
+        it has ball-in-hand, and it doesn't call shots.
+
+    Attributes:
+        population:
+            The number of actions simulated per iteration.
+        elite:
+            The number of top-scoring actions the sampling distribution is fit to.
+        iterations:
+            The maximum number of iterations per decision.
+        time_budget:
+            The number of seconds a decision may take. The search stops once another
+            iteration is expected to exceed the budget, but at least one iteration
+            always runs.
+        workers:
+            If greater than 1, each population is simulated across this many
+            processes (see :func:`pooltool.evolution.parallel.simulate_pool`).
+            Otherwise, it's simulated in this process with
+            :func:`pooltool.evolution.simulate_many`.
+        bounds:
+            The ranges actions are sampled from.
+        min_std:
+            The smallest standard deviation of each of (V0, phi, theta, a, b). This
+            keeps the search from collapsing onto a single action too early.
+        scorer:
+            Scores a simulated shot, given the game in its pre-shot state. Higher is
+            better. Defaults to :func:`score_shot`.
+        engine:
+            The physics engine (see :func:`pooltool.evolution.simulate`).
+        max_events:
+            The maximum number of events per simulated shot (see
+            :func:`pooltool.evolution.simulate`). 0 means no limit.
+        seed:
+            A seed for the random number generator, for reproducible decisions.
+    """
+
+    population: int = attrs.field(default=64)
+    elite: int = attrs.field(default=8)
+    iterations: int = attrs.field(default=5)
+    time_budget: float = attrs.field(default=5.0)
+    workers: int = attrs.field(default=1)
+    bounds: ActionBounds = attrs.field(factory=ActionBounds)
+    min_std: Tuple[float, float, float, float, float] = attrs.field(
+        default=(0.05, 0.1, 0.5, 0.01, 0.01)
+    )
+    scorer: Callable[[System, Ruleset], float] = attrs.field(default=score_shot)
+    engine: Optional[PhysicsEngine] = attrs.field(default=None)
+    max_events: int = attrs.field(default=0)
+    seed: Optional[int] = attrs.field(default=None)
+
+    @elite.validator  # type: ignore
+    def _validate_elite(self, _, value: int) -> None:
+        if not 0 < value <= self.population:
+            raise ValueError(
+                f"elite must be between 1 and population ({self.population}), got "
+                f"{value}"
+            )
+
+    def decide(
+        self,
+        system: System,
+        game: Ruleset,
+        callback: Optional[Callable[[Action], None]] = None,
+    ) -> Action:
+        """Search for the best action
+
+        Args:
+            system:
+                The system, in its pre-shot state. It isn't modified.
+            game:
+                The game. It isn't modified.
+            callback:
+                If provided, it's called with the best action found so far, whenever
+                a better one is found.
+
+        Returns:
+            Action: The best action found.
+        """
+        start = time.perf_counter()
+        rng = np.random.default_rng(self.seed)
+
+        base = system.copy()
+        base.reset_history()
+
+        params = self._initial_population(base, game, rng)
+        best_params, best_score = params[0], -np.inf
+
+        for iteration in range(self.iterations):
+            iteration_start = time.perf_counter()
+
+            scores = np.array(self._evaluate(base, game, params))
+            order = np.argsort(-scores, kind="stable")
+
+            if scores[order[0]] > best_score:
+                best_params, best_score = params[order[0]], scores[order[0]]
+                if callback is not None:
+                    callback(_to_action(best_params))
+
+            now = time.perf_counter()
+            if now - start + (now - iteration_start) > self.time_budget:
+                break
+
+            mean, std = self._fit(params[order[: self.elite]])
+            params = self.bounds.clip(
+                rng.normal(mean, std, size=(self.population, len(mean)))
+            )
+
+        return _to_action(best_params)
+
+    def apply(self, system: System, action: Action) -> None:
+        """Set the cue stick of the system to the action"""
+        action.apply(system.cue)
+
+    def _initial_population(
+        self, system: System, game: Ruleset, rng: np.random.Generator
+    ) -> NDArray[np.float64]:
+        low, high = self.bounds.low, self.bounds.high
+        params = rng.uniform(low, high, size=(self.population, len(low)))
+
+        cue_ball = system.balls[system.cue.cue_ball_id]
+        target_ids = game.shot_constraints.hittable or tuple(
+            ball_id for ball_id in system.balls if ball_id != cue_ball.id
+        )
+
+        aimed: List[float] = []
+        for ball_id in target_ids:
+            ball = system.balls.get(ball_id)
+            if ball is None or ball.state.s == const.pocketed:
+                continue
+
+            pocket = pick_easiest_pot(system, ball)
+            aimed.append(
+                at_ball(cue_ball, ball)
+                if pocket is None
+                else calc_potting_angle(cue_ball, ball, system.table, pocket)
+            )
+
+        aimed = aimed[: self.population]
+        params[: len(aimed)] = (low + high) / 2
+        params[: len(aimed), _PHI] = aimed
+
+        return self.bounds.clip(params)
+
+    def _evaluate(
+        self, system: System, game: Ruleset, params: NDArray[np.float64]
+    ) -> List[float]:
+        shots = []
+        for row in params:
+            shot = system.copy()
+            self.apply(shot, _to_action(row))
+            shots.append(shot)
+
+        if self.workers > 1:
+            simulated = simulate_pool(
+                shots,
+                workers=self.workers,
+                engine=self.engine,
+                max_events=self.max_events,
+            )
+        else:
+            simulated = simulate_many(
+                shots,
+                engine=self.engine,
+                inplace=True,
+                max_events=self.max_events,
+            )
+
+        return [self.scorer(shot, game) for shot in simulated]
+
+    def _fit(
+        self, elites: NDArray[np.float64]
+    ) -> Tuple[NDArray[np.float64], NDArray[np.float64]]:
+        # phi wraps around, so it's averaged as offsets from the best elite's phi
+        centered = elites.copy()
+        anchor = elites[0, _PHI]
+        centered[:, _PHI] = anchor + (elites[:, _PHI] - anchor + 180) % 360 - 180
+
+        mean = centered.mean(axis=0)
+        std = np.maximum(centered.std(axis=0), self.min_std)
+        return mean, std
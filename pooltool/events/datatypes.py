@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 from functools import partial
-from typing import Any, Dict, Optional, Tuple, Type, Union, cast
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union, cast
 
 from attrs import define, evolve, field
 from cattrs.converters import Converter
 
-from pooltool.objects.ball.datatypes import Ball
+from pooltool.objects.ball.datatypes import Ball, BallState, _BallStateBuffer
 from pooltool.objects.cue.datatypes import Cue
 from pooltool.objects.datatypes import NullObject
 from pooltool.objects.table.components import (
@@ -147,7 +147,85 @@ _class_to_type: Dict[Type[Object], AgentType] = {
 _type_to_class = {v: k for k, v in _class_to_type.items()}
 
 
-@define
+AgentDecoder = Callable[[], Tuple[Optional[Object], Optional[Object]]]
+"""A callable that builds the initial and final states of a lazily loaded agent"""
+
+
+@define(eq=False)
+class AgentStateLog:
+    """Compact storage for the states of ball agents
+
+    By default, each ball agent stores its initial and final states as copies of the
+    ball (see :meth:`Agent.set_initial`). When given a log, a ball agent instead
+    records the ball's ``(rvw, s, t)`` state in the log's contiguous, growable arrays,
+    and holds only the index of that state. The ball's ID, parameters, ballset, and
+    orientation don't change during a simulation, so they're stored once per ball, in
+    a template shared between all of the ball's agents.
+
+    Agents build their balls from the log the first time :attr:`Agent.initial` or
+    :attr:`Agent.final` is accessed, so event methods like :meth:`Event.get_ball` work
+    as usual.
+
+    See Also:
+        - The ``compact_events`` argument of
+          :func:`pooltool.evolution.event_based.simulate.simulate`.
+    """
+
+    _templates: Dict[str, Ball] = field(factory=dict)
+    _buffer: _BallStateBuffer = field(factory=lambda: _BallStateBuffer.empty(64))
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def record(self, ball: Ball) -> int:
+        """Record the current state of a ball
+
+        Returns:
+            int: The index of the state in the log.
+        """
+        if ball.id not in self._templates:
+            self._templates[ball.id] = ball.copy(drop_history=True)
+
+        self._buffer.append(ball.state.rvw, ball.state.s, ball.state.t)
+        return len(self._buffer) - 1
+
+    def build(self, ball_id: str, idx: int) -> Ball:
+        """Build a ball from a recorded state
+
+        The returned ball doesn't share memory with the log.
+        """
+        template = self._templates[ball_id]
+        rvw, s, t = self._buffer.views()
+
+        return Ball(
+            id=template.id,
+            state=BallState(rvw[idx].copy(), int(s[idx]), float(t[idx])),
+            params=template.params,
+            ballset=template.ballset,
+            initial_orientation=template.initial_orientation,
+        )
+
+
+@define(eq=False)
+class _LoggedBallStates:
+    """An agent decoder that builds the agent's states from an AgentStateLog"""
+
+    log: AgentStateLog
+    ball_id: str
+    initial: Optional[int] = None
+    final: Optional[int] = None
+
+    def __call__(self) -> Tuple[Optional[Ball], Optional[Ball]]:
+        return self._build(self.initial), self._build(self.final)
+
+    def _build(self, idx: Optional[int]) -> Optional[Ball]:
+        return None if idx is None else self.log.build(self.ball_id, idx)
+
+    def copy(self) -> _LoggedBallStates:
+        return evolve(self)
+
+
+@define(eq=False, repr=False)
 class Agent:
     """An event agent.
 
@@ -160,15 +238,77 @@ class Agent:
         agent_type: The type of the agent.
         initial: The state of the agent before an event.
         final: The state of the agent after an event.
+        decoder:
+            If not None, ``initial`` and ``final`` are built by calling this the first
+            time either is accessed, rather than being stored up front. This is how
+            systems are loaded lazily (see
+            :meth:`pooltool.system.datatypes.System.load`), and how ball states are
+            stored compactly (see :class:`AgentStateLog`). Otherwise None (default).
     """
 
     id: str
     agent_type: AgentType
 
-    initial: Optional[Object] = field(default=None)
-    final: Optional[Object] = field(default=None)
+    _initial: Optional[Object] = field(default=None)
+    _final: Optional[Object] = field(default=None)
+    decoder: Optional[AgentDecoder] = field(default=None, eq=False, repr=False)
+
+    @property
+    def initial(self) -> Optional[Object]:
+        self._decode()
+        return self._initial
+
+    @initial.setter
+    def initial(self, obj: Optional[Object]) -> None:
+        self._decode()
+        self._initial = obj
+
+    @property
+    def final(self) -> Optional[Object]:
+        self._decode()
+        return self._final
+
+    @final.setter
+    def final(self, obj: Optional[Object]) -> None:
+        self._decode()
+        self._final = obj
+
+    @property
+    def decoded(self) -> bool:
+        """Whether the initial and final states have been built.
+
+        This is False only for lazily loaded agents whose states have yet to be
+        accessed.
+        """
+        return self.decoder is None
+
+    def _decode(self) -> None:
+        if self.decoder is None:
+            return
+
+        self._initial, self._final = self.decoder()
+        self.decoder = None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Agent):
+            return NotImplemented
+
+        return (
+            self.id == other.id
+            and self.agent_type == other.agent_type
+            and self.peek() == other.peek()
+        )
+
+    def __repr__(self) -> str:
+        # Peek, so that representing a lazy agent doesn't build its states for good
+        initial, final = self.peek()
+        return (
+            f"{self.__class__.__name__}(id={self.id!r}, "
+            f"agent_type={self.agent_type!r}, initial={initial!r}, "
+            f"final={final!r})"
+        )
 
-    def set_initial(self, obj: Object) -> None:
+    def set_initial(self, obj: Object, log: Optional[AgentStateLog] = None) -> None:
         """Sets the initial state of the agent (before event resolution).
 
         This makes a copy of the passed object and sets it to :attr:`initial`.
@@ -179,10 +319,18 @@ class Agent:
         Args:
             obj:
                 The object from which :attr:`initial` will be set.
+            log:
+                If passed, and this is a :attr:`AgentType.BALL` agent, only the ball's
+                state is recorded, in the log (see :class:`AgentStateLog`).
         """
         if self.agent_type == AgentType.NULL:
             return
 
+        if log is not None and self.agent_type == AgentType.BALL:
+            assert isinstance(obj, Ball)
+            self._logged_states(log).initial = log.record(obj)
+            return
+
         if self.agent_type == AgentType.BALL:
             # In this special case, we drop history fields prior to copying because they
             # are potentially huge and copying them is expensive
@@ -191,7 +339,7 @@ class Agent:
         else:
             self.initial = obj.copy()
 
-    def set_final(self, obj: Object) -> None:
+    def set_final(self, obj: Object, log: Optional[AgentStateLog] = None) -> None:
         """Sets the final state of the agent (after event resolution).
 
         This makes a copy of the passed object and sets it to :attr:`final`.
@@ -202,10 +350,18 @@ class Agent:
         Args:
             obj:
                 The object from which :attr:`final` will be set.
+            log:
+                If passed, and this is a :attr:`AgentType.BALL` agent, only the ball's
+                state is recorded, in the log (see :class:`AgentStateLog`).
         """
         if self.agent_type == AgentType.NULL:
             return
 
+        if log is not None and self.agent_type == AgentType.BALL:
+            assert isinstance(obj, Ball)
+            self._logged_states(log).final = log.record(obj)
+            return
+
         if self.agent_type == AgentType.BALL:
             # In this special case, we drop history fields prior to copying because they
             # are potentially huge and copying them is expensive
@@ -239,7 +395,47 @@ class Agent:
 
     def copy(self) -> Agent:
         """Create a copy."""
-        return evolve(self)
+        decoder = self.decoder
+        if isinstance(decoder, _LoggedBallStates):
+            # Unlike other decoders, this one is modified by set_initial/set_final
+            decoder = decoder.copy()
+
+        return evolve(self, decoder=decoder)
+
+    def peek(self) -> Tuple[Optional[Object], Optional[Object]]:
+        """Return the initial and final states.
+
+        Unlike :attr:`initial` and :attr:`final`, the states of a lazily loaded or
+        compactly stored agent (see :attr:`decoder`) are built without being kept,
+        so the agent stays compact.
+
+        Returns:
+            Tuple[Optional[Object], Optional[Object]]: The initial and final states.
+        """
+        if self.decoder is not None:
+            return self.decoder()
+
+        return self._initial, self._final
+
+    def _logged_states(self, log: AgentStateLog) -> _LoggedBallStates:
+        """Return the decoder that holds this agent's indices into the log"""
+        decoder = self.decoder
+        if isinstance(decoder, _LoggedBallStates) and decoder.log is log:
+            return decoder
+
+        # Carry over any states stored elsewhere
+        initial, final = self.peek()
+        decoder = _LoggedBallStates(log, self.id)
+        if initial is not None:
+            assert isinstance(initial, Ball)
+            decoder.initial = log.record(initial)
+        if final is not None:
+            assert isinstance(final, Ball)
+            decoder.final = log.record(final)
+
+        self._initial = self._final = None
+        self.decoder = decoder
+        return decoder
 
     def _get_state(self, initial: bool) -> Object:
         """Return either the initial or final state of the given agent.
@@ -253,12 +449,9 @@ class Agent:
         return obj
 
 
-def _disambiguate_agent_structuring(
-    uo: Dict[str, Any], _: Type[Agent], con: Converter
-) -> Agent:
-    id = con.structure(uo["id"], str)
-    agent_type = con.structure(uo["agent_type"], AgentType)
-
+def _structure_agent_states(
+    uo: Dict[str, Any], agent_type: AgentType, con: Converter
+) -> Tuple[Optional[Object], Optional[Object]]:
     # All agents but the NULL agent have initial states
     if agent_type == AgentType.NULL:
         initial = None
@@ -271,14 +464,33 @@ def _disambiguate_agent_structuring(
     else:
         final = None
 
+    return initial, final
+
+
+def _disambiguate_agent_structuring(
+    uo: Dict[str, Any], _: Type[Agent], con: Converter
+) -> Agent:
+    agent_type = con.structure(uo["agent_type"], AgentType)
+    initial, final = _structure_agent_states(uo, agent_type, con)
+
     return Agent(
-        id=id,
+        id=con.structure(uo["id"], str),
         agent_type=agent_type,
         initial=initial,  # type: ignore
         final=final,  # type: ignore
     )
 
 
+def _unstructure_agent(agent: Agent, con: Converter) -> Dict[str, Any]:
+    initial, final = agent.peek()
+    return {
+        "id": agent.id,
+        "agent_type": con.unstructure(agent.agent_type),
+        "initial": con.unstructure(initial),
+        "final": con.unstructure(final),
+    }
+
+
 conversion.register_structure_hook(
     cl=Agent,
     func=partial(
@@ -295,6 +507,12 @@ conversion.register_structure_hook(
     ),
     which=(SerializeFormat.MSGPACK,),
 )
+for fmt in SerializeFormat:
+    conversion.register_unstructure_hook(
+        cls=Agent,
+        func=partial(_unstructure_agent, con=conversion[fmt]),
+        which=(fmt,),
+    )
 
 
 @define
@@ -431,3 +649,44 @@ class Event:
 
         agent = self._find_agent(AgentType.POCKET, stick_id)
         return cast(Pocket, agent.initial)
+
+
+def structure_events_lazily(uo: List[Dict[str, Any]], con: Converter) -> List[Event]:
+    """Structure events whose agent states are built on first access
+
+    The event types, times, and agent IDs and types are structured immediately. The
+    initial and final states of each agent are structured from ``uo`` the first time
+    they're accessed (see :attr:`Agent.decoder`).
+
+    Args:
+        uo:
+            The unstructured events, *i.e.* the ``"events"`` of an unstructured
+            :class:`pooltool.system.datatypes.System`.
+        con:
+            The converter that ``uo`` was unstructured with.
+
+    Returns:
+        List[Event]: The events.
+    """
+    events: List[Event] = []
+    for uo_event in uo:
+        agents: List[Agent] = []
+        for uo_agent in uo_event["agents"]:
+            agent_type = con.structure(uo_agent["agent_type"], AgentType)
+            agents.append(
+                Agent(
+                    id=con.structure(uo_agent["id"], str),
+                    agent_type=agent_type,
+                    decoder=partial(_structure_agent_states, uo_agent, agent_type, con),
+                )
+            )
+
+        events.append(
+            Event(
+                event_type=con.structure(uo_event["event_type"], EventType),
+                agents=tuple(agents),
+                time=con.structure(uo_event["time"], float),
+            )
+        )
+
+    return events
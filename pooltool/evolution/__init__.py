@@ -1,9 +1,32 @@
 """Shot evolution algorithm routines"""
 
-from pooltool.evolution.continuize import continuize
-from pooltool.evolution.event_based.simulate import simulate
+import pooltool.evolution.event_based.stop as stop
+import pooltool.evolution.parallel as parallel
+from pooltool.evolution.continuize import continuize, sample, sample_all
+from pooltool.evolution.event_based.config import RecordMode
+from pooltool.evolution.event_based.profiling import Phase, SimulationStats
+from pooltool.evolution.event_based.simulate import (
+    Checkpoint,
+    checkpoint,
+    resume,
+    simulate,
+    simulate_iter,
+    simulate_many,
+)
 
 __all__ = [
+    "parallel",
+    "stop",
     "continuize",
+    "sample",
+    "sample_all",
+    "Checkpoint",
+    "checkpoint",
+    "resume",
+    "RecordMode",
+    "Phase",
+    "SimulationStats",
     "simulate",
+    "simulate_iter",
+    "simulate_many",
 ]
@@ -3,9 +3,16 @@
 For an explanation, see :func:`continuize`
 """
 
+from typing import Dict, List, Tuple
+
+import numpy as np
+from numba import jit
+from numpy.typing import ArrayLike, NDArray
+
+import pooltool.constants as const
 import pooltool.physics.evolve as evolve
-from pooltool.events import filter_ball
-from pooltool.objects.ball.datatypes import BallHistory, BallState
+from pooltool.events import Event, filter_ball
+from pooltool.objects.ball.datatypes import BallHistory
 from pooltool.system.datatypes import System
 
 
@@ -105,83 +112,423 @@ def continuize(system: System, dt: float = 0.01, inplace: bool = False) -> Syste
     num_timestamps = int(system.events[-1].time // dt) + 1
 
     for ball in system.balls.values():
-        # Create a new history and add the zeroth event
-        history = BallHistory()
-        history.add(ball.history[0])
-
-        rvw, s = ball.history[0].rvw, ball.history[0].s
-
         # Get all events that the ball is involved in, even the null_event events
         # that mark the start and end times
         events = filter_ball(system.events, ball.id, keep_nonevent=True)
-
-        # Tracks which event is currently being handled
-        count = 0
-
-        # The elapsed simulation time (as of the last timepoint)
-        elapsed = 0.0
-
-        for n in range(num_timestamps):
-            if n == (num_timestamps - 1):
-                # We made it to the end. the difference between the final time and
-                # the elapsed time should be < dt
-                assert events[-1].time - elapsed < dt
-                break
-
-            if events[count + 1].time - elapsed > dt:
-                # This is the easy case. There is no upcoming event so we simply
-                # evolve the state an amount dt
-                evolve_time = dt
-
-            else:
-                # The next event (and perhaps an arbitrary number of subsequent
-                # events) occurs before the next timestamp. Find the last event
-                # between the current timestamp and the next timestamp. This will be
-                # used as a launching point to simulate the ball state to the next
-                # timestamp
-
-                while True:
-                    count += 1
-
-                    if events[count + 1].time - elapsed > dt:
-                        # OK, we found the last event between the current timestamp
-                        # and the next timestamp. It is events[count].
-                        break
-
-                # We need to get the ball's outgoing state from the event. We'll
-                # evolve the system from this state.
-                state = events[count].get_ball(ball.id, initial=False).state.copy()
-
-                rvw, s = state.rvw, state.s
-
-                # Since this event occurs between two timestamps, we won't be
-                # evolving a full dt. Instead, we evolve this much:
-                evolve_time = elapsed + dt - events[count].time
-
-            # Whether it was the hard path or the easy path, the ball state is
-            # properly defined and we know how much we need to simulate.
-            rvw, s = evolve.evolve_ball_motion(
-                state=s,
-                rvw=rvw,
-                R=ball.params.R,
-                m=ball.params.m,
-                u_s=ball.params.u_s,
-                u_sp=ball.params.u_sp,
-                u_r=ball.params.u_r,
-                g=ball.params.g,
-                t=evolve_time,
-            )
-
-            history.add(BallState(rvw, s, elapsed + dt))
-            elapsed += dt
+        event_times, event_rvws, event_ss = _outgoing_states(events, ball.id)
+
+        # The history holds the zeroth event, a state for each timestamp except the
+        # last, and the final event (see below)
+        rvws = np.empty((num_timestamps + 1, 3, 3), dtype=np.float64)
+        ss = np.empty(num_timestamps + 1, dtype=np.float64)
+        ts = np.empty(num_timestamps + 1, dtype=np.float64)
+
+        initial = ball.history[0]
+        rvws[0], ss[0], ts[0] = initial.rvw, initial.s, initial.t
+
+        elapsed, count = _evolve_timestamps(
+            initial.rvw,
+            initial.s,
+            event_times,
+            event_rvws,
+            event_ss,
+            dt,
+            num_timestamps - 1,
+            ball.params.R,
+            ball.params.m,
+            ball.params.u_s,
+            ball.params.u_sp,
+            ball.params.u_r,
+            ball.params.g,
+            rvws[1:-1],
+            ss[1:-1],
+            ts[1:-1],
+        )
+
+        if count == _EVENTS_EXHAUSTED:
+            raise IndexError(f"Ran out of events while continuizing '{ball.id}'")
+        if count == _NO_BALL_STATE:
+            raise ValueError(f"Can't evolve '{ball.id}' from an event without it")
+
+        # We made it to the end. the difference between the final time and the
+        # elapsed time should be < dt
+        assert events[-1].time - elapsed < dt
 
         # There is a finale. The final state is missing from the continuous history,
         # whose final state is within dt of the true final state. We add the final
         # state to the continous history even though this breaks the promise of
         # uniformly spaced timestamps
-        history.add(ball.history[-1])
+        final = ball.history[-1]
+        rvws[-1], ss[-1], ts[-1] = final.rvw, final.s, final.t
 
         # Attach the newly created history to the ball
-        ball.history_cts = history
+        ball.history_cts = BallHistory.from_vectorization((rvws, ss, ts), buffered=True)
 
     return system
+
+
+def sample(system: System, ball_id: str, times: ArrayLike) -> BallHistory:
+    """Sample a ball's trajectory at arbitrary timepoints
+
+    This is a lazy alternative to :func:`continuize`. Rather than building a
+    time-dense history for every ball up front, the ball's state is calculated only
+    at the requested timepoints, and nothing is stored on the system.
+
+    For each timepoint, the governing event (the last event at or before the
+    timepoint) is found by binary searching the ball's event-based history
+    (:attr:`pooltool.objects.ball.datatypes.Ball.history`). The ball's outgoing state
+    from that event is then evolved analytically to the timepoint.
+
+    Note:
+        If a timepoint coincides with one or more events, the state *after* the events
+        is returned. For example, sampling at ``t=0`` yields the cue ball's state
+        after it has been struck.
+
+    Args:
+        system:
+            A simulated system.
+        ball_id:
+            The ID of the ball to sample.
+        times:
+            The timepoints to sample the ball state at. They must be non-decreasing and
+            lie between the start and end times of the simulation.
+
+    Returns:
+        BallHistory:
+            A buffered history (see
+            :meth:`pooltool.objects.ball.datatypes.BallHistory.buffered`) holding the
+            ball's state at each timepoint.
+
+    Raises:
+        ValueError:
+            If the system hasn't been simulated, if the timepoints are decreasing, or if
+            any timepoint lies outside the simulated time range.
+
+    Examples:
+        Get the cue ball's position for each frame of a 60fps video:
+
+        >>> import numpy as np
+        >>> import pooltool as pt
+        >>> system = pt.simulate(pt.System.example())
+        >>> frames = np.arange(0, system.t, 1 / 60)
+        >>> rvws, _, _ = pt.evolution.sample(system, "cue", frames).vectorize()
+        >>> xys = rvws[:, 0, :2]
+
+        After the cue strike, the states match those of a continuized system at the
+        same timepoints (up to floating point precision):
+
+        >>> continuized = pt.continuize(system, dt=0.01)
+        >>> rvws_cts, _, ts = continuized.balls["cue"].history_cts.vectorize()
+        >>> rvws, _, _ = pt.evolution.sample(system, "cue", ts[1:]).vectorize()
+        >>> np.allclose(rvws, rvws_cts[1:])
+        True
+
+    See Also:
+        - To sample every ball, see :func:`sample_all`.
+    """
+    ball = system.balls[ball_id]
+    times = _check_times(times)
+    rvws, ss, ts = _governing_states(system, ball_id, times)
+
+    rvws_out = np.empty((len(times), 3, 3), dtype=np.float64)
+    ss_out = np.empty(len(times), dtype=np.int64)
+
+    _evolve_from_governing_states(
+        rvws,
+        ss,
+        ts,
+        times,
+        ball.params.R,
+        ball.params.m,
+        ball.params.u_s,
+        ball.params.u_sp,
+        ball.params.u_r,
+        ball.params.g,
+        rvws_out,
+        ss_out,
+    )
+
+    return BallHistory.from_vectorization((rvws_out, ss_out, times), buffered=True)
+
+
+def sample_all(system: System, times: ArrayLike) -> Dict[str, BallHistory]:
+    """Sample the trajectories of all balls at arbitrary timepoints
+
+    The histories of all balls are stacked into one set of arrays, and every ball is
+    evaluated in a single just-in-time compiled call.
+
+    Args:
+        system:
+            A simulated system.
+        times:
+            See :func:`sample`.
+
+    Returns:
+        Dict[str, BallHistory]:
+            A dictionary of sampled histories, keyed by ball ID.
+
+    See Also:
+        - For details, see :func:`sample`.
+    """
+    times = _check_times(times)
+    balls = list(system.balls.values())
+    if not balls:
+        return {}
+
+    vectorizations = [_governing_states(system, ball.id, times) for ball in balls]
+    offsets = np.zeros(len(balls) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(ts) for _, _, ts in vectorizations])
+    rvws, ss, ts = (np.concatenate(arrays) for arrays in zip(*vectorizations))
+
+    params = [ball.params for ball in balls]
+    rvws_out = np.empty((len(balls), len(times), 3, 3), dtype=np.float64)
+    ss_out = np.empty((len(balls), len(times)), dtype=np.int64)
+
+    _evolve_all_from_governing_states(
+        rvws,
+        ss,
+        ts,
+        offsets,
+        times,
+        np.array([p.R for p in params], dtype=np.float64),
+        np.array([p.m for p in params], dtype=np.float64),
+        np.array([p.u_s for p in params], dtype=np.float64),
+        np.array([p.u_sp for p in params], dtype=np.float64),
+        np.array([p.u_r for p in params], dtype=np.float64),
+        np.array([p.g for p in params], dtype=np.float64),
+        rvws_out,
+        ss_out,
+    )
+
+    return {
+        ball.id: BallHistory.from_vectorization(
+            (rvws_out[i], ss_out[i], times), buffered=True
+        )
+        for i, ball in enumerate(balls)
+    }
+
+
+def _check_times(times: ArrayLike) -> NDArray[np.float64]:
+    times = np.asarray(times, dtype=np.float64)
+
+    if (np.diff(times) < 0).any():
+        raise ValueError("Timepoints must be non-decreasing")
+
+    return times
+
+
+def _governing_states(
+    system: System, ball_id: str, times: NDArray[np.float64]
+) -> Tuple[NDArray[np.float64], NDArray[np.int64], NDArray[np.float64]]:
+    """Vectorize a ball's history, checking that it spans the timepoints"""
+    if (vectorization := system.balls[ball_id].history.vectorize()) is None:
+        raise ValueError(f"'{ball_id}' has no history. Has the system been simulated?")
+
+    ts = vectorization[2]
+    if len(times) and (times[0] < ts[0] or times[-1] > ts[-1]):
+        raise ValueError(
+            f"Timepoints must lie within the simulated time range [{ts[0]}, {ts[-1]}]"
+        )
+
+    return vectorization
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def _evolve_from_governing_states(
+    rvws: NDArray[np.float64],
+    ss: NDArray[np.int64],
+    ts: NDArray[np.float64],
+    times: NDArray[np.float64],
+    R: float,
+    m: float,
+    u_s: float,
+    u_sp: float,
+    u_r: float,
+    g: float,
+    rvws_out: NDArray[np.float64],
+    ss_out: NDArray[np.int64],
+) -> None:
+    """Evolve the governing state of each timepoint, writing into the out arrays"""
+    # The index of the last state at or before each timepoint
+    idxs = np.searchsorted(ts, times, side="right") - 1
+
+    for n in range(len(times)):
+        idx = idxs[n]
+
+        rvw, s = evolve.evolve_ball_motion(
+            state=int(ss[idx]),
+            rvw=rvws[idx],
+            R=R,
+            m=m,
+            u_s=u_s,
+            u_sp=u_sp,
+            u_r=u_r,
+            g=g,
+            t=times[n] - ts[idx],
+        )
+
+        rvws_out[n] = rvw
+        ss_out[n] = s
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def _evolve_all_from_governing_states(
+    rvws: NDArray[np.float64],
+    ss: NDArray[np.int64],
+    ts: NDArray[np.float64],
+    offsets: NDArray[np.int64],
+    times: NDArray[np.float64],
+    R: NDArray[np.float64],
+    m: NDArray[np.float64],
+    u_s: NDArray[np.float64],
+    u_sp: NDArray[np.float64],
+    u_r: NDArray[np.float64],
+    g: NDArray[np.float64],
+    rvws_out: NDArray[np.float64],
+    ss_out: NDArray[np.int64],
+) -> None:
+    """Like :func:`_evolve_from_governing_states`, but for stacked histories
+
+    The states of ball ``i`` are rows ``offsets[i]`` to ``offsets[i + 1]`` of the
+    stacked arrays, and its evolved states are written to ``rvws_out[i]`` and
+    ``ss_out[i]``.
+    """
+    for i in range(len(offsets) - 1):
+        start, stop = offsets[i], offsets[i + 1]
+        _evolve_from_governing_states(
+            rvws[start:stop],
+            ss[start:stop],
+            ts[start:stop],
+            times,
+            R[i],
+            m[i],
+            u_s[i],
+            u_sp[i],
+            u_r[i],
+            g[i],
+            rvws_out[i],
+            ss_out[i],
+        )
+
+
+_EVENTS_EXHAUSTED = -1
+"""Returned by :func:`_evolve_timestamps` when it runs past the last event"""
+
+_NO_BALL_STATE = -2
+"""Returned by :func:`_evolve_timestamps` when it launches from a ball-less event"""
+
+
+def _outgoing_states(
+    events: List[Event], ball_id: str
+) -> Tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    """Gather the times and outgoing ball states of a ball's events
+
+    Events that don't involve the ball (i.e. the null events that mark the start and
+    end times) are given a motion state of -1.
+    """
+    times = np.empty(len(events), dtype=np.float64)
+    rvws = np.zeros((len(events), 3, 3), dtype=np.float64)
+    ss = np.full(len(events), -1.0, dtype=np.float64)
+
+    for idx, event in enumerate(events):
+        times[idx] = event.time
+
+        if not event.event_type.has_ball():
+            continue
+
+        state = event.get_ball(ball_id, initial=False).state
+        rvws[idx], ss[idx] = state.rvw, state.s
+
+    return times, rvws, ss
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def _evolve_timestamps(
+    rvw: NDArray[np.float64],
+    s: int,
+    event_times: NDArray[np.float64],
+    event_rvws: NDArray[np.float64],
+    event_ss: NDArray[np.float64],
+    dt: float,
+    num_steps: int,
+    R: float,
+    m: float,
+    u_s: float,
+    u_sp: float,
+    u_r: float,
+    g: float,
+    rvws_out: NDArray[np.float64],
+    ss_out: NDArray[np.float64],
+    ts_out: NDArray[np.float64],
+) -> Tuple[float, int]:
+    """Evolve a ball through each timestamp, writing the states into the out arrays
+
+    Returns:
+        Tuple[float, int]:
+            The elapsed simulation time (as of the last timepoint), and the index of
+            the last event that the ball was launched from (or one of the negative
+            error codes).
+    """
+    # Tracks which event is currently being handled
+    count = 0
+
+    # The elapsed simulation time (as of the last timepoint)
+    elapsed = 0.0
+
+    num_events = len(event_times)
+
+    for n in range(num_steps):
+        if count + 1 >= num_events:
+            return elapsed, _EVENTS_EXHAUSTED
+
+        if event_times[count + 1] - elapsed > dt:
+            # This is the easy case. There is no upcoming event so we simply evolve
+            # the state an amount dt
+            evolve_time = dt
+
+        else:
+            # The next event (and perhaps an arbitrary number of subsequent events)
+            # occurs before the next timestamp. Find the last event between the
+            # current timestamp and the next timestamp. This will be used as a
+            # launching point to simulate the ball state to the next timestamp
+            while True:
+                count += 1
+
+                if count + 1 >= num_events:
+                    return elapsed, _EVENTS_EXHAUSTED
+
+                if event_times[count + 1] - elapsed > dt:
+                    # OK, we found the last event between the current timestamp and
+                    # the next timestamp. It is events[count].
+                    break
+
+            if event_ss[count] < 0:
+                return elapsed, _NO_BALL_STATE
+
+            # We evolve the system from the ball's outgoing state.
+            rvw, s = event_rvws[count].copy(), int(event_ss[count])
+
+            # Since this event occurs between two timestamps, we won't be evolving a
+            # full dt. Instead, we evolve this much:
+            evolve_time = elapsed + dt - event_times[count]
+
+        # Whether it was the hard path or the easy path, the ball state is properly
+        # defined and we know how much we need to simulate.
+        rvw, s = evolve.evolve_ball_motion(
+            state=s,
+            rvw=rvw,
+            R=R,
+            m=m,
+            u_s=u_s,
+            u_sp=u_sp,
+            u_r=u_r,
+            g=g,
+            t=evolve_time,
+        )
+
+        rvws_out[n] = rvw
+        ss_out[n] = s
+        ts_out[n] = elapsed + dt
+        elapsed += dt
+
+    return elapsed, count
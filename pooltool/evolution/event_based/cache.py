@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Dict, Set, Tuple
+import heapq
+import itertools
+from functools import partial
+from typing import Any, Callable, Dict, Generic, Iterable, List, Set, Tuple, TypeVar
 
 import attrs
 import numpy as np
@@ -23,6 +26,219 @@ from pooltool.events.utils import event_type_to_ball_indices
 from pooltool.objects.ball.datatypes import Ball
 from pooltool.system.datatypes import System
 
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _event_time(event: Event) -> float:
+    return event.time
+
+
+class HeapDict(Dict[K, V], Generic[K, V]):
+    """A dictionary that can cheaply retrieve the key with the smallest value
+
+    Alongside the dictionary, a binary heap of ``(priority, order, key)`` entries is
+    maintained, where ``priority`` is derived from the value and ``order`` records when
+    the key was inserted. Setting an item pushes an entry onto the heap in O(log n).
+    Removing an item does nothing to the heap. Instead, stale entries are discarded
+    lazily whenever they surface to the top of the heap (see :meth:`peek`). This makes
+    :meth:`peek` amortized O(log n), rather than the O(n) of ``min(d, key=d.get)``.
+
+    Ties are broken by insertion order, so :meth:`peek` always returns the same key as
+    ``min(d, key=lambda k: priority(d[k]))`` would.
+
+    Args:
+        priority:
+            Maps a value to its priority. Defaults to the value itself.
+    """
+
+    def __init__(
+        self, *args: Any, priority: Callable[[V], float] = _identity, **kwargs: Any
+    ) -> None:
+        super().__init__()
+        self._priority = priority
+        self._heap: List[Tuple[float, int, K]] = []
+        self._order: Dict[K, int] = {}
+        self._counter = itertools.count()
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key: K, value: V) -> None:
+        if key not in self:
+            self._order[key] = next(self._counter)
+            self._on_insert(key)
+
+        super().__setitem__(key, value)
+        heapq.heappush(self._heap, (self._priority(value), self._order[key], key))
+
+        if len(self._heap) > 2 * len(self) + 64:
+            self._rebuild()
+
+    def __delitem__(self, key: K) -> None:
+        super().__delitem__(key)
+        del self._order[key]
+        self._on_remove(key)
+
+    def __reduce__(self) -> Tuple[Callable[..., Any], Tuple[Any, ...]]:
+        return partial(self.__class__, priority=self._priority), (list(self.items()),)
+
+    def pop(self, key: K, *default: Any) -> Any:
+        if key in self:
+            self._order.pop(key)
+            self._on_remove(key)
+        return super().pop(key, *default)
+
+    def popitem(self) -> Tuple[K, V]:
+        key, value = super().popitem()
+        del self._order[key]
+        self._on_remove(key)
+        return key, value
+
+    def clear(self) -> None:
+        for key in self:
+            self._on_remove(key)
+        super().clear()
+        self._heap.clear()
+        self._order.clear()
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        items: Dict[Any, V] = dict(*args, **kwargs)
+        for key, value in items.items():
+            self[key] = value
+
+    def setdefault(self, key: K, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def copy(self) -> HeapDict[K, V]:
+        return self.__class__(self, priority=self._priority)
+
+    def peek(self) -> K:
+        """Return the key with the smallest priority
+
+        Raises:
+            ValueError: If the dictionary is empty.
+        """
+        heap = self._heap
+
+        while heap:
+            priority, order, key = heap[0]
+            if (
+                self._order.get(key) == order
+                and self._priority(super().__getitem__(key)) == priority
+            ):
+                return key
+
+            # The entry is stale. The key was removed or given a new value
+            heapq.heappop(heap)
+
+        raise ValueError("peek from an empty HeapDict")
+
+    def _rebuild(self) -> None:
+        """Rebuild the heap from scratch, purging stale entries"""
+        self._heap = [
+            (self._priority(value), self._order[key], key)
+            for key, value in self.items()
+        ]
+        heapq.heapify(self._heap)
+
+    def _on_insert(self, key: K) -> None:
+        """Called whenever a new key is added. Meant to be overridden"""
+
+    def _on_remove(self, key: K) -> None:
+        """Called whenever a key is removed. Meant to be overridden"""
+
+
+class CollisionTimes(HeapDict[Tuple[str, str], float]):
+    """The cached collision times of one event type
+
+    A :class:`HeapDict` mapping object ID pairs to collision times that additionally
+    indexes the pairs by the IDs of the balls they involve. This way, the pairs
+    involving a given ball are found without scanning every cached pair (see
+    :meth:`keys_involving`).
+
+    Args:
+        ball_indices:
+            The positions of ball IDs within each key, *e.g.* ``(0, 1)`` for ball-ball
+            pairs and ``(0,)`` for ball-cushion pairs.
+    """
+
+    def __init__(
+        self, *args: Any, ball_indices: Iterable[int] = (), **kwargs: Any
+    ) -> None:
+        self._ball_indices = tuple(ball_indices)
+        self._keys_by_ball: Dict[str, Set[Tuple[str, str]]] = {}
+        self._fresh: Set[Tuple[str, str]] = set()
+        super().__init__(*args, **kwargs)
+
+        # The initial times count as cached
+        self._fresh.clear()
+
+    def __setitem__(self, key: Tuple[str, str], value: float) -> None:
+        super().__setitem__(key, value)
+        self._fresh.add(key)
+
+    def __reduce__(self) -> Tuple[Callable[..., Any], Tuple[Any, ...]]:
+        cls = partial(self.__class__, ball_indices=self._ball_indices)
+        return cls, (list(self.items()),)
+
+    def copy(self) -> CollisionTimes:
+        other = self.__class__(self, ball_indices=self._ball_indices)
+        other._fresh = set(self._fresh)
+        return other
+
+    def keys_involving(self, ball_id: str) -> Set[Tuple[str, str]]:
+        """Return the cached keys involving a ball
+
+        Note:
+            The returned set is a live view of the index. Copy it before deleting keys
+            while iterating over it.
+        """
+        return self._keys_by_ball.get(ball_id, set())
+
+    def pop_fresh(self) -> Set[Tuple[str, str]]:
+        """Return the keys set since the last call, and reset them"""
+        fresh, self._fresh = self._fresh, set()
+        return fresh
+
+    def _on_insert(self, key: Tuple[str, str]) -> None:
+        for idx in self._ball_indices:
+            self._keys_by_ball.setdefault(key[idx], set()).add(key)
+
+    def _on_remove(self, key: Tuple[str, str]) -> None:
+        for idx in self._ball_indices:
+            if (keys := self._keys_by_ball.get(key[idx])) is not None:
+                keys.discard(key)
+
+
+def _as_transitions(transitions: Dict[str, Event]) -> HeapDict[str, Event]:
+    if isinstance(transitions, HeapDict):
+        return transitions
+    return HeapDict(transitions, priority=_event_time)
+
+
+def _collision_times(
+    event_type: EventType, times: Dict[Tuple[str, str], float]
+) -> CollisionTimes:
+    if isinstance(times, CollisionTimes):
+        return times
+
+    ball_indices = sorted(event_type_to_ball_indices.get(event_type, ()))
+    return CollisionTimes(times, ball_indices=ball_indices)
+
+
+def _as_times(
+    times: Dict[EventType, Dict[Tuple[str, str], float]],
+) -> Dict[EventType, CollisionTimes]:
+    return {
+        event_type: _collision_times(event_type, event_times)
+        for event_type, event_times in times.items()
+    }
+
 
 def _null() -> Dict[str, Event]:
     return {"null": null_event(time=np.inf)}
@@ -33,7 +249,8 @@ class TransitionCache:
     """A cache for managing and retrieving the next transition events for balls.
 
     This class maintains a dictionary of transitions, where each key is ball ID, and
-    each value is the next transition associated with that object.
+    each value is the next transition associated with that object. The dictionary is a
+    :class:`HeapDict`, so the next transition is retrieved in O(log n) time.
 
     Attributes:
         transitions:
@@ -45,20 +262,44 @@ class TransitionCache:
           event caching, see :class:`CollisionCache`.
     """
 
-    transitions: Dict[str, Event] = attrs.field(factory=_null)
+    transitions: Dict[str, Event] = attrs.field(
+        factory=_null, converter=_as_transitions
+    )
 
     def get_next(self) -> Event:
-        return min(
-            (trans for trans in self.transitions.values()), key=lambda event: event.time
-        )
+        assert isinstance(self.transitions, HeapDict)
+        return self.transitions[self.transitions.peek()]
 
     def update(self, event: Event) -> None:
         """Update transition cache for all balls in Event"""
         for agent in event.agents:
             if agent.agent_type == AgentType.BALL:
-                assert isinstance(ball := agent.final, Ball)
+                # Peek, so that compactly stored agents (see AgentStateLog) aren't
+                # expanded into full copies of their balls
+                _, ball = agent.peek()
+                assert isinstance(ball, Ball)
                 self.transitions[agent.id] = _next_transition(ball)
 
+    def invalidate(self, shot: System, ball_ids: Iterable[str]) -> None:
+        """Recalculate the next transitions of balls whose states were modified"""
+        for ball_id in ball_ids:
+            self.transitions[ball_id] = _next_transition(shot.balls[ball_id])
+
+    def copy(self) -> TransitionCache:
+        """Create a copy
+
+        The cached events are copied too, since an event's agents are modified when
+        the event is resolved.
+        """
+        return TransitionCache(
+            {
+                ball_id: attrs.evolve(
+                    event, agents=tuple(agent.copy() for agent in event.agents)
+                )
+                for ball_id, event in self.transitions.items()
+            }
+        )
+
     @classmethod
     def create(cls, shot: System) -> TransitionCache:
         return cls(
@@ -99,6 +340,43 @@ def _next_transition(ball: Ball) -> Event:
         raise NotImplementedError(f"Unknown '{ball.state.s=}'")
 
 
+@attrs.define
+class CacheStats:
+    """Counters describing how effective a :class:`CollisionCache` is
+
+    Attributes:
+        hits:
+            The number of lookups of the soonest collision (see
+            :meth:`CollisionCache.get_next`) answered by a collision time that was
+            cached before the previous lookup.
+        misses:
+            The number of lookups of the soonest collision answered by a collision
+            time that was calculated (or culled) since the previous lookup.
+        invalidations:
+            The number of cached collision times that were removed because an event
+            involved one of their balls.
+
+    Properties:
+        hit_rate:
+            The fraction of lookups that are hits.
+    """
+
+    hits: int = attrs.field(default=0)
+    misses: int = attrs.field(default=0)
+    invalidations: int = attrs.field(default=0)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def merge(self, other: CacheStats) -> None:
+        """Add the counters of another cache to these counters"""
+        self.hits += other.hits
+        self.misses += other.misses
+        self.invalidations += other.invalidations
+
+
 @attrs.define
 class CollisionCache:
     """A cache for storing and managing collision times between objects.
@@ -117,7 +395,23 @@ class CollisionCache:
         times:
             A dictionary where each key is an event type, and each value is another
             dictionary mapping tuples of object IDs to their corresponding collision
-            times.
+            times. The inner dictionaries are :class:`HeapDict` objects, so the soonest
+            collision of each event type is retrieved in O(log n) time. Invalidated
+            collisions are removed from the heaps lazily.
+        broad_phase:
+            If True (default), object pairs whose paths can't meet before the next
+            ball transition are culled with a cheap bounding box test and cached with
+            a collision time of ``np.inf``, so that no collision time has to be solved
+            for them. Set to False to solve every pair exhaustively (*e.g.* for
+            validation). Both modes yield the same events.
+        bounded:
+            If True (default), collision quartics that have no root before the next
+            transition of either of their balls are cached with a collision time of
+            ``np.inf`` without being solved. This is independent of
+            :attr:`broad_phase`, but like it, it's only valid if transition events are
+            simulated, since they're what invalidate the cached ``np.inf``.
+        stats:
+            Cache hit, miss, and invalidation counters (see :class:`CacheStats`).
 
     Properties:
         size:
@@ -129,12 +423,45 @@ class CollisionCache:
           event caching, see :class:`TransitionCache`.
     """
 
-    times: Dict[EventType, Dict[Tuple[str, str], float]] = attrs.field(factory=dict)
+    times: Dict[EventType, CollisionTimes] = attrs.field(
+        factory=dict, converter=_as_times
+    )
+    broad_phase: bool = attrs.field(default=True)
+    bounded: bool = attrs.field(default=True)
+    stats: CacheStats = attrs.field(factory=CacheStats)
 
     @property
     def size(self) -> int:
         return sum(len(cache) for cache in self.times.values())
 
+    def get_times(self, event_type: EventType) -> CollisionTimes:
+        """Return the cached times of an event type, creating the cache if need be"""
+        if event_type not in self.times:
+            self.times[event_type] = _collision_times(event_type, {})
+
+        return self.times[event_type]
+
+    def get_next(self, event_type: EventType) -> Tuple[Tuple[str, str], float]:
+        """Return the soonest cached collision of an event type
+
+        Returns:
+            Tuple[Tuple[str, str], float]:
+                The object IDs of the collision, and the collision time.
+
+        Raises:
+            ValueError: If no collisions of the event type are cached.
+        """
+        event_times = self.get_times(event_type)
+        fresh = event_times.pop_fresh()
+
+        key = event_times.peek()
+        if key in fresh:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+
+        return key, event_times[key]
+
     def _get_invalid_ball_ids(self, event: Event) -> Set[str]:
         return {
             event.ids[ball_idx]
@@ -142,22 +469,31 @@ class CollisionCache:
         }
 
     def invalidate(self, event: Event) -> None:
-        invalid_ball_ids = self._get_invalid_ball_ids(event)
-
-        for event_type, event_times in self.times.items():
-            keys_to_delete = []
-
-            for key in event_times:
-                # Identify which indices in the key should be checked based on the event type
-                ball_indices = event_type_to_ball_indices.get(event_type, [])
-
-                # Check if any of the relevant ball IDs in the key match the invalid IDs
-                if any(key[idx] in invalid_ball_ids for idx in ball_indices):
-                    keys_to_delete.append(key)
-
-            for key in keys_to_delete:
-                del event_times[key]
+        self.invalidate_balls(self._get_invalid_ball_ids(event))
+
+    def invalidate_balls(self, invalid_ball_ids: Iterable[str]) -> None:
+        """Remove the cached collision times involving any of the balls"""
+        invalid_ball_ids = set(invalid_ball_ids)
+
+        for event_times in self.times.values():
+            # The index yields the affected keys without scanning the whole cache
+            for ball_id in invalid_ball_ids:
+                keys_to_delete = list(event_times.keys_involving(ball_id))
+                for key in keys_to_delete:
+                    del event_times[key]
+                self.stats.invalidations += len(keys_to_delete)
+
+    def copy(self) -> CollisionCache:
+        """Create a copy"""
+        return attrs.evolve(
+            self,
+            times={
+                event_type: event_times.copy()
+                for event_type, event_times in self.times.items()
+            },
+            stats=attrs.evolve(self.stats),
+        )
 
     @classmethod
-    def create(cls) -> CollisionCache:
-        return cls()
+    def create(cls, broad_phase: bool = True, bounded: bool = True) -> CollisionCache:
+        return cls(broad_phase=broad_phase, bounded=bounded)
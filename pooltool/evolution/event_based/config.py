@@ -1,4 +1,5 @@
 from pooltool.events.datatypes import EventType
+from pooltool.utils.strenum import StrEnum, auto
 
 INCLUDED_EVENTS = {
     EventType.NONE,
@@ -12,3 +13,26 @@ INCLUDED_EVENTS = {
     EventType.ROLLING_SPINNING,
     EventType.SLIDING_ROLLING,
 }
+
+
+class RecordMode(StrEnum):
+    """What a simulation records as it runs
+
+    Attributes:
+        FULL:
+            Every event, with the states of its agents before and after the event, and
+            the history of every ball.
+        EVENTS:
+            Every event, but without the states of its agents (*i.e.*
+            :attr:`pooltool.events.datatypes.Agent.initial` and
+            :attr:`pooltool.events.datatypes.Agent.final` are None), and without ball
+            histories. The event types, times, and agent IDs are enough to tell what
+            happened (*e.g.* which ball was hit first, or which balls were pocketed).
+        FINAL:
+            Nothing but the final state of the system. No events are recorded, and the
+            balls have no histories.
+    """
+
+    FULL = auto()
+    EVENTS = auto()
+    FINAL = auto()
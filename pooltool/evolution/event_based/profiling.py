@@ -0,0 +1,226 @@
+"""Opt-in instrumentation of the event loop
+
+When a shot simulates slowly, it's not obvious whether the time goes to solving
+collision quartics, resolving events, snapshotting agent states, or evolving balls.
+Passing a :class:`SimulationStats` as ``stats`` to
+:func:`pooltool.evolution.event_based.simulate.simulate` (or
+:func:`pooltool.evolution.event_based.simulate.simulate_many`) records where the time
+went, along with counters like the number of events per event type:
+
+    >>> import pooltool as pt
+    >>> stats = pt.evolution.SimulationStats()
+    >>> pt.simulate(pt.System.example(), stats=stats)
+    >>> print(stats.summary())
+
+Stats accumulate, so passing the same object to many simulations aggregates them.
+Stats can also be added together, *e.g.* to aggregate the stats of simulations run in
+separate processes:
+
+    >>> total = sum(stats_per_process, pt.evolution.SimulationStats())
+
+Without ``stats``, nothing is recorded, and the event loop only pays for a few no-op
+context managers per event.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import time
+from typing import ContextManager, Dict, Hashable, Optional, TypeVar
+
+import attrs
+
+from pooltool.events.datatypes import Event, EventType
+from pooltool.evolution.event_based.cache import CacheStats
+from pooltool.physics.resolve.resolver import ResolverTimes
+from pooltool.utils.strenum import StrEnum, auto
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V", int, float)
+
+
+class Phase(StrEnum):
+    """A timed phase of the event loop
+
+    Attributes:
+        DETECT:
+            Determining the next event (see
+            :func:`pooltool.evolution.event_based.simulate.get_next_event`). This
+            includes :attr:`COEFFICIENTS` and :attr:`QUARTIC`.
+        COEFFICIENTS:
+            Building the collision quartics of uncached object pairs, including broad
+            phase culling.
+        QUARTIC:
+            Solving collision quartics.
+        EVOLVE:
+            Evolving the balls up to the time of the next event.
+        RESOLVE:
+            Resolving events with the physics engine (see
+            :meth:`pooltool.physics.resolve.resolver.Resolver.resolve`). This includes
+            snapshotting the states of event agents (see
+            :attr:`SimulationStats.resolver`).
+        INVALIDATE:
+            Invalidating the cached events of the balls involved in resolved events.
+        RECORD:
+            Recording events, and the ball histories.
+    """
+
+    DETECT = auto()
+    COEFFICIENTS = auto()
+    QUARTIC = auto()
+    EVOLVE = auto()
+    RESOLVE = auto()
+    INVALIDATE = auto()
+    RECORD = auto()
+
+
+def _add_counts(counts: Dict[K, V], other: Dict[K, V]) -> None:
+    for key, value in other.items():
+        counts[key] = counts.get(key, 0) + value
+
+
+@attrs.define
+class SimulationStats:
+    """Timings and counters of one or more simulations
+
+    All times are wall times in seconds.
+
+    Attributes:
+        shots:
+            The number of simulated systems.
+        time:
+            The total time spent simulating, excluding continuization.
+        phases:
+            The time spent in each phase of the event loop (see :class:`Phase`).
+        events:
+            The number of detected events, per event type. Events created before the
+            first event is detected (*e.g.* the cue stick strike) aren't counted.
+        quartic_batches:
+            A histogram of the number of quartics solved at once, mapping each batch
+            size to the number of batches of that size.
+        cache:
+            The hits, misses, and invalidations of the collision caches (see
+            :class:`pooltool.evolution.event_based.cache.CacheStats`).
+        resolver:
+            The time spent in each resolution strategy, and in snapshotting the states
+            of event agents (see
+            :class:`pooltool.physics.resolve.resolver.ResolverTimes`).
+
+    Properties:
+        num_events:
+            The total number of detected events.
+        num_quartics:
+            The total number of quartics solved.
+    """
+
+    shots: int = attrs.field(default=0)
+    time: float = attrs.field(default=0.0)
+    phases: Dict[Phase, float] = attrs.field(factory=dict)
+    events: Dict[EventType, int] = attrs.field(factory=dict)
+    quartic_batches: Dict[int, int] = attrs.field(factory=dict)
+    cache: CacheStats = attrs.field(factory=CacheStats)
+    resolver: ResolverTimes = attrs.field(factory=ResolverTimes)
+
+    @property
+    def num_events(self) -> int:
+        return sum(self.events.values())
+
+    @property
+    def num_quartics(self) -> int:
+        return sum(size * count for size, count in self.quartic_batches.items())
+
+    def count_event(self, event: Event) -> None:
+        """Count a detected event"""
+        self.events[event.event_type] = self.events.get(event.event_type, 0) + 1
+
+    def count_quartics(self, num_quartics: int) -> None:
+        """Count a batch of solved quartics"""
+        self.quartic_batches[num_quartics] = (
+            self.quartic_batches.get(num_quartics, 0) + 1
+        )
+
+    def merge(self, other: SimulationStats) -> None:
+        """Add the stats of other simulations to these stats"""
+        self.shots += other.shots
+        self.time += other.time
+        _add_counts(self.phases, other.phases)
+        _add_counts(self.events, other.events)
+        _add_counts(self.quartic_batches, other.quartic_batches)
+        self.cache.merge(other.cache)
+        self.resolver.merge(other.resolver)
+
+    def copy(self) -> SimulationStats:
+        """Create a copy"""
+        stats = SimulationStats()
+        stats.merge(self)
+        return stats
+
+    def __add__(self, other: SimulationStats) -> SimulationStats:
+        stats = self.copy()
+        stats.merge(other)
+        return stats
+
+    def summary(self) -> str:
+        """A human readable summary of the stats"""
+
+        def _share(seconds: float) -> str:
+            percent = 100 * seconds / self.time if self.time else 0.0
+            return f"{seconds:10.4f} s {percent:5.1f}%"
+
+        lines = [f"{self.shots} shot(s), {self.num_events} events, {self.time:.4f} s"]
+
+        lines.append("Phases:")
+        for phase in Phase:
+            lines.append(f"  {phase:<24}{_share(self.phases.get(phase, 0.0))}")
+
+        lines.append("Resolution:")
+        lines.append(f"  {'snapshot':<24}{_share(self.resolver.snapshot)}")
+        for name, seconds in sorted(self.resolver.strategies.items()):
+            lines.append(f"  {name:<24}{_share(seconds)}")
+
+        lines.append("Events:")
+        for event_type, count in sorted(self.events.items()):
+            lines.append(f"  {event_type:<24}{count:10d}")
+
+        num_batches = sum(self.quartic_batches.values())
+        mean = self.num_quartics / num_batches if num_batches else 0.0
+        lines.append(
+            f"Quartics: {self.num_quartics} in {num_batches} batches "
+            f"(mean batch size {mean:.1f})"
+        )
+        lines.append(
+            f"Collision cache: {self.cache.hits} hits, {self.cache.misses} misses "
+            f"({self.cache.hit_rate:.1%} hit rate), "
+            f"{self.cache.invalidations} invalidations"
+        )
+
+        return "\n".join(lines)
+
+
+class _Timer:
+    """Adds the time spent in its context to an entry of a dictionary"""
+
+    __slots__ = ("times", "key", "start")
+
+    def __init__(self, times: Dict, key: Hashable) -> None:
+        self.times = times
+        self.key = key
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *_) -> None:
+        elapsed = time.perf_counter() - self.start
+        self.times[self.key] = self.times.get(self.key, 0.0) + elapsed
+
+
+_NOT_TIMED: ContextManager[None] = contextlib.nullcontext()
+
+
+def timed(stats: Optional[SimulationStats], phase: Phase) -> ContextManager[None]:
+    """Time a phase of the event loop, if stats are being recorded"""
+    if stats is None:
+        return _NOT_TIMED
+
+    return _Timer(stats.phases, phase)
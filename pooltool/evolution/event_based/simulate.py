@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
-from itertools import combinations
-from typing import List, Optional, Set, Tuple
+from collections import deque
+from time import perf_counter
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
+import attrs
 import numpy as np
+from numpy.typing import NDArray
 
-import pooltool.constants as const
 import pooltool.physics.evolve as evolve
-import pooltool.ptmath as ptmath
 from pooltool.events import (
     Event,
     EventType,
@@ -20,39 +32,210 @@ from pooltool.events import (
     null_event,
     stick_ball_collision,
 )
+from pooltool.events.datatypes import AgentStateLog
+from pooltool.events.utils import event_type_to_ball_indices
 from pooltool.evolution.continuize import continuize
 from pooltool.evolution.event_based import solve
 from pooltool.evolution.event_based.cache import CollisionCache, TransitionCache
-from pooltool.evolution.event_based.config import INCLUDED_EVENTS
-from pooltool.objects.ball.datatypes import BallState
+from pooltool.evolution.event_based.config import INCLUDED_EVENTS, RecordMode
+from pooltool.evolution.event_based.profiling import Phase, SimulationStats, timed
+from pooltool.evolution.event_based.state import ObjectPairs, SystemState
+from pooltool.evolution.event_based.stop import Monitor, StopCondition
 from pooltool.physics.engine import PhysicsEngine
-from pooltool.ptmath.roots.quartic import QuarticSolver, solve_quartics
+from pooltool.ptmath.roots.quartic import QuarticSolver, no_roots_until, solve_quartics
 from pooltool.system.datatypes import System
 
 DEFAULT_ENGINE = PhysicsEngine()
 
 
-def _evolve(shot: System, dt: float):
+def _evolve(shot: System, dt: float, state: SystemState):
     """Evolves current ball an amount of time dt
 
-    FIXME This is very inefficent. each ball should store its natural trajectory
-    thereby avoid a call to the clunky evolve_ball_motion. It could even be a
-    partial function so parameters don't continuously need to be passed
+    Only the balls in motion are evolved, all within a single call to a compiled
+    kernel. The evolved states are then synced back to the system's balls (see
+    :meth:`pooltool.evolution.event_based.state.SystemState.push`).
     """
+    evolve.evolve_balls_motion(
+        states=state.s,
+        rvws=state.rvw,
+        R=state.R,
+        m=state.m,
+        u_s=state.u_s,
+        u_sp=state.u_sp,
+        u_r=state.u_r,
+        g=state.g,
+        idx=state.moving,
+        t=dt,
+    )
+
+    state.push(shot, shot.t + dt)
+
+
+@attrs.define
+class _Recorder:
+    """Records events into a system, as much as its record mode asks
+
+    Attributes:
+        mode:
+            What is recorded (see :func:`simulate`).
+        snapshot:
+            Whether the states of event agents are set. By default, only if ``mode``
+            is :attr:`RecordMode.FULL`.
+        stream:
+            If not None, every recorded event is also appended to this queue,
+            regardless of ``mode`` (see :func:`simulate_iter`).
+    """
+
+    mode: RecordMode = attrs.field(default=RecordMode.FULL)
+    snapshot: bool = attrs.field(
+        default=attrs.Factory(
+            lambda self: self.mode == RecordMode.FULL, takes_self=True
+        )
+    )
+    stream: Optional[Deque[Event]] = attrs.field(default=None)
+
+    def __call__(self, shot: System, event: Event) -> None:
+        """Advance the system time to the event, and record the event"""
+        if self.stream is not None:
+            self.stream.append(event)
 
-    for ball in shot.balls.values():
-        rvw, _ = evolve.evolve_ball_motion(
-            state=ball.state.s,
-            rvw=ball.state.rvw,
-            R=ball.params.R,
-            m=ball.params.m,
-            u_s=ball.params.u_s,
-            u_sp=ball.params.u_sp,
-            u_r=ball.params.u_r,
-            g=ball.params.g,
-            t=dt,
+        if self.mode == RecordMode.FULL:
+            shot._update_history(event)
+            return
+
+        shot.t = event.time
+        for ball in shot.balls.values():
+            ball.state.t = event.time
+
+        if self.mode == RecordMode.EVENTS:
+            shot.events.append(event)
+
+
+_RECORD_FULL = _Recorder()
+
+
+def _initialize(
+    shot: System,
+    engine: PhysicsEngine,
+    log: Optional[AgentStateLog] = None,
+    recorder: _Recorder = _RECORD_FULL,
+    stats: Optional[SimulationStats] = None,
+) -> None:
+    """Reset the system history and strike the cue ball if need be"""
+    shot.reset_history()
+    recorder(shot, null_event(time=0))
+
+    if shot.get_system_energy() == 0 and shot.cue.V0 > 0:
+        # System has no energy, but the cue stick has an impact velocity. So create and
+        # resolve a stick-ball collision to start things off
+        event = stick_ball_collision(
+            stick=shot.cue,
+            ball=shot.balls[shot.cue.cue_ball_id],
+            time=0,
+            set_initial=recorder.snapshot,
         )
-        ball.state = BallState(rvw, ball.state.s, shot.t + dt)
+        with timed(stats, Phase.RESOLVE):
+            engine.resolver.resolve(
+                shot,
+                event,
+                log,
+                snapshot=recorder.snapshot,
+                times=None if stats is None else stats.resolver,
+            )
+        recorder(shot, event)
+
+
+def _step(
+    shot: System,
+    event: Event,
+    engine: PhysicsEngine,
+    include: Set[EventType],
+    transition_cache: TransitionCache,
+    collision_cache: CollisionCache,
+    state: SystemState,
+    t_final: Optional[float],
+    max_events: int,
+    num_events: int,
+    log: Optional[AgentStateLog] = None,
+    stop: Optional[Monitor] = None,
+    recorder: _Recorder = _RECORD_FULL,
+    stats: Optional[SimulationStats] = None,
+) -> bool:
+    """Evolve the system up to the event, resolve it, and record it
+
+    Returns:
+        bool: True if the simulation is finished, False otherwise.
+    """
+    if event.time == np.inf:
+        recorder(shot, null_event(time=shot.t))
+        return True
+
+    if stats is not None:
+        stats.count_event(event)
+
+    with timed(stats, Phase.EVOLVE):
+        _evolve(shot, event.time - shot.t, state)
+
+    if event.event_type in include:
+        with timed(stats, Phase.RESOLVE):
+            engine.resolver.resolve(
+                shot,
+                event,
+                log,
+                snapshot=recorder.snapshot,
+                times=None if stats is None else stats.resolver,
+            )
+
+        with timed(stats, Phase.INVALIDATE):
+            # Sync the balls that the resolver modified
+            ball_indices = event_type_to_ball_indices.get(event.event_type, ())
+            ball_ids = [event.ids[idx] for idx in ball_indices]
+            state.pull(shot, ball_ids)
+
+            # The agents may not hold the balls' states, so read them from the system
+            transition_cache.invalidate(shot, ball_ids)
+            collision_cache.invalidate(event)
+
+    with timed(stats, Phase.RECORD):
+        recorder(shot, event)
+
+    if t_final is not None and shot.t >= t_final:
+        recorder(shot, null_event(time=shot.t))
+        return True
+
+    if stop is not None and stop(shot, event):
+        recorder(shot, null_event(time=shot.t))
+        return True
+
+    if max_events > 0 and num_events > max_events:
+        shot.stop_balls()
+        return True
+
+    return False
+
+
+def _check_record(record: RecordMode, continuous: bool) -> None:
+    if continuous and record != RecordMode.FULL:
+        raise ValueError(
+            f"Continuizing requires ball histories, which aren't recorded with "
+            f"record={record!r}. Use RecordMode.FULL"
+        )
+
+
+def _create_collision_cache(
+    broad_phase: bool, include: Set[EventType]
+) -> CollisionCache:
+    """Create a collision cache, culling only what the included event types allow
+
+    Culled pairs are cached with a collision time of ``np.inf`` until one of their
+    balls transitions, so culling requires transition events to be simulated.
+    """
+    transitions = all(
+        event_type in include for event_type in EventType if event_type.is_transition()
+    )
+    return CollisionCache.create(
+        broad_phase=broad_phase and transitions, bounded=transitions
+    )
 
 
 def simulate(
@@ -65,6 +248,11 @@ def simulate(
     quartic_solver: QuarticSolver = QuarticSolver.HYBRID,
     include: Set[EventType] = INCLUDED_EVENTS,
     max_events: int = 0,
+    broad_phase: bool = True,
+    compact_events: bool = False,
+    stop_when: Optional[StopCondition] = None,
+    record: RecordMode = RecordMode.FULL,
+    stats: Optional[SimulationStats] = None,
 ) -> System:
     """Run a simulation on a system and return it
 
@@ -98,10 +286,52 @@ def simulate(
         max_events:
             If this is greater than 0, and the shot has more than this many events, the
             simulation is stopped and the balls are set to stationary.
+        broad_phase:
+            If True (default), object pairs that can't possibly collide before their
+            next ball transition are culled with a cheap bounding box test, before any
+            collision time is solved for. If False, no pairs are culled, which is
+            useful for validation. Independently of this, pairs whose collision
+            quartics provably have no root before either ball's next transition are
+            rejected without being solved (see
+            :func:`pooltool.ptmath.roots.quartic.no_roots_until`). Both rely on ball
+            transitions invalidating cached collisions, so both are disabled if any
+            transition event type is excluded from ``include``.
+        compact_events:
+            If True, the ball agents of events store only the ``(rvw, s, t)`` states of
+            their balls, in arrays shared by all events, rather than whole copies of
+            the balls (see :class:`pooltool.events.datatypes.AgentStateLog`). This
+            makes events much smaller, which matters for long shots. Balls are built
+            from the stored states when :attr:`pooltool.events.datatypes.Agent.initial`
+            or :attr:`pooltool.events.datatypes.Agent.final` is first accessed (*e.g.*
+            by :meth:`pooltool.events.datatypes.Event.get_ball`), and the simulated
+            system is equal to one simulated without this option.
+        stop_when:
+            If set, the simulation is stopped as soon as an event meets this condition
+            (see :mod:`pooltool.evolution.event_based.stop`). Like with ``t_final``,
+            the balls are left as they are at the time of the event, which may be in
+            motion, and a final null event is recorded at that time.
+        record:
+            What is recorded during the simulation (see
+            :class:`pooltool.evolution.event_based.config.RecordMode`). By default,
+            everything is. If you only need the outcome of a shot (*e.g.* in Monte
+            Carlo sweeps), :attr:`RecordMode.EVENTS` skips copying the states of event
+            agents and building ball histories, and :attr:`RecordMode.FINAL`
+            additionally skips recording events. This avoids most of the allocation
+            per event. Can't be combined with ``continuous``, which requires ball
+            histories.
+        stats:
+            If passed, timings and counters of the simulation are added to it (see
+            :mod:`pooltool.evolution.event_based.profiling`). This is useful for
+            finding out why a shot is slow to simulate. Since they accumulate, the
+            same stats can be passed to many simulations to aggregate them.
 
     Returns:
         System: The simulated system.
 
+    Raises:
+        ValueError: If ``continuous`` is True, but ``record`` isn't
+            :attr:`RecordMode.FULL`.
+
     Examples:
         Standard usage:
 
@@ -141,69 +371,752 @@ def simulate(
         >>> system = pt.simulate(pt.System.example(), continuous=True)
         >>> for ball in system.balls.values(): assert len(ball.history_cts) > 0
 
+        If you only care about the start of a shot, stop the simulation early:
+
+        >>> # Stop once the cue ball hits another ball
+        >>> import pooltool as pt
+        >>> from pooltool.evolution.event_based.stop import BallBallCollision
+        >>> system = pt.simulate(
+        >>>     pt.System.example(), stop_when=BallBallCollision("cue")
+        >>> )
+        >>> pt.ruleset.utils.get_id_of_first_ball_hit(system, cue="cue")
+
+        Find out where the time goes:
+
+        >>> import pooltool as pt
+        >>> stats = pt.evolution.SimulationStats()
+        >>> system = pt.simulate(pt.System.example(), stats=stats)
+        >>> print(stats.summary())
+
     See Also:
         - :func:`pooltool.evolution.continuize.continuize`
     """
+    _check_record(record, continuous)
+
     if not inplace:
         shot = shot.copy()
 
     if not engine:
         engine = DEFAULT_ENGINE
 
-    shot.reset_history()
-    shot._update_history(null_event(time=0))
+    start = perf_counter()
 
-    if shot.get_system_energy() == 0 and shot.cue.V0 > 0:
-        # System has no energy, but the cue stick has an impact velocity. So create and
-        # resolve a stick-ball collision to start things off
-        event = stick_ball_collision(
-            stick=shot.cue,
-            ball=shot.balls[shot.cue.cue_ball_id],
-            time=0,
-            set_initial=True,
-        )
-        engine.resolver.resolve(shot, event)
-        shot._update_history(event)
+    checkpoint = _start(
+        shot, engine, include, broad_phase, compact_events, _Recorder(record), stats
+    )
+    _advance(
+        checkpoint,
+        engine,
+        quartic_solver,
+        t_final,
+        max_events,
+        stop=None if stop_when is None else stop_when.monitor(),
+        stats=stats,
+    )
 
-    collision_cache = CollisionCache.create()
-    transition_cache = TransitionCache.create(shot)
+    if stats is not None:
+        stats.shots += 1
+        stats.time += perf_counter() - start
+        stats.cache.merge(checkpoint.collision_cache.stats)
+
+    if continuous:
+        continuize(shot, dt=0.01 if dt is None else dt, inplace=True)
+
+    return shot
+
+
+def simulate_iter(
+    shot: System,
+    engine: Optional[PhysicsEngine] = None,
+    inplace: bool = False,
+    t_final: Optional[float] = None,
+    quartic_solver: QuarticSolver = QuarticSolver.HYBRID,
+    include: Set[EventType] = INCLUDED_EVENTS,
+    max_events: int = 0,
+    broad_phase: bool = True,
+    compact_events: bool = False,
+    stop_when: Optional[StopCondition] = None,
+    record: RecordMode = RecordMode.FULL,
+) -> Generator[Event, None, System]:
+    """Simulate a system, yielding each event as soon as it's resolved
+
+    This is the streaming counterpart of :func:`simulate`. The events yielded are the
+    events :func:`simulate` would record, in the same order, but each one is available
+    as soon as it's resolved, rather than once the whole shot is. This is useful for
+    consuming long shots incrementally (*e.g.* to render or analyze them live), or for
+    abandoning a shot midway, which is done by simply not exhausting the generator.
+
+    Yielded events always carry the states of their agents, regardless of ``record``.
+    So with ``record=RecordMode.FINAL``, the simulated system keeps neither events nor
+    ball histories, and memory stays bounded by what the consumer holds on to, no
+    matter how many events the shot has (unless ``compact_events`` is True, in which
+    case every agent state is kept in the shared log).
+
+    Args:
+        shot:
+            See :func:`simulate`.
+        engine:
+            See :func:`simulate`.
+        inplace:
+            See :func:`simulate`.
+        t_final:
+            See :func:`simulate`.
+        quartic_solver:
+            See :func:`simulate`.
+        include:
+            See :func:`simulate`.
+        max_events:
+            See :func:`simulate`.
+        broad_phase:
+            See :func:`simulate`.
+        compact_events:
+            See :func:`simulate`.
+        stop_when:
+            See :func:`simulate`.
+        record:
+            See :func:`simulate`. This only determines what the simulated system
+            retains, not which events are yielded.
+
+    Yields:
+        Event: The events of the shot, in chronological order.
+
+    Returns:
+        System: The simulated system, as the generator's return value (*i.e.* the
+        ``value`` of the :class:`StopIteration` raised once it's exhausted).
+
+    Examples:
+        Print the events of a shot as they're resolved:
+
+        >>> import pooltool as pt
+        >>> from pooltool.evolution import simulate_iter
+        >>> for event in simulate_iter(pt.System.example()):
+        >>>     print(event)
+
+        The events are those of :func:`simulate`:
+
+        >>> system = pt.System.example()
+        >>> assert list(simulate_iter(system)) == pt.simulate(system).events
+    """
+    if not inplace:
+        shot = shot.copy()
+
+    if not engine:
+        engine = DEFAULT_ENGINE
+
+    stream: Deque[Event] = deque()
+    recorder = _Recorder(record, snapshot=True, stream=stream)
+    checkpoint = _start(shot, engine, include, broad_phase, compact_events, recorder)
+    stop = None if stop_when is None else stop_when.monitor()
 
-    events = 0
     while True:
+        while stream:
+            yield stream.popleft()
+
+        if checkpoint.finished:
+            return shot
+
+        _advance_once(
+            checkpoint, engine, quartic_solver, t_final, max_events, stop, recorder
+        )
+
+
+@attrs.define
+class Checkpoint:
+    """An in-progress simulation, paused at an event boundary
+
+    A checkpoint holds everything needed to pick a simulation back up where it left
+    off: the system, the event caches, and the simulator's internal state. Create one
+    with :func:`checkpoint`, and continue the simulation with :func:`resume`.
+
+    Since :func:`resume` simulates a copy of the checkpoint by default, a checkpoint can
+    be resumed any number of times, *e.g.* with different physics engines. The events
+    up to the checkpoint are simulated once, and each branch only costs the events
+    that follow.
+
+    Attributes:
+        shot:
+            The system, simulated up to the checkpoint.
+        transition_cache:
+            The cached next transition of each ball.
+        collision_cache:
+            The cached collision times.
+        state:
+            The struct-of-arrays state of the system (see
+            :class:`pooltool.evolution.event_based.state.SystemState`).
+        include:
+            The event types that are resolved (see :func:`simulate`).
+        num_events:
+            The number of events detected so far, not counting the events created
+            before the first event was detected (see :func:`simulate`'s
+            ``max_events``).
+        log:
+            The store of ball agent states, if events are stored compactly (see
+            :func:`simulate`'s ``compact_events``). It's append-only, so it is shared
+            between copies.
+        finished:
+            Whether the simulation has finished, in which case resuming it does
+            nothing.
+        record:
+            What is recorded (see :func:`simulate`). Checkpoints made with
+            :func:`checkpoint` record everything.
+    """
+
+    shot: System
+    transition_cache: TransitionCache
+    collision_cache: CollisionCache
+    state: SystemState
+    include: Set[EventType]
+    num_events: int = 0
+    log: Optional[AgentStateLog] = None
+    finished: bool = False
+    record: RecordMode = RecordMode.FULL
+
+    def copy(self) -> Checkpoint:
+        """Create a copy, which can be resumed independently of this checkpoint"""
+        return attrs.evolve(
+            self,
+            shot=self.shot.copy(),
+            transition_cache=self.transition_cache.copy(),
+            collision_cache=self.collision_cache.copy(),
+            state=self.state.copy(),
+        )
+
+    def invalidate(self, ball_ids: Iterable[str]) -> None:
+        """Account for balls whose states were modified after the checkpoint was made
+
+        Call this after modifying the states of balls in :attr:`shot` (*e.g.* to
+        introduce a perturbation mid-shot), so that their cached events are
+        recalculated when the simulation is resumed.
+        """
+        ball_ids = list(ball_ids)
+        self.state.pull(self.shot, ball_ids)
+        self.transition_cache.invalidate(self.shot, ball_ids)
+        self.collision_cache.invalidate_balls(ball_ids)
+        self.finished = False
+
+
+def _start(
+    shot: System,
+    engine: PhysicsEngine,
+    include: Set[EventType],
+    broad_phase: bool,
+    compact_events: bool,
+    recorder: _Recorder = _RECORD_FULL,
+    stats: Optional[SimulationStats] = None,
+) -> Checkpoint:
+    """Initialize the system, and create the state needed to simulate it"""
+    log = AgentStateLog() if compact_events else None
+    _initialize(shot, engine, log, recorder, stats)
+
+    return Checkpoint(
+        shot=shot,
+        transition_cache=TransitionCache.create(shot),
+        collision_cache=_create_collision_cache(broad_phase, include),
+        state=SystemState.from_system(shot),
+        include=include,
+        log=log,
+        record=recorder.mode,
+    )
+
+
+def _advance_once(
+    checkpoint: Checkpoint,
+    engine: PhysicsEngine,
+    quartic_solver: QuarticSolver,
+    t_final: Optional[float],
+    max_events: int,
+    stop: Optional[Monitor],
+    recorder: _Recorder,
+    stats: Optional[SimulationStats] = None,
+) -> None:
+    """Detect, resolve, and record the next event of an unfinished simulation"""
+    with timed(stats, Phase.DETECT):
         event = get_next_event(
-            shot,
-            transition_cache=transition_cache,
-            collision_cache=collision_cache,
+            checkpoint.shot,
+            transition_cache=checkpoint.transition_cache,
+            collision_cache=checkpoint.collision_cache,
             quartic_solver=quartic_solver,
+            state=checkpoint.state,
+            stats=stats,
         )
 
-        if event.time == np.inf:
-            shot._update_history(null_event(time=shot.t))
-            break
+    checkpoint.finished = _step(
+        checkpoint.shot,
+        event,
+        engine,
+        checkpoint.include,
+        checkpoint.transition_cache,
+        checkpoint.collision_cache,
+        checkpoint.state,
+        t_final,
+        max_events,
+        checkpoint.num_events,
+        checkpoint.log,
+        stop,
+        recorder,
+        stats,
+    )
 
-        _evolve(shot, event.time - shot.t)
+    if not checkpoint.finished:
+        checkpoint.num_events += 1
+
+
+def _advance(
+    checkpoint: Checkpoint,
+    engine: PhysicsEngine,
+    quartic_solver: QuarticSolver,
+    t_final: Optional[float],
+    max_events: int,
+    until: Optional[int] = None,
+    stop: Optional[Monitor] = None,
+    stats: Optional[SimulationStats] = None,
+) -> None:
+    """Simulate until finished, or until the event with index ``until`` is recorded"""
+    recorder = _Recorder(checkpoint.record)
+
+    while not checkpoint.finished:
+        if until is not None and len(checkpoint.shot.events) > until:
+            return
+
+        _advance_once(
+            checkpoint,
+            engine,
+            quartic_solver,
+            t_final,
+            max_events,
+            stop,
+            recorder,
+            stats,
+        )
 
-        if event.event_type in include:
-            engine.resolver.resolve(shot, event)
-            transition_cache.update(event)
-            collision_cache.invalidate(event)
 
-        shot._update_history(event)
+def checkpoint(
+    shot: System,
+    event_index: int,
+    engine: Optional[PhysicsEngine] = None,
+    quartic_solver: QuarticSolver = QuarticSolver.HYBRID,
+    include: Set[EventType] = INCLUDED_EVENTS,
+    broad_phase: bool = True,
+    compact_events: bool = False,
+) -> Checkpoint:
+    """Simulate a system up to an event, and return a checkpoint
+
+    Args:
+        shot:
+            The system you would like simulated. It isn't modified.
+        event_index:
+            The simulation is paused once the event ``shot.events[event_index]`` has
+            been recorded. If the simulation finishes first, the returned checkpoint
+            is :attr:`Checkpoint.finished`.
+        engine:
+            See :func:`simulate`.
+        quartic_solver:
+            See :func:`simulate`.
+        include:
+            See :func:`simulate`. This is fixed for the rest of the simulation.
+        broad_phase:
+            See :func:`simulate`. This is fixed for the rest of the simulation.
+        compact_events:
+            See :func:`simulate`. This is fixed for the rest of the simulation.
 
-        if t_final is not None and shot.t >= t_final:
+    Returns:
+        Checkpoint: The paused simulation. Continue it with :func:`resume`.
+
+    Examples:
+        Simulate the start of a shot once:
+
+        >>> import pooltool as pt
+        >>> from pooltool.evolution.event_based.simulate import checkpoint, resume
+        >>> system = pt.System.example()
+        >>> paused = checkpoint(system, event_index=3)
+
+        Resuming it is equivalent to simulating from scratch:
+
+        >>> assert resume(paused) == pt.simulate(system)
+
+        Branch on a perturbation of the cue ball's velocity:
+
+        >>> branch = paused.copy()
+        >>> branch.shot.balls["cue"].state.rvw[1] *= 1.01
+        >>> branch.invalidate(["cue"])
+        >>> perturbed = resume(branch, inplace=True)
+    """
+    if not engine:
+        engine = DEFAULT_ENGINE
+
+    paused = _start(shot.copy(), engine, include, broad_phase, compact_events)
+    _advance(paused, engine, quartic_solver, None, 0, until=event_index)
+    return paused
+
+
+def resume(
+    checkpoint: Checkpoint,
+    engine: Optional[PhysicsEngine] = None,
+    inplace: bool = False,
+    continuous: bool = False,
+    dt: Optional[float] = None,
+    t_final: Optional[float] = None,
+    quartic_solver: QuarticSolver = QuarticSolver.HYBRID,
+    max_events: int = 0,
+    stop_when: Optional[StopCondition] = None,
+) -> System:
+    """Resume a simulation from a checkpoint, and return the simulated system
+
+    Args:
+        checkpoint:
+            The checkpoint (see :func:`checkpoint`).
+        engine:
+            See :func:`simulate`. This needn't be the engine the checkpoint was
+            simulated with.
+        inplace:
+            By default, a copy of the checkpoint is resumed, so the checkpoint can be
+            resumed again. If True, the checkpoint itself is resumed, and the returned
+            system is :attr:`Checkpoint.shot`.
+        continuous:
+            See :func:`simulate`.
+        dt:
+            See :func:`simulate`.
+        t_final:
+            See :func:`simulate`.
+        quartic_solver:
+            See :func:`simulate`.
+        max_events:
+            See :func:`simulate`. Events detected before the checkpoint count
+            towards the limit.
+        stop_when:
+            See :func:`simulate`. Events before the checkpoint count towards the
+            condition, so if they already meet it, the simulation is stopped at the
+            checkpoint.
+
+    Returns:
+        System: The simulated system.
+    """
+    if not inplace:
+        checkpoint = checkpoint.copy()
+
+    if not engine:
+        engine = DEFAULT_ENGINE
+
+    stop = None
+    if stop_when is not None and not checkpoint.finished:
+        stop = stop_when.monitor()
+        shot = checkpoint.shot
+        if any([stop(shot, event) for event in shot.events]):
             shot._update_history(null_event(time=shot.t))
-            break
+            checkpoint.finished = True
+
+    _advance(checkpoint, engine, quartic_solver, t_final, max_events, stop=stop)
+
+    if continuous:
+        continuize(checkpoint.shot, dt=0.01 if dt is None else dt, inplace=True)
+
+    return checkpoint.shot
+
+
+@attrs.define
+class _BatchMember:
+    """The in-flight simulation state of one system within :func:`simulate_many`"""
+
+    shot: System
+    transition_cache: TransitionCache
+    collision_cache: CollisionCache
+    state: SystemState
+    log: Optional[AgentStateLog] = None
+    stop: Optional[Monitor] = None
+    events: int = 0
+
+
+def simulate_many(
+    shots: Sequence[System],
+    engine: Optional[PhysicsEngine] = None,
+    inplace: bool = False,
+    continuous: bool = False,
+    dt: Optional[float] = None,
+    t_final: Optional[float] = None,
+    quartic_solver: QuarticSolver = QuarticSolver.HYBRID,
+    include: Set[EventType] = INCLUDED_EVENTS,
+    max_events: int = 0,
+    broad_phase: bool = True,
+    compact_events: bool = False,
+    stop_when: Optional[StopCondition] = None,
+    record: RecordMode = RecordMode.FULL,
+    stats: Optional[SimulationStats] = None,
+) -> List[System]:
+    """Simulate a batch of independent systems in lockstep
+
+    This is the batched counterpart of :func:`simulate`. Rather than evolving each
+    system to completion before starting the next, every system in the batch is
+    advanced by one event per step. Within a step, the quartic polynomials of every
+    uncached ball-ball, ball-circular-cushion, and ball-pocket pair, from every system
+    in the batch, are stacked and solved with a single call to
+    :func:`pooltool.ptmath.roots.quartic.solve_quartics`. This amortizes the per-call
+    overhead of the quartic solver across the batch, which pays off when simulating
+    many shots (e.g. parameter sweeps).
+
+    The systems are independent, and each one is simulated exactly as it would be with
+    :func:`simulate`. Systems that finish early simply drop out of the batch.
+
+    Args:
+        shots:
+            The systems you would like simulated.
+        engine:
+            See :func:`simulate`. The same engine is used for all systems.
+        inplace:
+            By default, copies of the passed systems are simulated and returned. If
+            True, the passed systems are modified in place.
+        continuous:
+            See :func:`simulate`.
+        dt:
+            See :func:`simulate`.
+        t_final:
+            See :func:`simulate`.
+        quartic_solver:
+            See :func:`simulate`.
+        include:
+            See :func:`simulate`.
+        max_events:
+            See :func:`simulate`.
+        broad_phase:
+            See :func:`simulate`.
+        compact_events:
+            See :func:`simulate`.
+        stop_when:
+            See :func:`simulate`. Each system is stopped independently.
+        record:
+            See :func:`simulate`.
+        stats:
+            See :func:`simulate`. Each quartic batch spans the whole batch of systems.
+
+    Returns:
+        List[System]:
+            The simulated systems, in the same order as ``shots``.
+
+    Raises:
+        ValueError: If ``continuous`` is True, but ``record`` isn't
+            :attr:`RecordMode.FULL`.
+
+    Examples:
+        Sweep over cue stick speeds:
+
+        >>> import pooltool as pt
+        >>> shots = []
+        >>> for V0 in (0.5, 1.0, 1.5, 2.0):
+        >>>     shot = pt.System.example()
+        >>>     shot.strike(V0=V0)
+        >>>     shots.append(shot)
+        >>> simulated = pt.evolution.simulate_many(shots)
+        >>> assert all(shot.simulated for shot in simulated)
+
+        The results are the same as simulating each system individually:
+
+        >>> assert simulated == [pt.simulate(shot) for shot in shots]
+
+    See Also:
+        - :func:`simulate`
+    """
+    _check_record(record, continuous)
 
-        if max_events > 0 and events > max_events:
-            shot.stop_balls()
-            break
+    if not inplace:
+        shots = [shot.copy() for shot in shots]
+
+    if not engine:
+        engine = DEFAULT_ENGINE
+
+    recorder = _Recorder(record)
+    start = perf_counter()
+
+    active: List[_BatchMember] = []
+    for shot in shots:
+        log = AgentStateLog() if compact_events else None
+        _initialize(shot, engine, log, recorder, stats)
+        active.append(
+            _BatchMember(
+                shot=shot,
+                transition_cache=TransitionCache.create(shot),
+                collision_cache=_create_collision_cache(broad_phase, include),
+                state=SystemState.from_system(shot),
+                log=log,
+                stop=None if stop_when is None else stop_when.monitor(),
+            )
+        )
+
+    while len(active):
+        with timed(stats, Phase.DETECT):
+            _solve_batch_collisions(active, quartic_solver, stats)
+
+        still_active: List[_BatchMember] = []
+        for member in active:
+            # The collision caches are fully populated, so no quartics are solved here
+            with timed(stats, Phase.DETECT):
+                event = get_next_event(
+                    member.shot,
+                    transition_cache=member.transition_cache,
+                    collision_cache=member.collision_cache,
+                    quartic_solver=quartic_solver,
+                    state=member.state,
+                    stats=stats,
+                )
+
+            if _step(
+                member.shot,
+                event,
+                engine,
+                include,
+                member.transition_cache,
+                member.collision_cache,
+                member.state,
+                t_final,
+                max_events,
+                member.events,
+                member.log,
+                member.stop,
+                recorder,
+                stats,
+            ):
+                if stats is not None:
+                    stats.cache.merge(member.collision_cache.stats)
+                continue
 
-        events += 1
+            member.events += 1
+            still_active.append(member)
+
+        active = still_active
+
+    if stats is not None:
+        stats.shots += len(shots)
+        stats.time += perf_counter() - start
 
     if continuous:
-        continuize(shot, dt=0.01 if dt is None else dt, inplace=True)
+        for shot in shots:
+            continuize(shot, dt=0.01 if dt is None else dt, inplace=True)
+
+    return list(shots)
+
+
+def _solve_quartics(
+    collision_coeffs: NDArray[np.float64],
+    solver: QuarticSolver,
+    stats: Optional[SimulationStats] = None,
+) -> NDArray[np.float64]:
+    """Solve a batch of collision quartics, timing and counting it if need be"""
+    if stats is None:
+        return solve_quartics(ps=collision_coeffs, solver=solver)
+
+    stats.count_quartics(len(collision_coeffs))
+    with timed(stats, Phase.QUARTIC):
+        return solve_quartics(ps=collision_coeffs, solver=solver)
+
+
+def _solve_batch_collisions(
+    members: List[_BatchMember],
+    solver: QuarticSolver,
+    stats: Optional[SimulationStats] = None,
+) -> None:
+    """Populate the collision caches of all batch members with one quartic solve"""
+    caches: List[Dict[Tuple[str, str], float]] = []
+    keys: List[Tuple[str, str]] = []
+    times: List[float] = []
+    collision_coeffs: List[NDArray[np.float64]] = []
+
+    for member in members:
+        shot = member.shot
+        collision_cache = member.collision_cache
+
+        for event_type, get_coeffs in _QUARTIC_COEFFS_GETTERS.items():
+            with timed(stats, Phase.COEFFICIENTS):
+                pairs, coeffs = get_coeffs(shot, collision_cache, member.state)
+            cache = collision_cache.get_times(event_type)
+
+            caches.extend(cache for _ in pairs)
+            times.extend(shot.t for _ in pairs)
+            keys.extend(pairs)
+            collision_coeffs.append(coeffs)
+
+    if not len(keys):
+        return
+
+    roots = _solve_quartics(np.concatenate(collision_coeffs), solver, stats)
+    for root, cache, key, t in zip(roots, caches, keys, times):
+        cache[key] = t + root
+
+
+_NO_BOUNDS = np.empty((0, 4), dtype=np.float64)
+_NO_TIMES = np.empty(0, dtype=np.float64)
+
+
+def _swept_bounds(
+    state: SystemState, collision_cache: CollisionCache
+) -> NDArray[np.float64]:
+    """Swept bounding boxes of the balls, if broad phase culling is enabled"""
+    if not collision_cache.broad_phase:
+        return _NO_BOUNDS
+
+    return solve.balls_swept_bounds(
+        state.rvw, state.s, state.u_s, state.u_r, state.g, state.R
+    )
 
-    return shot
+
+def _translation_times(
+    state: SystemState, collision_cache: CollisionCache
+) -> NDArray[np.float64]:
+    """Times until the balls' next transitions, if quartics are bounded by them"""
+    if not collision_cache.bounded:
+        return _NO_TIMES
+
+    return solve.balls_translation_times(
+        state.rvw, state.s, state.u_s, state.u_r, state.g, state.R
+    )
+
+
+def _reject(
+    cache: Dict[Tuple[str, str], float],
+    keys: List[Tuple[str, str]],
+    collision_coeffs: NDArray[np.float64],
+    translation_times: NDArray[np.float64],
+    *ball_idx: NDArray[np.intp],
+) -> Tuple[List[Tuple[str, str]], NDArray[np.float64]]:
+    """Cache the pairs that can't collide before a transition, and return the rest
+
+    A pair's collision quartic only holds until one of its balls transitions, and the
+    transition invalidates the pair's cached collision time. So if the quartic has no
+    root before then, the pair is cached with a time of ``np.inf`` without being
+    solved. ``ball_idx`` are the rows of the pairs' balls.
+
+    The quartics aren't also bounded by the time of the soonest event found so far.
+    That bound only holds for the current step, whereas the cached ``np.inf`` has to
+    stay valid until the pair's next transition, so a pair rejected by it would have
+    to be solved again at a later step rather than cached.
+    """
+    if not len(translation_times) or not len(keys):
+        return keys, collision_coeffs
+
+    t_max = np.min([translation_times[idx] for idx in ball_idx], axis=0)
+    rejected = no_roots_until(collision_coeffs, t_max)
+
+    if not rejected.any():
+        return keys, collision_coeffs
+
+    remaining: List[Tuple[str, str]] = []
+    for key, is_rejected in zip(keys, rejected):
+        if is_rejected:
+            cache[key] = np.inf
+        else:
+            remaining.append(key)
+
+    return remaining, collision_coeffs[~rejected]
+
+
+def _cull(
+    cache: Dict[Tuple[str, str], float],
+    pairs: ObjectPairs,
+    candidates: NDArray[np.intp],
+    culled: NDArray[np.bool_],
+) -> NDArray[np.intp]:
+    """Cache the culled candidates with a time of ``np.inf`` and return the rest"""
+    for k in candidates[culled]:
+        cache[pairs.keys[k]] = np.inf
+
+    return candidates[~culled]
 
 
 def get_next_event(
@@ -212,6 +1125,8 @@ def get_next_event(
     transition_cache: Optional[TransitionCache] = None,
     collision_cache: Optional[CollisionCache] = None,
     quartic_solver: QuarticSolver = QuarticSolver.HYBRID,
+    state: Optional[SystemState] = None,
+    stats: Optional[SimulationStats] = None,
 ) -> Event:
     # Start by assuming next event doesn't happen
     event = null_event(time=np.inf)
@@ -222,30 +1137,45 @@ def get_next_event(
     if collision_cache is None:
         collision_cache = CollisionCache.create()
 
+    if state is None:
+        state = SystemState.from_system(shot)
+
     transition_event = transition_cache.get_next()
     if transition_event.time < event.time:
         event = transition_event
 
     ball_ball_event = get_next_ball_ball_collision(
-        shot, collision_cache=collision_cache, solver=quartic_solver
+        shot,
+        collision_cache=collision_cache,
+        solver=quartic_solver,
+        state=state,
+        stats=stats,
     )
     if ball_ball_event.time < event.time:
         event = ball_ball_event
 
     ball_circular_cushion_event = get_next_ball_circular_cushion_event(
-        shot, collision_cache=collision_cache, solver=quartic_solver
+        shot,
+        collision_cache=collision_cache,
+        solver=quartic_solver,
+        state=state,
+        stats=stats,
     )
     if ball_circular_cushion_event.time < event.time:
         event = ball_circular_cushion_event
 
     ball_linear_cushion_event = get_next_ball_linear_cushion_collision(
-        shot, collision_cache=collision_cache
+        shot, collision_cache=collision_cache, state=state
     )
     if ball_linear_cushion_event.time < event.time:
         event = ball_linear_cushion_event
 
     ball_pocket_event = get_next_ball_pocket_collision(
-        shot, collision_cache=collision_cache, solver=quartic_solver
+        shot,
+        collision_cache=collision_cache,
+        solver=quartic_solver,
+        state=state,
+        stats=stats,
     )
     if ball_pocket_event.time < event.time:
         event = ball_pocket_event
@@ -257,77 +1187,83 @@ def get_next_ball_ball_collision(
     shot: System,
     collision_cache: CollisionCache,
     solver: QuarticSolver = QuarticSolver.HYBRID,
+    state: Optional[SystemState] = None,
+    stats: Optional[SimulationStats] = None,
 ) -> Event:
     """Returns next ball-ball collision"""
 
-    ball_pairs: List[Tuple[str, str]] = []
-    collision_coeffs: List[Tuple[float, ...]] = []
-
-    cache = collision_cache.times.setdefault(EventType.BALL_BALL, {})
-
-    for ball1, ball2 in combinations(shot.balls.values(), 2):
-        ball_pair = (ball1.id, ball2.id)
-        if ball_pair in cache:
-            continue
-
-        ball1_state = ball1.state
-        ball1_params = ball1.params
-
-        ball2_state = ball2.state
-        ball2_params = ball2.params
-
-        if ball1_state.s == const.pocketed or ball2_state.s == const.pocketed:
-            cache[ball_pair] = np.inf
-        elif (
-            ball1_state.s in const.nontranslating
-            and ball2_state.s in const.nontranslating
-        ):
-            cache[ball_pair] = np.inf
-        elif (
-            ptmath.norm3d(ball1_state.rvw[0] - ball2_state.rvw[0])
-            < ball1_params.R + ball2_params.R
-        ):
-            # If balls are intersecting, avoid internal collisions
-            cache[ball_pair] = np.inf
-        else:
-            ball_pairs.append(ball_pair)
-            collision_coeffs.append(
-                solve.ball_ball_collision_coeffs(
-                    rvw1=ball1_state.rvw,
-                    rvw2=ball2_state.rvw,
-                    s1=ball1_state.s,
-                    s2=ball2_state.s,
-                    mu1=(
-                        ball1_params.u_s
-                        if ball1_state.s == const.sliding
-                        else ball1_params.u_r
-                    ),
-                    mu2=(
-                        ball2_params.u_s
-                        if ball2_state.s == const.sliding
-                        else ball2_params.u_r
-                    ),
-                    m1=ball1_params.m,
-                    m2=ball2_params.m,
-                    g1=ball1_params.g,
-                    g2=ball2_params.g,
-                    R=ball1_params.R,
-                )
-            )
+    if state is None:
+        state = SystemState.from_system(shot)
+
+    with timed(stats, Phase.COEFFICIENTS):
+        ball_pairs, collision_coeffs = _ball_ball_collision_coeffs(
+            shot, collision_cache, state
+        )
+
+    cache = collision_cache.get_times(EventType.BALL_BALL)
 
     if len(collision_coeffs):
-        roots = solve_quartics(ps=np.array(collision_coeffs), solver=solver)
+        roots = _solve_quartics(collision_coeffs, solver, stats)
         for root, ball_pair in zip(roots, ball_pairs):
             cache[ball_pair] = shot.t + root
 
     # The cache is now populated and up-to-date
 
-    ball_pair = min(cache, key=lambda k: cache[k])
+    ball_pair, time = collision_cache.get_next(EventType.BALL_BALL)
 
     return ball_ball_collision(
         ball1=shot.balls[ball_pair[0]],
         ball2=shot.balls[ball_pair[1]],
-        time=cache[ball_pair],
+        time=time,
+    )
+
+
+def _ball_ball_collision_coeffs(
+    shot: System, collision_cache: CollisionCache, state: SystemState
+) -> Tuple[List[Tuple[str, str]], NDArray[np.float64]]:
+    """Returns the uncached ball pairs and their collision quartic coefficients
+
+    Pairs that can't possibly collide, or whose quartics have no root before a ball
+    transitions, are cached with a collision time of ``np.inf`` and are not
+    returned.
+    """
+
+    cache = collision_cache.get_times(EventType.BALL_BALL)
+    pairs = state.ball_ball_pairs
+    candidates = pairs.uncached(cache)
+
+    if not len(candidates):
+        return [], np.empty((0, 5), dtype=np.float64)
+
+    idx1, idx2 = pairs.idx[:, candidates]
+    culled = solve.ball_ball_culled(
+        state.rvw,
+        state.s,
+        state.R,
+        _swept_bounds(state, collision_cache),
+        idx1,
+        idx2,
+    )
+    candidates = _cull(cache, pairs, candidates, culled)
+
+    collision_coeffs = solve.ball_ball_collision_coeffs_many(
+        state.rvw,
+        state.s,
+        state.mu,
+        state.m,
+        state.g,
+        state.R,
+        idx1[~culled],
+        idx2[~culled],
+    )
+
+    return _reject(
+        cache,
+        [pairs.keys[k] for k in candidates],
+        collision_coeffs,
+        _translation_times(state, collision_cache),
+        idx1[~culled],
+        idx2[~culled],
     )
 
 
@@ -335,109 +1271,149 @@ def get_next_ball_circular_cushion_event(
     shot: System,
     collision_cache: CollisionCache,
     solver: QuarticSolver = QuarticSolver.HYBRID,
+    state: Optional[SystemState] = None,
+    stats: Optional[SimulationStats] = None,
 ) -> Event:
     """Returns next ball-cushion collision (circular cushion segment)"""
 
     if not shot.table.has_circular_cushions:
         return null_event(np.inf)
 
-    ball_cushion_pairs: List[Tuple[str, str]] = []
-    collision_coeffs: List[Tuple[float, ...]] = []
-
-    cache = collision_cache.times.setdefault(EventType.BALL_CIRCULAR_CUSHION, {})
-
-    for ball in shot.balls.values():
-        state = ball.state
-        params = ball.params
-
-        for cushion in shot.table.cushion_segments.circular.values():
-            obj_ids = (ball.id, cushion.id)
+    if state is None:
+        state = SystemState.from_system(shot)
 
-            if obj_ids in cache:
-                continue
-
-            if ball.state.s in const.nontranslating:
-                cache[obj_ids] = np.inf
-                continue
+    with timed(stats, Phase.COEFFICIENTS):
+        ball_cushion_pairs, collision_coeffs = _ball_circular_cushion_collision_coeffs(
+            shot, collision_cache, state
+        )
 
-            ball_cushion_pairs.append(obj_ids)
-            collision_coeffs.append(
-                solve.ball_circular_cushion_collision_coeffs(
-                    rvw=state.rvw,
-                    s=state.s,
-                    a=cushion.a,
-                    b=cushion.b,
-                    r=cushion.radius,
-                    mu=(params.u_s if state.s == const.sliding else params.u_r),
-                    m=params.m,
-                    g=params.g,
-                    R=params.R,
-                )
-            )
+    cache = collision_cache.get_times(EventType.BALL_CIRCULAR_CUSHION)
 
     if len(collision_coeffs):
-        roots = solve_quartics(ps=np.array(collision_coeffs), solver=solver)
+        roots = _solve_quartics(collision_coeffs, solver, stats)
         for root, ball_cushion_pair in zip(roots, ball_cushion_pairs):
             cache[ball_cushion_pair] = shot.t + root
 
     # The cache is now populated and up-to-date
 
-    ball_id, cushion_id = min(cache, key=lambda k: cache[k])
+    (ball_id, cushion_id), time = collision_cache.get_next(
+        EventType.BALL_CIRCULAR_CUSHION
+    )
 
     return ball_circular_cushion_collision(
         ball=shot.balls[ball_id],
         cushion=shot.table.cushion_segments.circular[cushion_id],
-        time=cache[(ball_id, cushion_id)],
+        time=time,
     )
 
 
-def get_next_ball_linear_cushion_collision(
-    shot: System, collision_cache: CollisionCache
-) -> Event:
-    """Returns next ball-cushion collision (linear cushion segment)"""
+def _ball_circular_cushion_collision_coeffs(
+    shot: System, collision_cache: CollisionCache, state: SystemState
+) -> Tuple[List[Tuple[str, str]], NDArray[np.float64]]:
+    """Returns the uncached ball-cushion pairs and their collision quartic coefficients
 
-    if not shot.table.has_linear_cushions:
-        return null_event(np.inf)
+    Pairs that can't possibly collide, or whose quartics have no root before a ball
+    transitions, are cached with a collision time of ``np.inf`` and are not
+    returned.
+    """
 
-    cache = collision_cache.times.setdefault(EventType.BALL_LINEAR_CUSHION, {})
+    cache = collision_cache.get_times(EventType.BALL_CIRCULAR_CUSHION)
 
-    for ball in shot.balls.values():
-        state = ball.state
-        params = ball.params
+    if not shot.table.has_circular_cushions:
+        return [], np.empty((0, 5), dtype=np.float64)
+
+    pairs = state.ball_circular_cushion_pairs
+    candidates = pairs.uncached(cache)
+
+    if not len(candidates):
+        return [], np.empty((0, 5), dtype=np.float64)
+
+    ball_idx, cushion_idx = pairs.idx[:, candidates]
+    culled = solve.ball_object_culled(
+        state.s,
+        state.R,
+        _swept_bounds(state, collision_cache),
+        state.circular_bounds,
+        ball_idx,
+        cushion_idx,
+    )
+    candidates = _cull(cache, pairs, candidates, culled)
+
+    collision_coeffs = solve.ball_circular_cushion_collision_coeffs_many(
+        state.rvw,
+        state.s,
+        state.mu,
+        state.m,
+        state.g,
+        state.R,
+        state.circular,
+        ball_idx[~culled],
+        cushion_idx[~culled],
+    )
 
-        for cushion in shot.table.cushion_segments.linear.values():
-            obj_ids = (ball.id, cushion.id)
+    return _reject(
+        cache,
+        [pairs.keys[k] for k in candidates],
+        collision_coeffs,
+        _translation_times(state, collision_cache),
+        ball_idx[~culled],
+    )
 
-            if obj_ids in cache:
-                continue
 
-            if ball.state.s in const.nontranslating:
-                cache[obj_ids] = np.inf
-                continue
+def get_next_ball_linear_cushion_collision(
+    shot: System,
+    collision_cache: CollisionCache,
+    state: Optional[SystemState] = None,
+) -> Event:
+    """Returns next ball-cushion collision (linear cushion segment)"""
 
-            dtau_E = solve.ball_linear_cushion_collision_time(
-                rvw=state.rvw,
-                s=state.s,
-                lx=cushion.lx,
-                ly=cushion.ly,
-                l0=cushion.l0,
-                p1=cushion.p1,
-                p2=cushion.p2,
-                direction=cushion.direction,
-                mu=(params.u_s if state.s == const.sliding else params.u_r),
-                m=params.m,
-                g=params.g,
-                R=params.R,
-            )
+    if not shot.table.has_linear_cushions:
+        return null_event(np.inf)
 
-            cache[obj_ids] = shot.t + dtau_E
+    if state is None:
+        state = SystemState.from_system(shot)
+
+    cache = collision_cache.get_times(EventType.BALL_LINEAR_CUSHION)
+    pairs = state.ball_linear_cushion_pairs
+    candidates = pairs.uncached(cache)
+
+    if len(candidates):
+        ball_idx, cushion_idx = pairs.idx[:, candidates]
+        culled = solve.ball_object_culled(
+            state.s,
+            state.R,
+            _swept_bounds(state, collision_cache),
+            state.linear_bounds,
+            ball_idx,
+            cushion_idx,
+        )
+        dtau_Es = solve.ball_linear_cushion_collision_times(
+            state.rvw,
+            state.s,
+            state.mu,
+            state.m,
+            state.g,
+            state.R,
+            state.linear_l,
+            state.linear_p1,
+            state.linear_p2,
+            state.linear_direction,
+            ball_idx[~culled],
+            cushion_idx[~culled],
+        )
+
+        # Culled pairs are cached with np.inf, in order with the solved pairs
+        times = np.full(len(candidates), np.inf)
+        times[~culled] = shot.t + dtau_Es
+        for k, time in zip(candidates, times):
+            cache[pairs.keys[k]] = time
 
-    obj_ids = min(cache, key=lambda k: cache[k])
+    obj_ids, time = collision_cache.get_next(EventType.BALL_LINEAR_CUSHION)
 
     return ball_linear_cushion_collision(
         ball=shot.balls[obj_ids[0]],
         cushion=shot.table.cushion_segments.linear[obj_ids[1]],
-        time=cache[obj_ids],
+        time=time,
     )
 
 
@@ -445,57 +1421,101 @@ def get_next_ball_pocket_collision(
     shot: System,
     collision_cache: CollisionCache,
     solver: QuarticSolver = QuarticSolver.HYBRID,
+    state: Optional[SystemState] = None,
+    stats: Optional[SimulationStats] = None,
 ) -> Event:
     """Returns next ball-pocket collision"""
 
     if not shot.table.has_pockets:
         return null_event(np.inf)
 
-    ball_pocket_pairs: List[Tuple[str, str]] = []
-    collision_coeffs: List[Tuple[float, ...]] = []
-
-    cache = collision_cache.times.setdefault(EventType.BALL_POCKET, {})
-
-    for ball in shot.balls.values():
-        state = ball.state
-        params = ball.params
+    if state is None:
+        state = SystemState.from_system(shot)
 
-        for pocket in shot.table.pockets.values():
-            obj_ids = (ball.id, pocket.id)
-
-            if obj_ids in cache:
-                continue
+    with timed(stats, Phase.COEFFICIENTS):
+        ball_pocket_pairs, collision_coeffs = _ball_pocket_collision_coeffs(
+            shot, collision_cache, state
+        )
 
-            if ball.state.s in const.nontranslating:
-                cache[obj_ids] = np.inf
-                continue
-
-            ball_pocket_pairs.append(obj_ids)
-            collision_coeffs.append(
-                solve.ball_pocket_collision_coeffs(
-                    rvw=state.rvw,
-                    s=state.s,
-                    a=pocket.a,
-                    b=pocket.b,
-                    r=pocket.radius,
-                    mu=(params.u_s if state.s == const.sliding else params.u_r),
-                    m=params.m,
-                    g=params.g,
-                    R=params.R,
-                )
-            )
+    cache = collision_cache.get_times(EventType.BALL_POCKET)
 
     if len(collision_coeffs):
-        roots = solve_quartics(ps=np.array(collision_coeffs), solver=solver)
+        roots = _solve_quartics(collision_coeffs, solver, stats)
         for root, ball_pocket_pair in zip(roots, ball_pocket_pairs):
             cache[ball_pocket_pair] = shot.t + root
 
     # The cache is now populated and up-to-date
 
-    ball_id, pocket_id = min(cache, key=lambda k: cache[k])
+    (ball_id, pocket_id), time = collision_cache.get_next(EventType.BALL_POCKET)
 
     return ball_pocket_collision(
         ball=shot.balls[ball_id],
         pocket=shot.table.pockets[pocket_id],
-        time=cache[(ball_id, pocket_id)],
+        time=time,
     )
+
+
+def _ball_pocket_collision_coeffs(
+    shot: System, collision_cache: CollisionCache, state: SystemState
+) -> Tuple[List[Tuple[str, str]], NDArray[np.float64]]:
+    """Returns the uncached ball-pocket pairs and their collision quartic coefficients
+
+    Pairs that can't possibly collide, or whose quartics have no root before a ball
+    transitions, are cached with a collision time of ``np.inf`` and are not
+    returned.
+    """
+
+    cache = collision_cache.get_times(EventType.BALL_POCKET)
+
+    if not shot.table.has_pockets:
+        return [], np.empty((0, 5), dtype=np.float64)
+
+    pairs = state.ball_pocket_pairs
+    candidates = pairs.uncached(cache)
+
+    if not len(candidates):
+        return [], np.empty((0, 5), dtype=np.float64)
+
+    ball_idx, pocket_idx = pairs.idx[:, candidates]
+    culled = solve.ball_object_culled(
+        state.s,
+        state.R,
+        _swept_bounds(state, collision_cache),
+        state.pocket_bounds,
+        ball_idx,
+        pocket_idx,
+    )
+    candidates = _cull(cache, pairs, candidates, culled)
+
+    collision_coeffs = solve.ball_pocket_collision_coeffs_many(
+        state.rvw,
+        state.s,
+        state.mu,
+        state.m,
+        state.g,
+        state.R,
+        state.pockets,
+        ball_idx[~culled],
+        pocket_idx[~culled],
+    )
+
+    return _reject(
+        cache,
+        [pairs.keys[k] for k in candidates],
+        collision_coeffs,
+        _translation_times(state, collision_cache),
+        ball_idx[~culled],
+    )
+
+
+_QUARTIC_COEFFS_GETTERS: Dict[
+    EventType,
+    Callable[
+        [System, CollisionCache, SystemState],
+        Tuple[List[Tuple[str, str]], NDArray[np.float64]],
+    ],
+] = {
+    EventType.BALL_BALL: _ball_ball_collision_coeffs,
+    EventType.BALL_CIRCULAR_CUSHION: _ball_circular_cushion_collision_coeffs,
+    EventType.BALL_POCKET: _ball_pocket_collision_coeffs,
+}
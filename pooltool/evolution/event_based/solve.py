@@ -93,6 +93,105 @@ def get_u(
     return ptmath.coordinate_rotation(ptmath.unit_vector(rel_vel), -phi)
 
 
+@jit(nopython=True, cache=const.use_numba_cache)
+def _swept_interval(c: float, b: float, a: float, T: float) -> Tuple[float, float]:
+    """Get the range of c + b*t + a*t**2 over 0 <= t <= T"""
+    lo = hi = c
+
+    if T == np.inf:
+        if a > 0 or (a == 0 and b > 0):
+            hi = np.inf
+        if a < 0 or (a == 0 and b < 0):
+            lo = -np.inf
+        return lo, hi
+
+    end = c + b * T + a * T**2
+    lo, hi = min(lo, end), max(hi, end)
+
+    if a != 0:
+        t_vertex = -b / (2 * a)
+        if 0 < t_vertex < T:
+            vertex = c + b * t_vertex + a * t_vertex**2
+            lo, hi = min(lo, vertex), max(hi, vertex)
+
+    return lo, hi
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def ball_translation_time(
+    rvw: NDArray[np.float64],
+    s: int,
+    u_s: float,
+    u_r: float,
+    g: float,
+    R: float,
+) -> float:
+    """Get the time until a translating ball's next transition
+
+    This is how long the ball center follows its current parabolic trajectory. Balls
+    that aren't translating keep their position until an event involves them, so
+    `np.inf` is returned.
+
+    (just-in-time compiled)
+    """
+    if s == const.sliding:
+        return ptmath.get_slide_time(rvw, R, u_s, g)
+
+    if s == const.rolling:
+        return ptmath.get_roll_time(rvw, u_r, g)
+
+    return np.inf
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def ball_swept_bounds(
+    rvw: NDArray[np.float64],
+    s: int,
+    u_s: float,
+    u_r: float,
+    g: float,
+    R: float,
+) -> Tuple[float, float, float, float]:
+    """Get the bounding box of the ball center's path until its next transition
+
+    Between transitions, the ball center follows the parabolic trajectory that the
+    collision coefficients (e.g. :func:`ball_ball_collision_coeffs`) are derived from.
+    Since any collision after the ball's next transition is invalidated by the
+    transition, only the path until the transition needs to be considered.
+
+    (just-in-time compiled)
+
+    Returns:
+        Tuple[float, float, float, float]:
+            The box's x-min, x-max, y-min, and y-max.
+    """
+    cx, cy = rvw[0, 0], rvw[0, 1]
+
+    if s == const.spinning or s == const.pocketed or s == const.stationary:
+        return cx, cx, cy, cy
+
+    mu = u_s if s == const.sliding else u_r
+    T = ball_translation_time(rvw, s, u_s, u_r, g, R)
+
+    phi = ptmath.angle(rvw[1])
+    v = ptmath.norm3d(rvw[1])
+
+    u = get_u(rvw, R, phi, s)
+
+    K = -0.5 * mu * g
+    cos_phi = np.cos(phi)
+    sin_phi = np.sin(phi)
+
+    ax = K * (u[0] * cos_phi - u[1] * sin_phi)
+    ay = K * (u[0] * sin_phi + u[1] * cos_phi)
+    bx, by = v * cos_phi, v * sin_phi
+
+    x_lo, x_hi = _swept_interval(cx, bx, ax, T)
+    y_lo, y_hi = _swept_interval(cy, by, ay, T)
+
+    return x_lo, x_hi, y_lo, y_hi
+
+
 @jit(nopython=True, cache=const.use_numba_cache)
 def ball_ball_collision_coeffs(
     rvw1: NDArray[np.float64],
@@ -349,3 +448,295 @@ def ball_pocket_collision_coeffs(
     E = 0.5 * (a**2 + b**2 + cx**2 + cy**2 - r**2) - (cx * a + cy * b)
 
     return A, B, C, D, E
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def bounds_overlap(
+    bounds1: NDArray[np.float64], bounds2: NDArray[np.float64], margin: float
+) -> bool:
+    """Whether two bounding boxes come within ``margin`` of each other
+
+    (just-in-time compiled)
+    """
+    return (
+        bounds1[0] <= bounds2[1] + margin
+        and bounds2[0] <= bounds1[1] + margin
+        and bounds1[2] <= bounds2[3] + margin
+        and bounds2[2] <= bounds1[3] + margin
+    )
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def balls_swept_bounds(
+    rvw: NDArray[np.float64],
+    s: NDArray[np.int64],
+    u_s: NDArray[np.float64],
+    u_r: NDArray[np.float64],
+    g: NDArray[np.float64],
+    R: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Get the swept bounding box of every ball (see :func:`ball_swept_bounds`)
+
+    (just-in-time compiled)
+
+    Returns:
+        NDArray[np.float64]:
+            The x-min, x-max, y-min, and y-max of each ball's box. Shape ``(n, 4)``.
+    """
+    bounds = np.empty((len(s), 4), dtype=np.float64)
+    for i in range(len(s)):
+        x_lo, x_hi, y_lo, y_hi = ball_swept_bounds(
+            rvw[i], s[i], u_s[i], u_r[i], g[i], R[i]
+        )
+        bounds[i, 0] = x_lo
+        bounds[i, 1] = x_hi
+        bounds[i, 2] = y_lo
+        bounds[i, 3] = y_hi
+
+    return bounds
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def balls_translation_times(
+    rvw: NDArray[np.float64],
+    s: NDArray[np.int64],
+    u_s: NDArray[np.float64],
+    u_r: NDArray[np.float64],
+    g: NDArray[np.float64],
+    R: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Get the translation time of every ball (see :func:`ball_translation_time`)
+
+    (just-in-time compiled)
+    """
+    times = np.empty(len(s), dtype=np.float64)
+    for i in range(len(s)):
+        times[i] = ball_translation_time(rvw[i], s[i], u_s[i], u_r[i], g[i], R[i])
+
+    return times
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def ball_ball_culled(
+    rvw: NDArray[np.float64],
+    s: NDArray[np.int64],
+    R: NDArray[np.float64],
+    bounds: NDArray[np.float64],
+    idx1: NDArray[np.intp],
+    idx2: NDArray[np.intp],
+) -> NDArray[np.bool_]:
+    """Flag the ball pairs that can't possibly collide
+
+    A pair can't collide if either ball is pocketed, if neither ball is translating, if
+    the balls are intersecting (internal collisions are avoided), or, when swept
+    ``bounds`` are passed (see :func:`balls_swept_bounds`), if the balls' paths don't
+    come near each other before either one transitions. Pass an empty ``bounds`` array
+    to skip the last test.
+
+    (just-in-time compiled)
+    """
+    culled = np.empty(len(idx1), dtype=np.bool_)
+    broad_phase = len(bounds) > 0
+
+    for k in range(len(idx1)):
+        i, j = int(idx1[k]), int(idx2[k])
+        s1, s2 = s[i], s[j]
+
+        if s1 == const.pocketed or s2 == const.pocketed:
+            culled[k] = True
+        elif (s1 == const.spinning or s1 == const.stationary) and (
+            s2 == const.spinning or s2 == const.stationary
+        ):
+            culled[k] = True
+        elif ptmath.norm3d(rvw[i, 0] - rvw[j, 0]) < R[i] + R[j]:
+            culled[k] = True
+        elif broad_phase and not bounds_overlap(bounds[i], bounds[j], R[i] + R[j]):
+            culled[k] = True
+        else:
+            culled[k] = False
+
+    return culled
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def ball_object_culled(
+    s: NDArray[np.int64],
+    R: NDArray[np.float64],
+    bounds: NDArray[np.float64],
+    object_bounds: NDArray[np.float64],
+    ball_idx: NDArray[np.intp],
+    object_idx: NDArray[np.intp],
+) -> NDArray[np.bool_]:
+    """Flag the ball-object pairs (cushion segments or pockets) that can't collide
+
+    A pair can't collide if the ball isn't translating or, when swept ``bounds`` are
+    passed (see :func:`ball_ball_culled`), if the ball's path doesn't come near the
+    object before the ball transitions.
+
+    (just-in-time compiled)
+    """
+    culled = np.empty(len(ball_idx), dtype=np.bool_)
+    broad_phase = len(bounds) > 0
+
+    for k in range(len(ball_idx)):
+        i, j = int(ball_idx[k]), int(object_idx[k])
+
+        if s[i] == const.spinning or s[i] == const.pocketed or s[i] == const.stationary:
+            culled[k] = True
+        elif broad_phase and not bounds_overlap(bounds[i], object_bounds[j], R[i]):
+            culled[k] = True
+        else:
+            culled[k] = False
+
+    return culled
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def ball_ball_collision_coeffs_many(
+    rvw: NDArray[np.float64],
+    s: NDArray[np.int64],
+    mu: NDArray[np.float64],
+    m: NDArray[np.float64],
+    g: NDArray[np.float64],
+    R: NDArray[np.float64],
+    idx1: NDArray[np.intp],
+    idx2: NDArray[np.intp],
+) -> NDArray[np.float64]:
+    """Get the ball-ball collision quartic coeffs of many ball pairs
+
+    The balls are rows of struct-of-arrays ball data, and each pair is given by the
+    rows ``idx1[k]`` and ``idx2[k]``. See :func:`ball_ball_collision_coeffs`.
+
+    (just-in-time compiled)
+
+    Returns:
+        NDArray[np.float64]: The coefficients of each pair. Shape ``(k, 5)``.
+    """
+    coeffs = np.empty((len(idx1), 5), dtype=np.float64)
+
+    for k in range(len(idx1)):
+        i, j = int(idx1[k]), int(idx2[k])
+        a, b, c, d, e = ball_ball_collision_coeffs(
+            rvw[i], rvw[j], s[i], s[j], mu[i], mu[j], m[i], m[j], g[i], g[j], R[i]
+        )
+        coeffs[k, 0] = a
+        coeffs[k, 1] = b
+        coeffs[k, 2] = c
+        coeffs[k, 3] = d
+        coeffs[k, 4] = e
+
+    return coeffs
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def ball_linear_cushion_collision_times(
+    rvw: NDArray[np.float64],
+    s: NDArray[np.int64],
+    mu: NDArray[np.float64],
+    m: NDArray[np.float64],
+    g: NDArray[np.float64],
+    R: NDArray[np.float64],
+    lines: NDArray[np.float64],
+    p1: NDArray[np.float64],
+    p2: NDArray[np.float64],
+    direction: NDArray[np.int64],
+    ball_idx: NDArray[np.intp],
+    cushion_idx: NDArray[np.intp],
+) -> NDArray[np.float64]:
+    """Get the times until collision of many ball-linear-cushion pairs
+
+    See :func:`ball_linear_cushion_collision_time`. ``lines`` holds the :math:`l_x`,
+    :math:`l_y`, and :math:`l_0` coefficients of each cushion segment.
+
+    (just-in-time compiled)
+    """
+    times = np.empty(len(ball_idx), dtype=np.float64)
+
+    for k in range(len(ball_idx)):
+        i, j = int(ball_idx[k]), int(cushion_idx[k])
+        times[k] = ball_linear_cushion_collision_time(
+            rvw[i],
+            s[i],
+            lines[j, 0],
+            lines[j, 1],
+            lines[j, 2],
+            p1[j],
+            p2[j],
+            direction[j],
+            mu[i],
+            m[i],
+            g[i],
+            R[i],
+        )
+
+    return times
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def ball_circular_cushion_collision_coeffs_many(
+    rvw: NDArray[np.float64],
+    s: NDArray[np.int64],
+    mu: NDArray[np.float64],
+    m: NDArray[np.float64],
+    g: NDArray[np.float64],
+    R: NDArray[np.float64],
+    abr: NDArray[np.float64],
+    ball_idx: NDArray[np.intp],
+    cushion_idx: NDArray[np.intp],
+) -> NDArray[np.float64]:
+    """Get the quartic coeffs of many ball-circular-cushion pairs
+
+    See :func:`ball_circular_cushion_collision_coeffs`. ``abr`` holds the center
+    coordinates and radius of each cushion segment.
+
+    (just-in-time compiled)
+    """
+    coeffs = np.empty((len(ball_idx), 5), dtype=np.float64)
+
+    for k in range(len(ball_idx)):
+        i, j = int(ball_idx[k]), int(cushion_idx[k])
+        A, B, C, D, E = ball_circular_cushion_collision_coeffs(
+            rvw[i], s[i], abr[j, 0], abr[j, 1], abr[j, 2], mu[i], m[i], g[i], R[i]
+        )
+        coeffs[k, 0] = A
+        coeffs[k, 1] = B
+        coeffs[k, 2] = C
+        coeffs[k, 3] = D
+        coeffs[k, 4] = E
+
+    return coeffs
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def ball_pocket_collision_coeffs_many(
+    rvw: NDArray[np.float64],
+    s: NDArray[np.int64],
+    mu: NDArray[np.float64],
+    m: NDArray[np.float64],
+    g: NDArray[np.float64],
+    R: NDArray[np.float64],
+    abr: NDArray[np.float64],
+    ball_idx: NDArray[np.intp],
+    pocket_idx: NDArray[np.intp],
+) -> NDArray[np.float64]:
+    """Get the quartic coeffs of many ball-pocket pairs
+
+    See :func:`ball_pocket_collision_coeffs`. ``abr`` holds the center coordinates and
+    radius of each pocket.
+
+    (just-in-time compiled)
+    """
+    coeffs = np.empty((len(ball_idx), 5), dtype=np.float64)
+
+    for k in range(len(ball_idx)):
+        i, j = int(ball_idx[k]), int(pocket_idx[k])
+        A, B, C, D, E = ball_pocket_collision_coeffs(
+            rvw[i], s[i], abr[j, 0], abr[j, 1], abr[j, 2], mu[i], m[i], g[i], R[i]
+        )
+        coeffs[k, 0] = A
+        coeffs[k, 1] = B
+        coeffs[k, 2] = C
+        coeffs[k, 3] = D
+        coeffs[k, 4] = E
+
+    return coeffs
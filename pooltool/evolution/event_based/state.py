@@ -0,0 +1,313 @@
+#! /usr/bin/env python
+
+from __future__ import annotations
+
+from itertools import combinations
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+import attrs
+import numpy as np
+from numpy.typing import NDArray
+
+import pooltool.constants as const
+from pooltool.system.datatypes import System
+
+
+@attrs.define(eq=False)
+class ObjectPairs:
+    """The object pairs of one collision type (*e.g.* every ball-pocket pair)
+
+    Attributes:
+        keys:
+            The object ID pairs, which double as collision cache keys.
+        idx:
+            The array positions of the first and second object of each pair. For
+            ball-ball pairs, both are ball rows of :class:`SystemState`. Otherwise, the
+            first is a ball row and the second is the position of the cushion segment
+            or pocket. Shape ``(2, n_pairs)``.
+    """
+
+    keys: List[Tuple[str, str]]
+    idx: NDArray[np.intp]
+    _positions: Dict[Tuple[str, str], int] = attrs.field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self._positions = {key: k for k, key in enumerate(self.keys)}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def uncached(self, cache: Mapping[Tuple[str, str], float]) -> NDArray[np.intp]:
+        """Return the positions of the pairs missing from a collision cache, in order
+
+        The cache is assumed to hold no keys other than :attr:`keys`.
+        """
+        if len(cache) == len(self.keys):
+            return np.empty(0, dtype=np.intp)
+
+        positions = self._positions
+        missing = np.fromiter(
+            (positions[key] for key in positions.keys() - cache.keys()), dtype=np.intp
+        )
+        missing.sort()
+        return missing
+
+    @classmethod
+    def ball_ball(cls, ball_ids: List[str]) -> ObjectPairs:
+        """Every unordered pair of balls, ordered like ``itertools.combinations``"""
+        idx = np.array(list(combinations(range(len(ball_ids)), 2)), dtype=np.intp)
+        return cls(
+            keys=list(combinations(ball_ids, 2)),
+            idx=np.ascontiguousarray(idx.reshape(-1, 2).T),
+        )
+
+    @classmethod
+    def ball_object(cls, ball_ids: List[str], object_ids: List[str]) -> ObjectPairs:
+        """Every ball-object pair, ball-major"""
+        return cls(
+            keys=[(ball_id, obj_id) for ball_id in ball_ids for obj_id in object_ids],
+            idx=np.array(
+                [
+                    np.repeat(np.arange(len(ball_ids)), len(object_ids)),
+                    np.tile(np.arange(len(object_ids)), len(ball_ids)),
+                ],
+                dtype=np.intp,
+            ),
+        )
+
+
+def _circle_bounds(abr: NDArray[np.float64]) -> NDArray[np.float64]:
+    a, b, r = abr.T
+    return np.stack((a - r, a + r, b - r, b + r), axis=-1)
+
+
+def _segment_bounds(
+    p1: NDArray[np.float64], p2: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    return np.stack(
+        (
+            np.minimum(p1[:, 0], p2[:, 0]),
+            np.maximum(p1[:, 0], p2[:, 0]),
+            np.minimum(p1[:, 1], p2[:, 1]),
+            np.maximum(p1[:, 1], p2[:, 1]),
+        ),
+        axis=-1,
+    )
+
+
+@attrs.define(eq=False)
+class SystemState:
+    """A struct-of-arrays representation of a system, used internally by the simulator
+
+    The event loop touches the state and parameters of every ball, for every object
+    pair, at every event. Dereferencing these through :class:`Ball` objects is slow, so
+    the simulator instead works against contiguous arrays, which are handed whole to
+    the just-in-time compiled routines in :mod:`pooltool.evolution.event_based.solve`.
+
+    The balls' states are synced to the :class:`Ball` objects (see :meth:`push`) before
+    the system history is written, and are synced from the :class:`Ball` objects (see
+    :meth:`pull`) after an event is resolved. Ball parameters and table geometry are
+    assumed constant throughout the simulation.
+
+    Attributes:
+        ball_ids:
+            The ball IDs, ordered like ``System.balls``. Row ``i`` of every ball array
+            corresponds to ``ball_ids[i]``.
+        index:
+            Maps each ball ID to its row.
+        rvw:
+            The displacement, velocity, and angular velocity vectors of each ball. Shape
+            ``(n, 3, 3)``.
+        s:
+            The motion state of each ball.
+        R:
+            The radius of each ball.
+        m:
+            The mass of each ball.
+        u_s:
+            The sliding coefficient of friction of each ball.
+        u_sp:
+            The spinning coefficient of friction of each ball.
+        u_r:
+            The rolling coefficient of friction of each ball.
+        g:
+            The gravitational constant of each ball.
+        circular:
+            The center coordinates and radius of each circular cushion segment. Shape
+            ``(n_segments, 3)``.
+        linear_l:
+            The :math:`l_x`, :math:`l_y`, and :math:`l_0` coefficients of each linear
+            cushion segment's line equation. Shape ``(n_segments, 3)``.
+        linear_p1:
+            The first endpoint of each linear cushion segment. Shape
+            ``(n_segments, 3)``.
+        linear_p2:
+            The second endpoint of each linear cushion segment. Shape
+            ``(n_segments, 3)``.
+        linear_direction:
+            The direction of each linear cushion segment (see
+            :class:`pooltool.objects.table.components.CushionDirection`).
+        pockets:
+            The center coordinates and radius of each pocket. Shape ``(n_pockets, 3)``.
+        circular_bounds:
+            The bounding box of each circular cushion segment. Shape
+            ``(n_segments, 4)``.
+        linear_bounds:
+            The bounding box of each linear cushion segment. Shape ``(n_segments, 4)``.
+        pocket_bounds:
+            The bounding box of each pocket. Shape ``(n_pockets, 4)``.
+        ball_ball_pairs:
+            Every ball-ball pair.
+        ball_circular_cushion_pairs:
+            Every ball-circular cushion segment pair.
+        ball_linear_cushion_pairs:
+            Every ball-linear cushion segment pair.
+        ball_pocket_pairs:
+            Every ball-pocket pair.
+        moving:
+            The rows of the balls that are in motion (*i.e.* not stationary or
+            pocketed). Motion states only change when an event is resolved, so this is
+            kept up to date by :meth:`pull`.
+    """
+
+    ball_ids: List[str]
+    index: Dict[str, int]
+    rvw: NDArray[np.float64]
+    s: NDArray[np.int64]
+    R: NDArray[np.float64]
+    m: NDArray[np.float64]
+    u_s: NDArray[np.float64]
+    u_sp: NDArray[np.float64]
+    u_r: NDArray[np.float64]
+    g: NDArray[np.float64]
+
+    circular: NDArray[np.float64]
+    linear_l: NDArray[np.float64]
+    linear_p1: NDArray[np.float64]
+    linear_p2: NDArray[np.float64]
+    linear_direction: NDArray[np.int64]
+    pockets: NDArray[np.float64]
+
+    circular_bounds: NDArray[np.float64]
+    linear_bounds: NDArray[np.float64]
+    pocket_bounds: NDArray[np.float64]
+
+    ball_ball_pairs: ObjectPairs
+    ball_circular_cushion_pairs: ObjectPairs
+    ball_linear_cushion_pairs: ObjectPairs
+    ball_pocket_pairs: ObjectPairs
+
+    moving: NDArray[np.intp] = attrs.field(init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self._update_moving()
+
+    def __len__(self) -> int:
+        return len(self.ball_ids)
+
+    @property
+    def mu(self) -> NDArray[np.float64]:
+        """The friction coefficient governing each ball's current trajectory
+
+        This is the sliding coefficient of friction for sliding balls, and the rolling
+        coefficient of friction otherwise.
+        """
+        return np.where(self.s == const.sliding, self.u_s, self.u_r)
+
+    def pull(self, system: System, ball_ids: Iterable[str]) -> None:
+        """Sync the states of some balls from the system's :class:`Ball` objects"""
+        for ball_id in ball_ids:
+            i = self.index[ball_id]
+            state = system.balls[ball_id].state
+            self.rvw[i] = state.rvw
+            self.s[i] = state.s
+
+        self._update_moving()
+
+    def push(self, system: System, t: float) -> None:
+        """Sync the states of the moving balls to the system's :class:`Ball` objects
+
+        Only the balls in :attr:`moving` are synced. The states of the other balls
+        don't change between events, and the balls an event resolves are synced the
+        other way (see :meth:`pull`). The balls' states are overwritten in place, which
+        is safe because ball histories and event agents hold copies of them.
+        """
+        balls = system.balls
+        for i in self.moving:
+            state = balls[self.ball_ids[i]].state
+            state.rvw[:] = self.rvw[i]
+            state.s = int(self.s[i])
+            state.t = t
+
+    def copy(self) -> SystemState:
+        """Create a copy
+
+        Only the ball states are copied. Everything else is constant throughout the
+        simulation, and is shared.
+        """
+        return attrs.evolve(self, rvw=self.rvw.copy(), s=self.s.copy())
+
+    def _update_moving(self) -> None:
+        self.moving = np.flatnonzero(
+            (self.s != const.stationary) & (self.s != const.pocketed)
+        )
+
+    @classmethod
+    def from_system(cls, system: System) -> SystemState:
+        balls = list(system.balls.values())
+        ball_ids = [ball.id for ball in balls]
+
+        circular = list(system.table.cushion_segments.circular.values())
+        linear = list(system.table.cushion_segments.linear.values())
+        pockets = list(system.table.pockets.values())
+
+        circular_abr = np.array(
+            [(cushion.a, cushion.b, cushion.radius) for cushion in circular],
+            dtype=np.float64,
+        ).reshape(-1, 3)
+        pocket_abr = np.array(
+            [(pocket.a, pocket.b, pocket.radius) for pocket in pockets],
+            dtype=np.float64,
+        ).reshape(-1, 3)
+        linear_p1 = np.array([cushion.p1 for cushion in linear], np.float64)
+        linear_p2 = np.array([cushion.p2 for cushion in linear], np.float64)
+        linear_p1, linear_p2 = linear_p1.reshape(-1, 3), linear_p2.reshape(-1, 3)
+
+        return cls(
+            ball_ids=ball_ids,
+            index={ball_id: i for i, ball_id in enumerate(ball_ids)},
+            rvw=np.array([ball.state.rvw for ball in balls], np.float64).reshape(
+                -1, 3, 3
+            ),
+            s=np.array([ball.state.s for ball in balls], np.int64),
+            R=np.array([ball.params.R for ball in balls], np.float64),
+            m=np.array([ball.params.m for ball in balls], np.float64),
+            u_s=np.array([ball.params.u_s for ball in balls], np.float64),
+            u_sp=np.array([ball.params.u_sp for ball in balls], np.float64),
+            u_r=np.array([ball.params.u_r for ball in balls], np.float64),
+            g=np.array([ball.params.g for ball in balls], np.float64),
+            circular=circular_abr,
+            linear_l=np.array(
+                [(cushion.lx, cushion.ly, cushion.l0) for cushion in linear],
+                dtype=np.float64,
+            ).reshape(-1, 3),
+            linear_p1=linear_p1,
+            linear_p2=linear_p2,
+            linear_direction=np.array(
+                [cushion.direction for cushion in linear], dtype=np.int64
+            ),
+            pockets=pocket_abr,
+            circular_bounds=_circle_bounds(circular_abr),
+            linear_bounds=_segment_bounds(linear_p1, linear_p2),
+            pocket_bounds=_circle_bounds(pocket_abr),
+            ball_ball_pairs=ObjectPairs.ball_ball(ball_ids),
+            ball_circular_cushion_pairs=ObjectPairs.ball_object(
+                ball_ids, [cushion.id for cushion in circular]
+            ),
+            ball_linear_cushion_pairs=ObjectPairs.ball_object(
+                ball_ids, [cushion.id for cushion in linear]
+            ),
+            ball_pocket_pairs=ObjectPairs.ball_object(
+                ball_ids, [pocket.id for pocket in pockets]
+            ),
+        )
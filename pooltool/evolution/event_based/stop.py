@@ -0,0 +1,189 @@
+"""Conditions for stopping a simulation early
+
+By default, :func:`pooltool.evolution.event_based.simulate.simulate` runs until every
+ball has come to rest. Yet many questions about a shot, like which ball the cue ball
+hits first, or whether the cue ball scratches, are answered well before then. Passing a
+:class:`StopCondition` as ``stop_when`` stops the simulation as soon as the condition is
+met.
+
+Conditions are composable with ``|`` (either is met) and ``&`` (both have been met):
+
+    >>> import pooltool as pt
+    >>> from pooltool.evolution.event_based.stop import BallBallCollision, BallPocketed
+    >>> system = pt.System.example()
+    >>> pt.simulate(system, stop_when=BallBallCollision("cue") | BallPocketed("cue"))
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import attrs
+
+from pooltool.events import Event, EventType
+from pooltool.system.datatypes import System
+
+Monitor = Callable[[System, Event], bool]
+"""Called with the system after each event is recorded. Returns whether to stop"""
+
+
+def _as_conditions(conditions: Iterable[StopCondition]) -> Tuple[StopCondition, ...]:
+    return tuple(conditions)
+
+
+class StopCondition(ABC):
+    """A condition under which a simulation is stopped early
+
+    Subclasses define :meth:`monitor`, which the simulator calls once per simulation.
+    Since conditions can be stateful (*e.g.* counting cushion hits), the state lives in
+    the returned monitor, and a condition can be reused across simulations.
+    """
+
+    @abstractmethod
+    def monitor(self) -> Monitor:
+        """Return a new monitor, to be called with each event of one simulation
+
+        Once a monitor returns True, the simulation is stopped.
+        """
+
+    def __or__(self, other: StopCondition) -> StopCondition:
+        return AnyOf((self, other))
+
+    def __and__(self, other: StopCondition) -> StopCondition:
+        return AllOf((self, other))
+
+
+@attrs.define(frozen=True)
+class EventOccurs(StopCondition):
+    """Met when an event of a given type, involving the given objects, occurs
+
+    Attributes:
+        event_type:
+            The event type.
+        ids:
+            The IDs of objects (*e.g.* balls) the event must involve. If empty
+            (default), any event of the event type meets the condition.
+    """
+
+    event_type: EventType
+    ids: Tuple[str, ...] = attrs.field(default=(), converter=tuple)
+
+    def monitor(self) -> Monitor:
+        def _monitor(_: System, event: Event) -> bool:
+            return event.event_type == self.event_type and all(
+                object_id in event.ids for object_id in self.ids
+            )
+
+        return _monitor
+
+
+def _optional_ids(ball_id: Optional[str]) -> Tuple[str, ...]:
+    return () if ball_id is None else (ball_id,)
+
+
+@attrs.define(frozen=True)
+class BallBallCollision(StopCondition):
+    """Met when a ball-ball collision occurs
+
+    Attributes:
+        ball_id:
+            If not None, only collisions involving this ball meet the condition. For
+            example, ``BallBallCollision("cue")`` is met when the cue ball first hits
+            another ball.
+    """
+
+    ball_id: Optional[str] = None
+
+    def monitor(self) -> Monitor:
+        return EventOccurs(EventType.BALL_BALL, _optional_ids(self.ball_id)).monitor()
+
+
+@attrs.define(frozen=True)
+class BallPocketed(StopCondition):
+    """Met when a ball is pocketed
+
+    Attributes:
+        ball_id:
+            If not None, only this ball being pocketed meets the condition.
+    """
+
+    ball_id: Optional[str] = None
+
+    def monitor(self) -> Monitor:
+        return EventOccurs(EventType.BALL_POCKET, _optional_ids(self.ball_id)).monitor()
+
+
+_CUSHION_EVENT_TYPES = {EventType.BALL_LINEAR_CUSHION, EventType.BALL_CIRCULAR_CUSHION}
+
+
+@attrs.define(frozen=True)
+class CushionHits(StopCondition):
+    """Met when a ball has hit cushions a given number of times
+
+    Both linear and circular cushion segments count.
+
+    Attributes:
+        ball_id:
+            The ball ID.
+        n:
+            The number of cushion hits.
+    """
+
+    ball_id: str
+    n: int = 1
+
+    def monitor(self) -> Monitor:
+        hits = 0
+
+        def _monitor(_: System, event: Event) -> bool:
+            nonlocal hits
+            if event.event_type in _CUSHION_EVENT_TYPES:
+                hits += event.ids[0] == self.ball_id
+            return hits >= self.n
+
+        return _monitor
+
+
+@attrs.define(frozen=True)
+class AnyOf(StopCondition):
+    """Met when any of the conditions is met
+
+    Attributes:
+        conditions:
+            The conditions.
+    """
+
+    conditions: Tuple[StopCondition, ...] = attrs.field(converter=_as_conditions)
+
+    def monitor(self) -> Monitor:
+        monitors = [condition.monitor() for condition in self.conditions]
+
+        def _monitor(shot: System, event: Event) -> bool:
+            return any(monitor(shot, event) for monitor in monitors)
+
+        return _monitor
+
+
+@attrs.define(frozen=True)
+class AllOf(StopCondition):
+    """Met once all of the conditions have been met, not necessarily by the same event
+
+    Attributes:
+        conditions:
+            The conditions.
+    """
+
+    conditions: Tuple[StopCondition, ...] = attrs.field(converter=_as_conditions)
+
+    def monitor(self) -> Monitor:
+        monitors = [condition.monitor() for condition in self.conditions]
+        met: List[bool] = [False] * len(monitors)
+
+        def _monitor(shot: System, event: Event) -> bool:
+            for i, monitor in enumerate(monitors):
+                if not met[i]:
+                    met[i] = monitor(shot, event)
+            return all(met)
+
+        return _monitor
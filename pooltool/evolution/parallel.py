@@ -0,0 +1,284 @@
+"""Simulate many systems in parallel across a pool of processes
+
+For an explanation, see :func:`simulate_pool`
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker
+from multiprocessing.context import BaseContext
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from pooltool.events import EventType
+from pooltool.evolution.event_based.config import INCLUDED_EVENTS
+from pooltool.evolution.event_based.simulate import simulate, simulate_many
+from pooltool.physics.engine import PhysicsEngine
+from pooltool.ptmath.roots.quartic import QuarticSolver
+from pooltool.system.datatypes import System
+from pooltool.system.trace import encode_trace, load_trace_buffer
+
+_Handle = Tuple[int, str, int]
+"""A simulated system parked in shared memory: (index, block name, payload size)"""
+
+
+def simulate_pool(
+    shots: Sequence[System],
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    engine: Optional[PhysicsEngine] = None,
+    continuous: bool = False,
+    dt: Optional[float] = None,
+    t_final: Optional[float] = None,
+    quartic_solver: QuarticSolver = QuarticSolver.HYBRID,
+    include: Set[EventType] = INCLUDED_EVENTS,
+    max_events: int = 0,
+    broad_phase: bool = True,
+    mp_context: Optional[BaseContext] = None,
+) -> List[System]:
+    """Simulate systems in parallel using a pool of worker processes
+
+    The systems are split into chunks that are shipped out to the worker processes.
+    Each worker simulates its chunk in lockstep with
+    :func:`pooltool.evolution.event_based.simulate.simulate_many` and parks each
+    simulated system in a block of shared memory, laid out in the trace format (see
+    :mod:`pooltool.system.trace`): the events and ball histories of a simulated system
+    are flat arrays of known size, so they're copied straight into shared memory. The
+    parent process rebuilds each system from those arrays (see
+    :func:`pooltool.system.trace.load_trace_buffer`), so simulated systems are never
+    pickled on their way back.
+
+    Every worker warms up the numba caches once, when it is started, so the
+    compilation/cache-loading cost isn't paid on a per-chunk basis.
+
+    Note:
+        The systems are loaded lazily (see
+        :meth:`pooltool.system.datatypes.System.load`), so the initial and final
+        states of event agents are built the first time they're accessed.
+
+    Args:
+        shots:
+            The systems you would like simulated. They are not modified.
+        workers:
+            The number of worker processes. Defaults to ``os.cpu_count()``.
+        chunksize:
+            The number of systems shipped to a worker per task. By default, the systems
+            are divided such that each worker receives roughly 4 chunks.
+        engine:
+            See :func:`pooltool.evolution.event_based.simulate.simulate`.
+        continuous:
+            See :func:`pooltool.evolution.event_based.simulate.simulate`.
+        dt:
+            See :func:`pooltool.evolution.event_based.simulate.simulate`.
+        t_final:
+            See :func:`pooltool.evolution.event_based.simulate.simulate`.
+        quartic_solver:
+            See :func:`pooltool.evolution.event_based.simulate.simulate`.
+        include:
+            See :func:`pooltool.evolution.event_based.simulate.simulate`.
+        max_events:
+            See :func:`pooltool.evolution.event_based.simulate.simulate`.
+        broad_phase:
+            See :func:`pooltool.evolution.event_based.simulate.simulate`.
+        mp_context:
+            A multiprocessing context (e.g. ``multiprocessing.get_context("spawn")``).
+            Defaults to the platform default.
+
+    Returns:
+        List[System]:
+            The simulated systems, in the same order as ``shots``, regardless of the
+            order in which the workers finish.
+
+    Examples:
+        >>> import pooltool as pt
+        >>> from pooltool.evolution.parallel import simulate_pool
+        >>> shots = []
+        >>> for phi in range(0, 360, 5):
+        >>>     shot = pt.System.example()
+        >>>     shot.strike(phi=phi)
+        >>>     shots.append(shot)
+        >>> simulated = simulate_pool(shots, workers=4)
+        >>> assert simulated == [pt.simulate(shot) for shot in shots]
+
+    See Also:
+        - To consume results as soon as they are ready, see
+          :func:`simulate_pool_iter`.
+    """
+    results: List[Optional[System]] = [None] * len(shots)
+
+    for idx, system in simulate_pool_iter(
+        shots,
+        workers=workers,
+        chunksize=chunksize,
+        engine=engine,
+        continuous=continuous,
+        dt=dt,
+        t_final=t_final,
+        quartic_solver=quartic_solver,
+        include=include,
+        max_events=max_events,
+        broad_phase=broad_phase,
+        mp_context=mp_context,
+    ):
+        results[idx] = system
+
+    return results  # type: ignore
+
+
+def simulate_pool_iter(
+    shots: Sequence[System],
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    ordered: bool = False,
+    engine: Optional[PhysicsEngine] = None,
+    continuous: bool = False,
+    dt: Optional[float] = None,
+    t_final: Optional[float] = None,
+    quartic_solver: QuarticSolver = QuarticSolver.HYBRID,
+    include: Set[EventType] = INCLUDED_EVENTS,
+    max_events: int = 0,
+    broad_phase: bool = True,
+    mp_context: Optional[BaseContext] = None,
+) -> Iterator[Tuple[int, System]]:
+    """Simulate systems in parallel and stream them back as they complete
+
+    This is the streaming counterpart of :func:`simulate_pool`. See that function for a
+    description of the arguments.
+
+    Args:
+        ordered:
+            If False (default), simulated systems are yielded as soon as their chunk is
+            finished. If True, they are yielded in the same order as ``shots``
+            (systems that finish early are held back until their predecessors have
+            been yielded).
+
+    Yields:
+        Tuple[int, System]:
+            The index of the system in ``shots``, and the simulated system.
+    """
+    if not len(shots):
+        return
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if chunksize is None:
+        chunksize = max(1, math.ceil(len(shots) / (4 * workers)))
+
+    kwargs: Dict[str, Any] = dict(
+        engine=engine,
+        continuous=continuous,
+        dt=dt,
+        t_final=t_final,
+        quartic_solver=quartic_solver,
+        include=include,
+        max_events=max_events,
+        broad_phase=broad_phase,
+    )
+
+    if os.name == "posix":
+        # Workers must share the parent's resource tracker. Otherwise each worker
+        # tracks the shared memory it creates, and cleans it up when it exits,
+        # regardless of whether the parent has collected it.
+        resource_tracker.ensure_running()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,
+        initializer=_warm_up,
+    ) as executor:
+        pending = {
+            executor.submit(
+                _simulate_chunk, start, shots[start : start + chunksize], kwargs
+            )
+            for start in range(0, len(shots), chunksize)
+        }
+
+        # The results of finished chunks that have yet to be collected
+        handles: Deque[_Handle] = deque()
+
+        held: Dict[int, System] = {}
+        next_idx = 0
+
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    if future.exception() is None:
+                        handles.extend(future.result())
+                for future in done:
+                    # Raise the failure of any chunk
+                    future.result()
+
+                while handles:
+                    handle = handles.popleft()
+                    idx, system = handle[0], _collect(handle)
+
+                    if not ordered:
+                        yield idx, system
+                        continue
+
+                    held[idx] = system
+                    while next_idx in held:
+                        yield next_idx, held.pop(next_idx)
+                        next_idx += 1
+        finally:
+            # If the consumer stops early (or something fails), release the shared
+            # memory of any results that will never be collected
+            for future in pending:
+                future.cancel()
+            for future in wait(pending).done:
+                if not future.cancelled() and future.exception() is None:
+                    handles.extend(future.result())
+            for handle in handles:
+                _release(handle)
+
+
+def _warm_up() -> None:
+    """Compile (or load from cache) the numba functions used during simulation"""
+    simulate(System.example(), continuous=True)
+
+
+def _simulate_chunk(
+    start: int, shots: Sequence[System], kwargs: Dict[str, Any]
+) -> List[_Handle]:
+    """Simulate a chunk of systems and park each result in shared memory"""
+    simulated = simulate_many(shots, inplace=True, **kwargs)
+    return [_park(start + i, system) for i, system in enumerate(simulated)]
+
+
+def _park(idx: int, system: System) -> _Handle:
+    trace = encode_trace(system)
+
+    shm = SharedMemory(create=True, size=trace.nbytes)
+    buf = shm.buf
+    assert buf is not None, "shared memory must be open"
+    trace.write_into(buf)
+    shm.close()
+
+    return idx, shm.name, trace.nbytes
+
+
+def _collect(handle: _Handle) -> System:
+    _, name, size = handle
+
+    shm = SharedMemory(name=name)
+    try:
+        buf = shm.buf
+        assert buf is not None, "shared memory must be open"
+        with buf[:size] as trace:
+            return load_trace_buffer(trace, System, lazy=True)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _release(handle: _Handle) -> None:
+    shm = SharedMemory(name=handle[1])
+    shm.close()
+    shm.unlink()
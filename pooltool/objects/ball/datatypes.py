@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Iterator, List, Optional, Sequence, Tuple
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
 
 import numpy as np
 from attrs import define, evolve, field, validate
@@ -139,63 +139,260 @@ class BallState:
 
 
 @define
+class _BallStateBuffer:
+    """Growable, preallocated arrays that back a buffered BallHistory
+
+    The first ``n`` rows of each array are in use. When full, the capacity of each
+    array is doubled, so appending is amortized O(1).
+    """
+
+    rvw: NDArray[np.float64]
+    s: NDArray[np.int64]
+    t: NDArray[np.float64]
+    n: int = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    @property
+    def capacity(self) -> int:
+        return len(self.t)
+
+    def append(self, rvw: NDArray[np.float64], s: int, t: float) -> None:
+        if self.n == self.capacity:
+            self._grow(max(2 * self.capacity, 1))
+
+        self.rvw[self.n] = rvw
+        self.s[self.n] = s
+        self.t[self.n] = t
+        self.n += 1
+
+    def _grow(self, capacity: int) -> None:
+        rvw = np.empty((capacity, 3, 3), dtype=np.float64)
+        s = np.empty(capacity, dtype=np.int64)
+        t = np.empty(capacity, dtype=np.float64)
+
+        rvw[: self.n] = self.rvw[: self.n]
+        s[: self.n] = self.s[: self.n]
+        t[: self.n] = self.t[: self.n]
+
+        self.rvw, self.s, self.t = rvw, s, t
+
+    def views(
+        self,
+    ) -> Tuple[NDArray[np.float64], NDArray[np.int64], NDArray[np.float64]]:
+        """Return read-only views of the rows in use"""
+        views = self.rvw[: self.n], self.s[: self.n], self.t[: self.n]
+        for view in views:
+            view.flags.writeable = False
+        return views
+
+    def copy(self) -> _BallStateBuffer:
+        rvw, s, t = self.views()
+        return _BallStateBuffer(rvw=rvw.copy(), s=s.copy(), t=t.copy(), n=self.n)
+
+    @staticmethod
+    def empty(capacity: int) -> _BallStateBuffer:
+        return _BallStateBuffer(
+            rvw=np.empty((capacity, 3, 3), dtype=np.float64),
+            s=np.empty(capacity, dtype=np.int64),
+            t=np.empty(capacity, dtype=np.float64),
+        )
+
+
+@define(eq=False)
 class BallHistory:
     """A container of BallState objects
 
+    A history stores its states in one of two ways:
+
+    (1) As a list of :class:`BallState` objects (the default). See :attr:`states`.
+    (2) As preallocated, growable numpy arrays of ``rvw``, ``s``, and ``t`` values
+        (*buffered*). Appending is amortized O(1), :meth:`vectorize` returns views
+        rather than building new arrays. This mode is well suited for long histories,
+        such as :attr:`Ball.history_cts`. Create buffered histories with
+        :meth:`buffered`.
+
+    Both modes share the same interface (indexing, iteration, :meth:`add`,
+    :meth:`vectorize`, etc.), and histories compare equal if their states are equal,
+    regardless of their storage mode. In both modes, :meth:`copy` takes constant time.
+
+    Note:
+        Indexing or iterating a buffered history returns copies of its states, so
+        modifying them doesn't modify the history. Add states with :meth:`add`
+        instead.
+
     Attributes:
         states:
             A list of time-increasing BallState objects (*default* = ``[]``).
+
+            Note:
+                Buffered histories don't store BallState objects, so for them, this is
+                a new list of copies of the states, built each time it's accessed.
+                Modifying the list doesn't modify the history. Setting it replaces the
+                history's states.
     """
 
-    states: List[BallState] = field(factory=list)
-    """A list of time-increasing BallState objects (*default* = ``[]``)"""
+    _states: List[BallState] = field(factory=list, alias="states")
+
+    _buffer: Optional[_BallStateBuffer] = field(
+        default=None,
+        init=False,
+        repr=lambda buffer: "None" if buffer is None else f"<{len(buffer)} states>",
+    )
+    _shared: bool = field(default=False, init=False, repr=False)
 
     def __getitem__(self, idx: int) -> BallState:
+        if self._buffer is not None:
+            rvw, s, t = self._buffer.views()
+            return BallState(rvw[idx].copy(), int(s[idx]), float(t[idx]))
+
         return self.states[idx]
 
     def __len__(self) -> int:
-        return len(self.states)
+        if self._buffer is not None:
+            return len(self._buffer)
+
+        return len(self._states)
 
     def __iter__(self) -> Iterator[BallState]:
+        if self._buffer is not None:
+            rvws, ss, ts = self._buffer.views()
+            for rvw, s, t in zip(rvws, ss, ts):
+                yield BallState(rvw.copy(), int(s), float(t))
+            return
+
         for state in self.states:
             yield state
 
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        if self._buffer is None and other._buffer is None:
+            return self._states == other._states
+        if len(self) != len(other):
+            return False
+        return all(
+            state == other_state
+            for state, other_state in zip(self._peek(), other._peek())
+        )
+
+    @property
+    def states(self) -> List[BallState]:
+        if self._buffer is not None:
+            return list(self)
+
+        if self._shared:
+            self._unshare()
+
+        return self._states
+
+    @states.setter
+    def states(self, states: List[BallState]) -> None:
+        if self._buffer is not None:
+            self._buffer = _BallStateBuffer.empty(len(states))
+            self._shared = False
+            for state in states:
+                self.add(state)
+            return
+
+        self._states = states
+        self._shared = False
+
     @property
     def empty(self) -> bool:
         """Returns whether or not the ball history is empty
 
         Returns:
-            bool: True if :attr:`states` has no length else False
+            bool: True if the history has no states else False
         """
-        return not bool(len(self.states))
+        return not bool(len(self))
+
+    @property
+    def is_buffered(self) -> bool:
+        """Returns whether the states are stored in preallocated arrays
+
+        See Also:
+            - :meth:`buffered`
+        """
+        return self._buffer is not None
 
     def add(self, state: BallState) -> None:
         """Append a state to the history
 
         Raises:
-            AssertionError: If ``state.t < self.states[-1]``
+            AssertionError: If ``state.t < self[-1].t``
 
         Notes:
-            - This appends ``state`` to :attr:`states`
-            - ``state`` is not copied before appending to the history, so they
-              share the same memory address.
+            - In the default (list) mode, this appends ``state`` to :attr:`states`.
+              ``state`` is not copied before appending to the history, so they share
+              the same memory address.
+            - If the history is buffered, the values of ``state`` are copied into the
+              buffer. Later modifications to ``state`` are not reflected in the
+              history.
         """
         if not self.empty:
-            assert state.t >= self.states[-1].t
+            assert state.t >= self[-1].t
+
+        if self._shared:
+            self._unshare()
+
+        if self._buffer is not None:
+            self._buffer.append(state.rvw, state.s, state.t)
+            return
 
-        self.states.append(state)
+        self._states.append(state)
 
     def copy(self) -> BallHistory:
-        """Create a copy"""
+        """Create a copy
+
+        The copy has the same storage mode as the original, and is made in constant
+        time, because copies are copy-on-write: the copy shares the original's states.
+
+        - For buffered histories, whichever of the two is next added to (see
+          :meth:`add`) first makes its own copy of the buffer. The buffer is never
+          modified in place otherwise, so sharing it is safe.
+        - For list histories, the states are mutable, so each of the two makes its own
+          copies of them the first time they're exposed (through :attr:`states`,
+          indexing, or iteration), or added to. Until then, :meth:`vectorize`,
+          :func:`len`, and equality checks read the shared states.
+        """
         history = BallHistory()
-        for state in self.states:
-            history.add(state.copy())
 
+        if self._buffer is not None:
+            # The copy gets its own buffer object (backed by the same arrays), so that
+            # its length is independent of the original's
+            history._buffer = evolve(self._buffer)
+        else:
+            history._states = self._states
+
+        self._shared = history._shared = True
         return history
 
+    def _unshare(self) -> None:
+        """Stop sharing the states with copies (see :meth:`copy`)"""
+        if self._buffer is not None:
+            self._buffer = self._buffer.copy()
+        else:
+            self._states = [state.copy() for state in self._states]
+
+        self._shared = False
+
+    def _peek(self) -> Iterator[BallState]:
+        """Iterate the states without unsharing them (see :meth:`copy`)
+
+        The states must not be modified.
+        """
+        if self._buffer is not None:
+            return iter(self)
+
+        return iter(self._states)
+
     def vectorize(
         self,
-    ) -> Optional[Tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]]:
+    ) -> Optional[Tuple[NDArray[np.float64], NDArray[np.int64], NDArray[np.float64]]]:
         """Compile the attribute from each ball state into arrays
 
         This method unzips each :class:`BallState` in :attr:`states`, resulting in an
@@ -215,9 +412,15 @@ class BallHistory:
         True
 
         Returns:
-            A length 3 tuple (``rvws``, ``ss`` and ``ts``). Returns None if ``self`` has
+            A length 3 tuple (``rvws``, ``ss`` and ``ts``). ``rvws`` and ``ts`` are
+            float64 arrays, and ``ss`` is an int64 array. Returns None if ``self`` has
             no length.
 
+        Note:
+            If the history is buffered (see :meth:`buffered`), no arrays are built.
+            Instead, read-only views of the underlying buffer are returned. Copy them if
+            you intend to modify them.
+
         Example:
 
             ``vectorize`` can be useful for plotting trajectories.
@@ -242,13 +445,16 @@ class BallHistory:
         if self.empty:
             return None
 
-        num_states = len(self.states)
+        if self._buffer is not None:
+            return self._buffer.views()
+
+        num_states = len(self._states)
 
         rvws = np.empty((num_states, 3, 3), dtype=np.float64)
-        ss = np.empty(num_states, dtype=np.float64)
+        ss = np.empty(num_states, dtype=np.int64)
         ts = np.empty(num_states, dtype=np.float64)
 
-        for idx, state in enumerate(self.states):
+        for idx, state in enumerate(self._states):
             rvws[idx] = state.rvw
             ss[idx] = state.s
             ts[idx] = state.t
@@ -258,13 +464,29 @@ class BallHistory:
     @staticmethod
     def from_vectorization(
         vectorization: Optional[
-            Tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]
+            Tuple[NDArray[np.float64], NDArray[Any], NDArray[np.float64]]
         ],
+        buffered: bool = False,
+        copy: bool = True,
     ) -> BallHistory:
         """Zips a vectorization into a BallHistory
 
         An inverse method of :meth:`vectorize`.
 
+        Args:
+            vectorization:
+                A length 3 tuple (``rvws``, ``ss`` and ``ts``), or None. ``ss`` may
+                be of any numeric dtype.
+            buffered:
+                If True, a buffered history (see :meth:`buffered`) is returned. The
+                arrays are copied into the buffer in one go, rather than being split
+                into individual BallState objects.
+            copy:
+                Only applies if ``buffered`` is True. If False, the arrays themselves
+                back the buffer, rather than copies of them. The buffer starts full, so
+                it's reallocated before any state is added, and the arrays are never
+                written to.
+
         Returns:
             BallHistory: A BallHistory constructed from the input vectors.
 
@@ -286,6 +508,24 @@ class BallHistory:
         See Also:
             - :meth:`vectorize`
         """
+        if buffered:
+            history = BallHistory.buffered()
+
+            if vectorization is None:
+                return history
+
+            rvws, ss, ts = vectorization
+            assert (np.diff(ts) >= 0).all()
+
+            as_array = np.array if copy else np.asarray
+            history._buffer = _BallStateBuffer(
+                rvw=as_array(rvws, dtype=np.float64),
+                s=as_array(ss, dtype=np.int64),
+                t=as_array(ts, dtype=np.float64),
+                n=len(ts),
+            )
+            return history
+
         history = BallHistory()
 
         if vectorization is None:
@@ -296,11 +536,62 @@ class BallHistory:
 
         return history
 
+    @staticmethod
+    def buffered(capacity: int = 16) -> BallHistory:
+        """Create an empty, buffered BallHistory
+
+        Rather than storing a list of :class:`BallState` objects, a buffered history
+        stores the states in preallocated arrays that double in size whenever they
+        fill up.
+
+        Args:
+            capacity:
+                The number of states that can be added before the buffer first grows.
+                If you know (roughly) how many states the history will hold, setting
+                this avoids reallocations.
+
+        Example:
+
+            >>> import pooltool as pt
+            >>> history = pt.objects.BallHistory.buffered()
+            >>> history.add(pt.objects.BallState.default())
+            >>> len(history)
+            1
+            >>> history.is_buffered
+            True
+            >>> rvws, ss, ts = history.vectorize()  # No arrays are built
+        """
+        history = BallHistory()
+        history._buffer = _BallStateBuffer.empty(capacity)
+        return history
+
     @staticmethod
     def factory() -> BallHistory:
         return BallHistory()
 
 
+def _unstructure_history_json(history: BallHistory):
+    return {
+        "states": conversion[SerializeFormat.JSON].unstructure(
+            list(history._peek()), List[BallState]
+        )
+    }
+
+
+def _structure_history_json(obj, _) -> BallHistory:
+    return BallHistory(
+        states=conversion[SerializeFormat.JSON].structure(
+            obj["states"], List[BallState]
+        )
+    )
+
+
+conversion.register_unstructure_hook(
+    BallHistory, _unstructure_history_json, which=(SerializeFormat.JSON,)
+)
+conversion.register_structure_hook(
+    BallHistory, _structure_history_json, which=(SerializeFormat.JSON,)
+)
 conversion.register_unstructure_hook(
     BallHistory, lambda v: v.vectorize(), which=(SerializeFormat.MSGPACK,)
 )
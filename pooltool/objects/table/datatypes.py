@@ -115,15 +115,18 @@ class Table:
         return bool(len(self.pockets))
 
     def copy(self) -> Table:
-        """Create a copy."""
-        # Delegates the deep-ish copying of CushionSegments and Pocket to their respective
-        # copy() methods. Uses dictionary comprehension to construct equal but different
-        # `pockets` attribute.  All other attributes are frozen or immutable.
-        return evolve(
-            self,
-            cushion_segments=self.cushion_segments.copy(),
-            pockets={k: v.copy() for k, v in self.pockets.items()},
-        )
+        """Create a copy.
+
+        The copy shares the original's :attr:`cushion_segments`, since the table's
+        geometry isn't modified once the table is built. To change the geometry of
+        only one of the two, replace its :attr:`cushion_segments`, rather than
+        modifying them in place.
+        """
+        # Delegates the deep-ish copying of Pocket to its copy() method, since pockets
+        # track the balls they contain. Uses dictionary comprehension to construct equal
+        # but different `pockets` attribute.  All other attributes are frozen or
+        # immutable.
+        return evolve(self, pockets={k: v.copy() for k, v in self.pockets.items()})
 
     @staticmethod
     def from_table_specs(specs: TableSpecs) -> Table:
@@ -69,6 +69,35 @@ def evolve_ball_motion(
     raise ValueError
 
 
+@jit(nopython=True, cache=const.use_numba_cache)
+def evolve_balls_motion(
+    states: NDArray[np.int64],
+    rvws: NDArray[np.float64],
+    R: NDArray[np.float64],
+    m: NDArray[np.float64],
+    u_s: NDArray[np.float64],
+    u_sp: NDArray[np.float64],
+    u_r: NDArray[np.float64],
+    g: NDArray[np.float64],
+    idx: NDArray[np.intp],
+    t: float,
+) -> None:
+    """Evolve the motion of many balls in place
+
+    The balls are rows of struct-of-arrays ball data, and only the rows in ``idx`` are
+    evolved. Each row is evolved with :func:`evolve_ball_motion`, and the motion states
+    are left untouched.
+
+    (just-in-time compiled)
+    """
+    for k in range(len(idx)):
+        i = int(idx[k])
+        rvw, _ = evolve_ball_motion(
+            states[i], rvws[i], R[i], m[i], u_s[i], u_sp[i], u_r[i], g[i], t
+        )
+        rvws[i] = rvw
+
+
 @jit(nopython=True, cache=const.use_numba_cache)
 def evolve_slide_state(
     rvw: NDArray[np.float64],
@@ -3,15 +3,16 @@
 from __future__ import annotations
 
 import shutil
+import time
 import traceback
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 import attrs
 from cattrs.errors import ClassValidationError
 
 import pooltool.user_config
-from pooltool.events.datatypes import AgentType, Event, EventType
+from pooltool.events.datatypes import AgentStateLog, AgentType, Event, EventType
 from pooltool.physics.resolve.ball_ball import (
     BallBallCollisionStrategy,
 )
@@ -53,6 +54,32 @@ VERSION: int = 6
 run = Run()
 
 
+@attrs.define
+class ResolverTimes:
+    """Wall times spent resolving events, in seconds
+
+    Attributes:
+        snapshot:
+            The time spent setting the initial and final states of event agents.
+        strategies:
+            The time spent in each resolution strategy, keyed by the strategy's class
+            name (*e.g.* ``"FrictionalMathavan"``).
+    """
+
+    snapshot: float = attrs.field(default=0.0)
+    strategies: Dict[str, float] = attrs.field(factory=dict)
+
+    def add_strategy_time(self, strategy: Any, seconds: float) -> None:
+        name = type(strategy).__name__
+        self.strategies[name] = self.strategies.get(name, 0.0) + seconds
+
+    def merge(self, other: ResolverTimes) -> None:
+        """Add the times of other resolutions to these times"""
+        self.snapshot += other.snapshot
+        for name, seconds in other.strategies.items():
+            self.strategies[name] = self.strategies.get(name, 0.0) + seconds
+
+
 @attrs.define
 class Resolver:
     """A physics engine component that characterizes event resolution
@@ -71,9 +98,78 @@ class Resolver:
 
     version: Optional[int] = None
 
-    def resolve(self, shot: System, event: Event) -> None:
-        """Resolve an event for a system"""
-        _snapshot_initial(shot, event)
+    def resolve(
+        self,
+        shot: System,
+        event: Event,
+        log: Optional[AgentStateLog] = None,
+        snapshot: bool = True,
+        times: Optional[ResolverTimes] = None,
+    ) -> None:
+        """Resolve an event for a system
+
+        Args:
+            shot:
+                The system.
+            event:
+                The event. The initial and final states of its agents are set, unless
+                ``snapshot`` is False.
+            log:
+                If passed, the states of ball agents are stored compactly in the log
+                (see :class:`pooltool.events.datatypes.AgentStateLog`).
+            snapshot:
+                If False, the states of the event agents aren't set. Only the system is
+                modified.
+            times:
+                If passed, the time spent snapshotting and in the resolution strategy
+                is added to it.
+        """
+        if times is None:
+            self._resolve(shot, event, log, snapshot)
+            return
+
+        start = time.perf_counter()
+        if snapshot:
+            _snapshot_initial(shot, event, log)
+        times.snapshot += time.perf_counter() - start
+
+        # Null events are only ever snapshotted initially
+        if event.event_type == EventType.NONE:
+            return
+
+        start = time.perf_counter()
+        self._resolve(shot, event, None, False)
+        times.add_strategy_time(
+            self._strategy(event.event_type), time.perf_counter() - start
+        )
+
+        start = time.perf_counter()
+        if snapshot:
+            _snapshot_final(shot, event, log)
+        times.snapshot += time.perf_counter() - start
+
+    def _strategy(self, event_type: EventType) -> Any:
+        """The strategy that resolves events of a (non-null) event type"""
+        if event_type.is_transition():
+            return self.transition
+
+        return {
+            EventType.BALL_BALL: self.ball_ball,
+            EventType.BALL_LINEAR_CUSHION: self.ball_linear_cushion,
+            EventType.BALL_CIRCULAR_CUSHION: self.ball_circular_cushion,
+            EventType.BALL_POCKET: self.ball_pocket,
+            EventType.STICK_BALL: self.stick_ball,
+        }[event_type]
+
+    def _resolve(
+        self,
+        shot: System,
+        event: Event,
+        log: Optional[AgentStateLog],
+        snapshot: bool,
+    ) -> None:
+        if snapshot:
+            _snapshot_initial(shot, event, log)
 
         ids = event.ids
 
@@ -109,7 +205,8 @@ class Resolver:
             self.stick_ball.resolve(cue, ball, inplace=True)
             ball.state.t = event.time
 
-        _snapshot_final(shot, event)
+        if snapshot:
+            _snapshot_final(shot, event, log)
 
     def save(self, path: Pathish) -> Path:
         path = Path(path)
@@ -179,13 +276,15 @@ class Resolver:
             return resolver
 
 
-def _snapshot_initial(shot: System, event: Event) -> None:
+def _snapshot_initial(
+    shot: System, event: Event, log: Optional[AgentStateLog] = None
+) -> None:
     """Set the initial states of the event agents"""
     for agent in event.agents:
         if agent.agent_type == AgentType.CUE:
             agent.set_initial(shot.cue)
         elif agent.agent_type == AgentType.BALL:
-            agent.set_initial(shot.balls[agent.id])
+            agent.set_initial(shot.balls[agent.id], log)
         elif agent.agent_type == AgentType.POCKET:
             agent.set_initial(shot.table.pockets[agent.id])
         elif agent.agent_type == AgentType.LINEAR_CUSHION_SEGMENT:
@@ -194,11 +293,13 @@ def _snapshot_initial(shot: System, event: Event) -> None:
             agent.set_initial(shot.table.cushion_segments.circular[agent.id])
 
 
-def _snapshot_final(shot: System, event: Event) -> None:
+def _snapshot_final(
+    shot: System, event: Event, log: Optional[AgentStateLog] = None
+) -> None:
     """Set the final states of the event agents"""
     for agent in event.agents:
         if agent.agent_type == AgentType.BALL:
-            agent.set_final(shot.balls[agent.id])
+            agent.set_final(shot.balls[agent.id], log)
         elif agent.agent_type == AgentType.POCKET:
             agent.set_final(shot.table.pockets[agent.id])
 
@@ -0,0 +1,458 @@
+"""Speed and accuracy benchmarks for the quartic solvers
+
+Collision times are the smallest positive real roots of quartic polynomials, and
+solving them is one of the hot paths of shot evolution. This module gathers the
+coefficient matrices that :func:`pooltool.evolution.simulate` actually solves on
+representative racks (see :func:`collect_batches`), and then:
+
+    - Times each :class:`QuarticSolver` on them (see :func:`time_solver`).
+    - Tallies which path :attr:`QuarticSolver.HYBRID` takes for each polynomial (see
+      :func:`hybrid_paths`).
+    - Compares each solver's roots against high precision reference roots calculated
+      with :func:`pooltool.ptmath.roots.quartic._truth` (see :func:`accuracy`). This
+      requires sympy, which isn't a pooltool dependency, so install it separately.
+
+It doubles as a regression harness. Run it as a script, and use ``--gate`` to fail when
+a solver's roots are missed or inaccurate::
+
+    python -m pooltool.ptmath.roots.benchmark --help
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import random
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import attrs
+import numpy as np
+from numpy.typing import NDArray
+
+import pooltool.evolution.event_based.simulate as simulate_module
+from pooltool.ai.aim import at_ball
+from pooltool.game.datatypes import GameType
+from pooltool.layouts import get_rack
+from pooltool.objects.cue.datatypes import Cue
+from pooltool.objects.table.datatypes import Table
+from pooltool.objects.table.specs import PocketTableSpecs, SnookerTableSpecs
+from pooltool.ptmath.roots.quartic import (
+    QuarticSolver,
+    _solve_many,
+    _truth,
+    solve_quartics,
+)
+from pooltool.system.datatypes import System
+from pooltool.terminal import Run
+
+GAME_TYPES: Tuple[GameType, ...] = (
+    GameType.NINEBALL,
+    GameType.EIGHTBALL,
+    GameType.SNOOKER,
+    GameType.THREECUSHION,
+)
+
+HYBRID_PATHS: Tuple[str, ...] = (
+    "zero constant term",
+    "first analytic attempt",
+    "second analytic attempt",
+    "companion matrix",
+)
+"""The paths taken by :attr:`QuarticSolver.HYBRID`, indexed by the indicators of
+:func:`pooltool.ptmath.roots.quartic._solve_many`"""
+
+
+@attrs.define
+class Accuracy:
+    """The accuracy of a solver's smallest positive real roots
+
+    Attributes:
+        missed:
+            The number of polynomials with a positive real root, for which the solver
+            found none.
+        spurious:
+            The number of polynomials without a positive real root, for which the solver
+            found one.
+        rel_errors:
+            The relative error of each root, for polynomials where both the solver and
+            the reference found a root.
+    """
+
+    missed: int
+    spurious: int
+    rel_errors: NDArray[np.float64]
+
+    def percentile(self, q: float) -> float:
+        if not len(self.rel_errors):
+            return 0.0
+        return float(np.percentile(self.rel_errors, q))
+
+
+def _snooker_table() -> Table:
+    # Snooker specs are a clone of pocket table specs with different defaults
+    specs = SnookerTableSpecs()
+    fields = {
+        field.name: getattr(specs, field.name)
+        for field in attrs.fields(SnookerTableSpecs)
+        if field.init
+    }
+    return Table.from_table_specs(PocketTableSpecs(**fields))
+
+
+def break_shot(game_type: GameType, rng: np.random.Generator) -> System:
+    """A break shot for a game type, with a randomized speed and angle"""
+    if game_type == GameType.SNOOKER:
+        table = _snooker_table()
+    else:
+        table = Table.from_game_type(game_type)
+
+    balls = get_rack(game_type, table)
+    cue_ball_id = "white" if "white" in balls else "cue"
+    system = System(cue=Cue(cue_ball_id=cue_ball_id), table=table, balls=balls)
+
+    if game_type == GameType.THREECUSHION:
+        phi = rng.uniform(0, 360)
+    else:
+        # Aim at the closest object ball (red, for snooker) so that the rack is broken
+        cue_ball = balls[cue_ball_id]
+        target = min(
+            (
+                ball
+                for ball in balls.values()
+                if ball.id != cue_ball_id
+                and (game_type != GameType.SNOOKER or ball.id.startswith("red"))
+            ),
+            key=lambda ball: np.linalg.norm(ball.xyz - cue_ball.xyz),
+        )
+        phi = at_ball(system, target.id) + rng.uniform(-1, 1)
+
+    system.strike(V0=rng.uniform(3, 8), phi=phi, b=rng.uniform(-0.3, 0.3))
+    return system
+
+
+@contextmanager
+def _recording(batches: List[NDArray[np.float64]]) -> Iterator[None]:
+    solve = simulate_module.solve_quartics
+
+    def recorder(ps: NDArray[np.float64], solver: QuarticSolver) -> NDArray[np.float64]:
+        batches.append(np.array(ps, dtype=np.float64))
+        return solve(ps, solver)
+
+    simulate_module.solve_quartics = recorder  # type: ignore
+    try:
+        yield
+    finally:
+        simulate_module.solve_quartics = solve  # type: ignore
+
+
+def collect_batches(
+    game_types: Sequence[GameType] = GAME_TYPES, num_shots: int = 3, seed: int = 42
+) -> Dict[GameType, List[NDArray[np.float64]]]:
+    """Collect the coefficient matrices solved while simulating break shots
+
+    Args:
+        game_types:
+            The game types whose racks are broken.
+        num_shots:
+            The number of break shots simulated per game type.
+        seed:
+            The random seed. Racks are jittered with the global random generators, so
+            these are seeded too.
+
+    Returns:
+        Dict[GameType, List[NDArray[np.float64]]]:
+            For each game type, every mx5 coefficient matrix passed to
+            :func:`pooltool.ptmath.roots.quartic.solve_quartics`, in call order.
+    """
+    rng = np.random.default_rng(seed)
+    np.random.seed(seed)
+    random.seed(seed)
+
+    batches: Dict[GameType, List[NDArray[np.float64]]] = {}
+    for game_type in game_types:
+        batches[game_type] = []
+        for _ in range(num_shots):
+            shot = break_shot(game_type, rng)
+            with _recording(batches[game_type]):
+                simulate_module.simulate(shot, inplace=True)
+
+    return batches
+
+
+def save_batches(
+    path: Union[str, Path], batches: Dict[GameType, List[NDArray[np.float64]]]
+) -> None:
+    """Save collected coefficient matrices, so that a corpus can be reused"""
+    arrays = {
+        f"{game_type}/{i}": ps
+        for game_type, game_batches in batches.items()
+        for i, ps in enumerate(game_batches)
+    }
+    np.savez_compressed(path, **arrays)  # type: ignore
+
+
+def load_batches(
+    path: Union[str, Path],
+) -> Dict[GameType, List[NDArray[np.float64]]]:
+    """Load coefficient matrices saved with :func:`save_batches`"""
+    batches: Dict[GameType, List[NDArray[np.float64]]] = {}
+    with np.load(path) as data:
+        keys = sorted(data.files, key=lambda key: int(key.rsplit("/", 1)[1]))
+        for key in keys:
+            game_type = GameType(key.rsplit("/", 1)[0])
+            batches.setdefault(game_type, []).append(data[key])
+    return batches
+
+
+def time_solver(
+    batches: Sequence[NDArray[np.float64]], solver: QuarticSolver, repeats: int = 5
+) -> float:
+    """The best time (in seconds) to solve every batch, one call per batch
+
+    Batches are solved one call at a time, like they are during shot evolution, so
+    per-call overhead is included.
+    """
+    # Compile outside of the timing
+    solve_quartics(batches[0], solver)
+
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for ps in batches:
+            solve_quartics(ps, solver)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def hybrid_paths(ps: NDArray[np.float64]) -> NDArray[np.int64]:
+    """Count the polynomials solved by each path of :attr:`QuarticSolver.HYBRID`
+
+    Returns:
+        NDArray[np.int64]: The counts, ordered like :data:`HYBRID_PATHS`.
+    """
+    _, indicators = _solve_many(ps.astype(np.complex128))
+    return np.bincount(indicators, minlength=len(HYBRID_PATHS))
+
+
+def true_roots(ps: NDArray[np.float64], digits: int = 50) -> NDArray[np.float64]:
+    """The smallest positive real root of each polynomial, calculated with sympy
+
+    This is slow, so it is best applied to a sample of polynomials. Polynomials with a
+    zero leading coefficient are not supported by the general quartic solution.
+    """
+    roots = np.full(len(ps), np.inf)
+
+    for i, p in enumerate(ps):
+        for root in _truth(*p, digits=digits):
+            root = complex(root)
+            if abs(root.imag) > 1e-20 * max(1.0, abs(root.real)):
+                continue
+            if root.real >= 0:
+                roots[i] = min(roots[i], root.real)
+
+    return roots
+
+
+def accuracy(roots: NDArray[np.float64], truth: NDArray[np.float64]) -> Accuracy:
+    """Compare a solver's roots to reference roots (see :func:`true_roots`)"""
+    found = np.isfinite(roots)
+    exists = np.isfinite(truth)
+    both = found & exists
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rel_errors = np.abs(roots[both] - truth[both]) / np.abs(truth[both])
+
+    # Exact zero roots (from zero constant terms) have no relative error
+    rel_errors[truth[both] == 0] = np.abs(roots[both][truth[both] == 0])
+
+    return Accuracy(
+        missed=int(np.sum(exists & ~found)),
+        spurious=int(np.sum(found & ~exists)),
+        rel_errors=rel_errors,
+    )
+
+
+def sample(
+    ps: NDArray[np.float64], size: int, rng: np.random.Generator
+) -> NDArray[np.float64]:
+    """A random sample of polynomials with nonzero leading coefficients"""
+    ps = ps[ps[:, 0] != 0]
+    if len(ps) <= size:
+        return ps
+    return ps[np.sort(rng.choice(len(ps), size=size, replace=False))]
+
+
+def gate(
+    results: Dict[QuarticSolver, Accuracy],
+    solvers: Sequence[QuarticSolver],
+    max_missed: int = 0,
+    max_rel_error: float = 1e-6,
+) -> List[str]:
+    """Check solvers against accuracy thresholds
+
+    Returns:
+        List[str]: A description of each failed threshold. Empty if all passed.
+    """
+    failures: List[str] = []
+    for solver in solvers:
+        result = results[solver]
+        if result.missed > max_missed:
+            failures.append(f"{solver}: {result.missed} missed roots > {max_missed}")
+        worst = result.percentile(100)
+        if worst > max_rel_error:
+            failures.append(f"{solver}: max rel. error {worst:.2e} > {max_rel_error}")
+    return failures
+
+
+def _describe(run: Run, label: str, values: Dict[str, str]) -> None:
+    run.info_single(label)
+    for key, value in values.items():
+        run.info_single(f"{key}: {value}", level=2, cut_after=None)
+
+
+def main(args) -> None:
+    run = Run()
+    solvers = list(QuarticSolver)
+
+    batches: Optional[Dict[GameType, List[NDArray[np.float64]]]] = None
+    if args.coeffs is not None and Path(args.coeffs).exists():
+        batches = load_batches(args.coeffs)
+        run.info_single(f"Loaded coefficients from {args.coeffs}")
+    else:
+        game_types = [GameType(game_type) for game_type in args.game_types]
+        batches = collect_batches(game_types, num_shots=args.N, seed=args.seed)
+        if args.coeffs is not None:
+            save_batches(args.coeffs, batches)
+            run.info_single(f"Saved coefficients to {args.coeffs}")
+
+    all_batches = [ps for game_batches in batches.values() for ps in game_batches]
+    all_ps = np.concatenate(all_batches)
+
+    for game_type, game_batches in batches.items():
+        sizes = [len(ps) for ps in game_batches]
+        _describe(
+            run,
+            f"Collected ({game_type})",
+            {
+                "Calls": f"{len(sizes)}",
+                "Polynomials": f"{sum(sizes)}",
+                "Batch size": f"{np.mean(sizes):.1f} avg, {max(sizes)} max",
+            },
+        )
+
+    timings: Dict[str, str] = {}
+    for solver in solvers:
+        per_call = time_solver(all_batches, solver, repeats=args.repeats)
+        single = time_solver([all_ps], solver, repeats=args.repeats)
+        timings[solver] = (
+            f"{per_call * 1e3:.2f} ms in {len(all_batches)} calls, "
+            f"{single / len(all_ps) * 1e9:.0f} ns/polynomial as one batch"
+        )
+    _describe(run, "Timings", timings)
+
+    paths = hybrid_paths(all_ps)
+    _describe(
+        run,
+        "HYBRID paths",
+        {
+            path: f"{count} ({count / len(all_ps):.1%})"
+            for path, count in zip(HYBRID_PATHS, paths)
+        },
+    )
+
+    if not args.truth_sample:
+        return
+
+    if importlib.util.find_spec("sympy") is None:
+        sys.exit(
+            "Measuring accuracy requires sympy, which isn't a pooltool dependency. "
+            "Install it (pip install sympy), or skip accuracy with --truth-sample 0."
+        )
+
+    ps = sample(all_ps, args.truth_sample, np.random.default_rng(args.seed))
+    truth = true_roots(ps)
+
+    results = {
+        solver: accuracy(solve_quartics(ps, solver), truth) for solver in solvers
+    }
+    _describe(
+        run,
+        f"Accuracy ({len(ps)} sampled polynomials)",
+        {
+            solver: (
+                f"{result.missed} missed, {result.spurious} spurious, rel. error "
+                f"p50={result.percentile(50):.1e} p99={result.percentile(99):.1e} "
+                f"max={result.percentile(100):.1e}"
+            )
+            for solver, result in results.items()
+        },
+    )
+
+    if args.gate:
+        failures = gate(
+            results,
+            [QuarticSolver(solver) for solver in args.gate],
+            max_missed=args.max_missed,
+            max_rel_error=args.max_rel_error,
+        )
+        for failure in failures:
+            run.warning(failure, header="GATE FAILED")
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(
+        "Benchmark the quartic solvers on coefficients collected from break shots"
+    )
+    ap.add_argument(
+        "--game-types",
+        nargs="+",
+        default=[str(game_type) for game_type in GAME_TYPES],
+        help="Which game types should break shots be simulated for?",
+    )
+    ap.add_argument("--N", type=int, default=3, help="Break shots per game type")
+    ap.add_argument("--seed", type=int, default=42, help="Random seed")
+    ap.add_argument(
+        "--coeffs",
+        type=str,
+        default=None,
+        help="An .npz file of coefficients. Loaded if it exists, otherwise the "
+        "collected coefficients are saved to it",
+    )
+    ap.add_argument("--repeats", type=int, default=5, help="Timing repeats")
+    ap.add_argument(
+        "--truth-sample",
+        type=int,
+        default=200,
+        help="How many polynomials to compare against sympy reference roots? 0 to "
+        "skip. Requires sympy, which isn't a pooltool dependency",
+    )
+    ap.add_argument(
+        "--gate",
+        nargs="*",
+        default=[],
+        help="Exit with status 1 if any of these solvers exceed the thresholds",
+    )
+    ap.add_argument(
+        "--max-missed",
+        type=int,
+        default=0,
+        help="The number of missed roots tolerated by --gate",
+    )
+    ap.add_argument(
+        "--max-rel-error",
+        type=float,
+        default=1e-6,
+        help="The maximum relative root error tolerated by --gate",
+    )
+
+    args = ap.parse_args()
+
+    main(args)
@@ -1,7 +1,7 @@
 from typing import Callable, Dict, Tuple
 
 import numpy as np
-from numba import jit
+from numba import jit, prange
 from numpy.typing import NDArray
 
 import pooltool.constants as const
@@ -10,10 +10,31 @@ from pooltool.ptmath.roots.core import (
 )
 from pooltool.utils.strenum import StrEnum, auto
 
+_EPS = np.finfo(np.float64).eps
+_MAX_ITERATIONS = 100
+_DESCARTES_RTOL = 1e-9
+
 
 class QuarticSolver(StrEnum):
+    """Methods for solving the smallest positive real root of quartic polynomials
+
+    Attributes:
+        HYBRID:
+            Closed-form analytic roots, with fallbacks to the roots of the reversed
+            polynomial and to companion matrix eigenvalues when the analytic roots are
+            inaccurate (see :func:`solve_many`).
+        NUMERIC:
+            Companion matrix eigenvalues (see :func:`solve_many_numerical`).
+        BRACKET:
+            Real root isolation by bracketing between the real roots of the
+            polynomial's derivatives, refined with safeguarded Newton iterations (see
+            :func:`solve_many_smallest`). Only the smallest positive real root is ever
+            computed, and batches are solved in parallel.
+    """
+
     HYBRID = auto()
     NUMERIC = auto()
+    BRACKET = auto()
 
 
 def solve_quartics(
@@ -36,9 +57,13 @@ def solve_quartics(
             positive. If no such root exists (e.g. all roots have complex), then
             `np.inf` is returned.
     """
-    # Get the roots for the polynomials
     assert QuarticSolver(solver)
 
+    # Some solvers find the smallest positive real roots directly
+    if solver in _smallest_root_routine:
+        return _smallest_root_routine[solver](ps)
+
+    # Get the roots for the polynomials
     roots = _quartic_routine[solver](ps)  # Shape m x 4, dtype complex128
     best_roots = get_real_positive_smallest_roots(roots)  # Shape m, dtype float64
 
@@ -105,6 +130,282 @@ def solve_many(ps: NDArray[np.float64]) -> NDArray[np.complex128]:
     return roots
 
 
+def solve_many_smallest(ps: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Solve the smallest positive real root of multiple quartic equations
+
+    Unlike :func:`solve_many` and :func:`solve_many_numerical`, no complex roots are
+    calculated. Instead, the real roots of each polynomial are isolated between the
+    real roots of its derivative, which are in turn isolated between the real roots of
+    its second derivative, and so on (see :func:`smallest_positive_root`). The rows are
+    solved in parallel.
+
+    Args:
+        ps:
+            A mx5 array of polynomial coefficients, where m is the number of equations.
+            The columns are in the order a, b, c, d, e, where these coefficients make up
+            the polynomial equation at^4 + bt^3 + ct^2 + dt + e = 0
+
+    Returns:
+        roots:
+            An array of shape m. Each value is the smallest root that is real and
+            positive (or zero). If no such root exists, then `np.inf` is returned.
+    """
+    return _solve_many_smallest(np.ascontiguousarray(ps, dtype=np.float64))
+
+
+@jit(nopython=True, parallel=True, cache=const.use_numba_cache)
+def _solve_many_smallest(ps: NDArray[np.float64]) -> NDArray[np.float64]:
+    num_eqn = ps.shape[0]
+    roots = np.empty(num_eqn, dtype=np.float64)
+
+    for i in prange(num_eqn):
+        roots[i] = smallest_positive_root(ps[i])
+
+    return roots
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def _evaluate_real(p: NDArray[np.float64], x: float) -> Tuple[float, float]:
+    """Evaluate a polynomial and its derivative with Horner's method"""
+    f = p[0]
+    df = 0.0
+    for i in range(1, len(p)):
+        df = df * x + f
+        f = f * x + p[i]
+    return f, df
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def _bracketed_root(p: NDArray[np.float64], lo: float, hi: float, f_lo: float) -> float:
+    """Find the root of a polynomial that is bracketed by lo and hi
+
+    The polynomial is assumed to be monotonic within [lo, hi], and to differ in sign at
+    lo and hi. Newton steps are taken wherever they stay within the bracket, and
+    bisection steps otherwise. The bracket shrinks at every step, so this converges
+    even when Newton's method wouldn't.
+    """
+    x = 0.5 * (lo + hi)
+
+    for _ in range(_MAX_ITERATIONS):
+        f, df = _evaluate_real(p, x)
+
+        if f == 0.0:
+            return x
+
+        if (f < 0.0) == (f_lo < 0.0):
+            lo, f_lo = x, f
+        else:
+            hi = x
+
+        x_new = x - f / df if df != 0.0 else lo
+        if not lo < x_new < hi:
+            x_new = 0.5 * (lo + hi)
+
+        if abs(x_new - x) <= 4 * _EPS * abs(x_new) or x_new == lo or x_new == hi:
+            return x_new
+
+        x = x_new
+
+    return x
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def smallest_positive_root(p: NDArray[np.float64]) -> float:
+    """Find the smallest positive (or zero) real root of a polynomial
+
+    The real roots of a polynomial are separated by the real roots of its derivative,
+    so between consecutive roots of the derivative, the polynomial is monotonic and has
+    at most one root, which can be safely bracketed. Applying this recursively, from
+    the linear (n-1)th derivative up to the polynomial itself, isolates every real root
+    in [0, B], where B is the Cauchy bound of the roots' magnitudes. Only the smallest
+    root of the polynomial itself is refined.
+
+    Roots of even multiplicity (where the polynomial touches, but doesn't cross, 0) are
+    only found when the polynomial evaluates to exactly 0 at them.
+
+    (just-in-time compiled)
+
+    Args:
+        p:
+            The polynomial coefficients, highest order first. Leading zeros are allowed,
+            so quartics that degenerate into lower order polynomials are handled.
+
+    Returns:
+        float: The smallest root that is real and positive, or `np.inf` if none exists.
+    """
+    n = len(p) - 1
+
+    if p[n] == 0.0:
+        return 0.0
+
+    # Strip leading zeros
+    start = 0
+    while p[start] == 0.0:
+        start += 1
+
+    degree = n - start
+    if degree == 0:
+        return np.inf
+
+    # Work with the monic polynomial and its derivatives. Row k holds the coefficients
+    # of the kth derivative, which has degree (degree - k)
+    derivatives = np.zeros((degree, degree + 1), dtype=np.float64)
+    for i in range(degree + 1):
+        derivatives[0, i] = p[start + i] / p[start]
+    for k in range(1, degree):
+        for i in range(degree - k + 1):
+            derivatives[k, i] = derivatives[k - 1, i] * (degree - k + 1 - i)
+
+    # Cauchy's bound on the magnitude of the roots
+    bound = 0.0
+    for i in range(1, degree + 1):
+        bound = max(bound, abs(derivatives[0, i]))
+    bound += 1.0
+
+    # Bracket endpoints: 0, the roots of the next derivative in (0, bound), and bound
+    points = np.empty(degree + 1, dtype=np.float64)
+    num_points = 0
+
+    for k in range(degree - 1, -1, -1):
+        q = derivatives[k, : degree - k + 1]
+
+        roots = np.empty(degree + 1, dtype=np.float64)
+        num_roots = 0
+
+        lo = 0.0
+        f_lo, _ = _evaluate_real(q, lo)
+
+        for j in range(num_points + 1):
+            hi = points[j] if j < num_points else bound
+            f_hi, _ = _evaluate_real(q, hi)
+
+            if f_hi == 0.0 and j < num_points:
+                root = hi
+            elif (f_lo < 0.0) != (f_hi < 0.0) and f_lo != 0.0:
+                root = _bracketed_root(q, lo, hi, f_lo)
+            else:
+                lo, f_lo = hi, f_hi
+                continue
+
+            if k == 0:
+                return root
+
+            roots[num_roots] = root
+            num_roots += 1
+            lo, f_lo = hi, f_hi
+
+        points[:num_roots] = roots[:num_roots]
+        num_points = num_roots
+
+    return np.inf
+
+
+def no_roots_until(
+    ps: NDArray[np.float64], t_max: NDArray[np.float64]
+) -> NDArray[np.bool_]:
+    """Flag the quartic equations that provably have no real root in [0, t_max]
+
+    This is much cheaper than solving, so it's used to reject polynomials whose roots
+    can't matter before any solver is called. The test is conservative: a polynomial is
+    only flagged if it has no root in the interval, but not every such polynomial is
+    flagged (see :func:`has_no_root_until`).
+
+    Args:
+        ps:
+            A mx5 array of polynomial coefficients, where m is the number of equations.
+            The columns are in the order a, b, c, d, e, where these coefficients make up
+            the polynomial equation at^4 + bt^3 + ct^2 + dt + e = 0
+        t_max:
+            An array of shape m holding the upper bound of each polynomial's interval.
+            May be `np.inf`.
+
+    Returns:
+        flags:
+            An array of shape m. True if the polynomial has no real root in [0, t_max].
+    """
+    return _no_roots_until(
+        np.ascontiguousarray(ps, dtype=np.float64),
+        np.ascontiguousarray(t_max, dtype=np.float64),
+    )
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def _no_roots_until(
+    ps: NDArray[np.float64], t_max: NDArray[np.float64]
+) -> NDArray[np.bool_]:
+    flags = np.empty(ps.shape[0], dtype=np.bool_)
+
+    for i in range(ps.shape[0]):
+        flags[i] = has_no_root_until(ps[i], t_max[i])
+
+    return flags
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def has_no_root_until(p: NDArray[np.float64], t_max: float) -> bool:
+    """Whether a quartic provably has no real root in [0, t_max]
+
+    The interval is mapped onto (0, inf) with the substitution t = t_max / (1 + y), and
+    the polynomial (1 + y)^4 p(t_max / (1 + y)) is formed. By Descartes' rule of
+    signs, if its coefficients have no sign changes, p has no root in (0, t_max). Its
+    constant and leading coefficients are p(t_max) and p(0), so requiring every
+    coefficient to be nonzero with the same sign excludes the endpoints too. When
+    t_max is `np.inf`, the coefficients of p itself are tested.
+
+    Each transformed coefficient must exceed its rounding error bound by a wide margin,
+    so a polynomial that nearly touches zero is never flagged.
+
+    (just-in-time compiled)
+
+    Args:
+        p:
+            The polynomial coefficients, highest order first.
+        t_max:
+            The upper bound of the interval.
+
+    Returns:
+        bool: True if the polynomial has no real root in [0, t_max].
+    """
+    n = len(p) - 1
+    sign = 0.0
+
+    for j in range(n + 1):
+        q = 0.0
+        magnitude = 0.0
+
+        if t_max == np.inf:
+            # Coefficient of t^j
+            q = p[n - j]
+            magnitude = abs(q)
+        else:
+            # Coefficient of y^j: the sum over k of p_k t_max^k C(n - k, j), where
+            # p_k is the coefficient of t^k
+            scale = 1.0
+            for k in range(n - j + 1):
+                term = p[n - k] * scale * _binomial(n - k, j)
+                q += term
+                magnitude += abs(term)
+                scale *= t_max
+
+        if abs(q) <= _DESCARTES_RTOL * magnitude or q == 0.0:
+            return False
+
+        if sign == 0.0:
+            sign = np.sign(q)
+        elif np.sign(q) != sign:
+            return False
+
+    return True
+
+
+@jit(nopython=True, cache=const.use_numba_cache)
+def _binomial(n: int, k: int) -> float:
+    result = 1.0
+    for i in range(k):
+        result = result * (n - i) / (i + 1)
+    return result
+
+
 @jit(nopython=True, cache=const.use_numba_cache)
 def solve(a: float, b: float, c: float, d: float, e: float) -> NDArray[np.complex128]:
     return _solve(np.array([a, b, c, d, e], dtype=np.complex128))[0]
@@ -338,3 +639,7 @@ _quartic_routine: Dict[QuarticSolver, Callable] = {
     QuarticSolver.NUMERIC: solve_many_numerical,
     QuarticSolver.HYBRID: solve_many,
 }
+
+_smallest_root_routine: Dict[QuarticSolver, Callable] = {
+    QuarticSolver.BRACKET: solve_many_smallest,
+}
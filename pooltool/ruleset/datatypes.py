@@ -42,7 +42,8 @@ class Player:
         name:
             Player's name.
         ai:
-            Not implemented yet...
+            An AI that decides the player's shots (e.g.
+            :class:`pooltool.ai.search.CEMPlayer`). If None, the player is human.
     """
 
     name: str
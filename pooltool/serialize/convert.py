@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, Optional, Type, TypeVar
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Type, TypeVar
 
 from attrs import define
 from cattrs.converters import Converter
@@ -86,9 +86,16 @@ class Convert:
     def structure_from(
         self, path: Pathish, cl: Type[T], fmt: Optional[str] = None
     ) -> T:
+        converter, unstructured = self.deserialize_from(path, fmt)
+        return converter.structure(unstructured, cl)
+
+    def deserialize_from(
+        self, path: Pathish, fmt: Optional[str] = None
+    ) -> Tuple[Converter, Any]:
+        """Returns the converter for the file's format and the unstructured file"""
         assert Path(path).exists()
         fmt = SerializeFormat(fmt) if fmt is not None else self._infer_ext(path)
-        return self.converters[fmt].structure(deserializers[fmt](path), cl)
+        return self.converters[fmt], deserializers[fmt](path)
 
     def _infer_ext(self, path: Pathish) -> SerializeFormat:
         inferred = Path(path).suffix.lstrip(".")
@@ -1,5 +1,6 @@
 """The system container and its associated objects"""
 
+from pooltool.system.archive import Archive
 from pooltool.system.datatypes import MultiSystem, System, multisystem
 from pooltool.system.render import SystemController, SystemRender, visual
 
@@ -7,6 +8,7 @@ __all__ = [
     "System",
     "MultiSystem",
     "multisystem",
+    "Archive",
     "SystemRender",
     "SystemController",
     "visual",
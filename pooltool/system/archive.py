@@ -0,0 +1,268 @@
+"""An append-only archive of simulated systems with random access
+
+:meth:`pooltool.system.datatypes.MultiSystem.save` serializes every system into a
+single blob, so reading any one system means reading all of them. An
+:class:`Archive` instead stores each system as a separate record in the trace format
+(see :mod:`pooltool.system.trace`), followed by an index of record positions:
+
+    - 64 bytes: :data:`MAGIC`, padded with zeros.
+    - The records. Each is a 64 byte frame (:data:`RECORD_MAGIC`, the payload length,
+      and the payload's CRC-32 checksum) followed by the trace, padded to a multiple of
+      64 bytes.
+    - The footer: the byte position of each record, then the number of records, the
+      end of the last record, the CRC-32 checksum of the positions, and
+      :data:`FOOTER_MAGIC`.
+
+Since the footer is read from the end of the file, any system is loaded in O(1) time,
+without reading the others. Appending a system overwrites the footer with the new
+record, then writes a new footer. Records are self-describing, so if the footer is
+missing or corrupt (*e.g.* the process crashed mid-append), the index is rebuilt by
+scanning the records, and any incomplete trailing record is discarded.
+
+Example:
+
+    Append systems as they are simulated:
+
+    >>> import pooltool as pt
+    >>> archive = pt.system.Archive("session.archive")
+    >>> for V0 in (1, 2, 3):
+    >>>     system = pt.System.example()
+    >>>     system.strike(V0=V0)
+    >>>     archive.append(pt.simulate(system))
+
+    Access them randomly, or stream them:
+
+    >>> len(archive)
+    3
+    >>> archive[-1].cue.V0
+    3.0
+    >>> for system in archive: print(len(system.events))
+
+    A :class:`pooltool.system.datatypes.MultiSystem` can be archived, and vice versa:
+
+    >>> archive.extend(pt.multisystem)
+    >>> multisystem = archive.to_multisystem()
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+
+import attrs
+import numpy as np
+
+from pooltool.system.datatypes import MultiSystem, System
+from pooltool.system.trace import ALIGNMENT, load_trace, write_trace
+
+MAGIC = b"PTARCHIV"
+"""The first 8 bytes of every archive file"""
+
+RECORD_MAGIC = b"PTRECORD"
+"""The first 8 bytes of every record"""
+
+FOOTER_MAGIC = b"PTFOOTER"
+"""The last 8 bytes of every intact archive file"""
+
+EXT = "archive"
+"""The file extension of archive files"""
+
+_FRAME_SIZE = ALIGNMENT
+_FOOTER_TAIL_SIZE = 32
+
+
+def _pad(offset: int) -> int:
+    return -offset % ALIGNMENT
+
+
+def _frame(payload_len: int, crc: int) -> bytes:
+    frame = (
+        RECORD_MAGIC + payload_len.to_bytes(8, "little") + crc.to_bytes(4, "little")
+    )
+    return frame + b"\x00" * (_FRAME_SIZE - len(frame))
+
+
+def _footer(positions: List[int], end: int) -> bytes:
+    index = np.array(positions, dtype="<u8").tobytes()
+    return (
+        index
+        + len(positions).to_bytes(8, "little")
+        + end.to_bytes(8, "little")
+        + zlib.crc32(index).to_bytes(4, "little")
+        + b"\x00" * 4
+        + FOOTER_MAGIC
+    )
+
+
+def _read_footer(fp: BinaryIO, size: int) -> Optional[Tuple[List[int], int]]:
+    """Read the index from the footer, or return None if it isn't intact"""
+    if size < _FRAME_SIZE + _FOOTER_TAIL_SIZE:
+        return None
+
+    fp.seek(size - _FOOTER_TAIL_SIZE)
+    tail = fp.read(_FOOTER_TAIL_SIZE)
+    if tail[-8:] != FOOTER_MAGIC:
+        return None
+
+    num_records = int.from_bytes(tail[0:8], "little")
+    end = int.from_bytes(tail[8:16], "little")
+    crc = int.from_bytes(tail[16:20], "little")
+
+    index_start = size - _FOOTER_TAIL_SIZE - 8 * num_records
+    if index_start != end:
+        return None
+
+    fp.seek(index_start)
+    index = fp.read(8 * num_records)
+    if zlib.crc32(index) != crc:
+        return None
+
+    return np.frombuffer(index, dtype="<u8").tolist(), end
+
+
+def _scan(fp: BinaryIO, size: int) -> Tuple[List[int], int]:
+    """Rebuild the index by scanning the records, stopping at the first bad one"""
+    positions: List[int] = []
+    position = _FRAME_SIZE
+
+    while position + _FRAME_SIZE <= size:
+        fp.seek(position)
+        frame = fp.read(_FRAME_SIZE)
+        if frame[:8] != RECORD_MAGIC:
+            break
+
+        payload_len = int.from_bytes(frame[8:16], "little")
+        crc = int.from_bytes(frame[16:20], "little")
+        end = position + _FRAME_SIZE + payload_len
+        end += _pad(end)
+        if end > size:
+            break
+        if zlib.crc32(fp.read(payload_len)) != crc:
+            break
+
+        positions.append(position)
+        position = end
+
+    return positions, position
+
+
+@attrs.define
+class Archive:
+    """An append-only, randomly accessible file of systems
+
+    The file is created if it doesn't exist. Otherwise, its index is read from the
+    footer (or rebuilt, see :mod:`pooltool.system.archive`).
+
+    Attributes:
+        path:
+            The file path. By convention, the extension is ``.archive`` (see
+            :data:`EXT`).
+        mmap:
+            If True, systems are loaded with memory-mapped ball histories (see
+            :func:`pooltool.system.trace.load_trace`).
+        lazy:
+            If True, the states of event agents are built on first access (see
+            :meth:`pooltool.system.datatypes.System.load`).
+        durable:
+            If True (default), each append is flushed to disk with ``os.fsync`` before
+            returning, so that it survives a crash of the operating system, not just
+            of the process. Set to False for faster appends.
+    """
+
+    path: Path = attrs.field(converter=Path)
+    mmap: bool = attrs.field(default=False)
+    lazy: bool = attrs.field(default=False)
+    durable: bool = attrs.field(default=True)
+    _positions: List[int] = attrs.field(init=False, factory=list)
+    _end: int = attrs.field(init=False, default=_FRAME_SIZE)
+
+    def __attrs_post_init__(self) -> None:
+        if not self.path.exists():
+            with open(self.path, "wb") as fp:
+                fp.write(MAGIC + b"\x00" * (_FRAME_SIZE - len(MAGIC)))
+                fp.write(_footer([], _FRAME_SIZE))
+                self._sync(fp)
+            return
+
+        with open(self.path, "rb") as fp:
+            if fp.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"'{self.path}' is not an archive file")
+
+            size = os.fstat(fp.fileno()).st_size
+            index = _read_footer(fp, size)
+            if index is None:
+                index = _scan(fp, size)
+
+        self._positions, self._end = index
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __getitem__(self, idx: int) -> System:
+        return self.load(idx)
+
+    def __iter__(self) -> Iterator[System]:
+        for idx in range(len(self)):
+            yield self.load(idx)
+
+    def load(self, idx: int) -> System:
+        """Load a system, without reading any of the others
+
+        Raises:
+            IndexError: If ``idx`` is out of range.
+        """
+        position = self._positions[idx]
+        return load_trace(
+            self.path,
+            System,
+            mmap=self.mmap,
+            offset=position + _FRAME_SIZE,
+            lazy=self.lazy,
+        )
+
+    def to_multisystem(self) -> MultiSystem:
+        """Load every system into a :class:`MultiSystem`"""
+        return MultiSystem(list(self))
+
+    def append(self, system: System) -> None:
+        """Append a system to the end of the archive"""
+        self.extend([system])
+
+    def extend(self, systems: Iterable[System]) -> None:
+        """Append systems to the end of the archive
+
+        The footer is rewritten once, after all the systems are appended.
+        """
+        positions = list(self._positions)
+        end = self._end
+
+        with open(self.path, "r+b") as fp:
+            fp.seek(end)
+            for system in systems:
+                buffer = io.BytesIO()
+                write_trace(system, buffer)
+                payload = buffer.getbuffer()
+
+                fp.write(_frame(len(payload), zlib.crc32(payload)))
+                fp.write(payload)
+                fp.write(b"\x00" * _pad(len(payload)))
+
+                positions.append(end)
+                end += _FRAME_SIZE + len(payload) + _pad(len(payload))
+
+            # The records must be on disk before the footer that indexes them
+            self._sync(fp)
+
+            fp.write(_footer(positions, end))
+            fp.truncate()
+            self._sync(fp)
+
+        self._positions, self._end = positions, end
+
+    def _sync(self, fp: BinaryIO) -> None:
+        fp.flush()
+        if self.durable:
+            os.fsync(fp.fileno())
@@ -2,20 +2,25 @@
 
 from __future__ import annotations
 
+from functools import partial
+from pathlib import Path
 from typing import Any, Dict, Iterator, List, Optional
 
 import numpy as np
 from attrs import define, field
+from cattrs.gen import make_dict_structure_fn, make_dict_unstructure_fn, override
 
 import pooltool.constants as const
 import pooltool.ptmath as ptmath
 from pooltool.events import Event
+from pooltool.events.datatypes import structure_events_lazily
 from pooltool.objects.ball.datatypes import Ball, BallHistory
 from pooltool.objects.ball.sets import BallSet
 from pooltool.objects.cue.datatypes import Cue
 from pooltool.objects.table.datatypes import Table
-from pooltool.serialize import conversion
+from pooltool.serialize import SerializeFormat, conversion
 from pooltool.serialize.serializers import Pathish
+from pooltool.system.trace import is_trace, load_trace, save_trace
 
 
 def _convert_balls(balls: Any) -> Dict[str, Ball]:
@@ -108,7 +113,8 @@ class System:
     table: Table = field()
     balls: Dict[str, Ball] = field(converter=_convert_balls)
     t: float = field(default=0.0)
-    events: List[Event] = field(factory=list)
+    _events: List[Event] = field(factory=list, alias="events")
+    _events_shared: bool = field(default=False, init=False, repr=False, eq=False)
 
     @balls.validator  # type: ignore
     def _validate_balls(self, _, value) -> None:
@@ -155,6 +161,20 @@ class System:
         """
         return all(not ball.history_cts.empty for ball in self.balls.values())
 
+    @property
+    def events(self) -> List[Event]:
+        if self._events_shared:
+            # Stop sharing the events with copies (see copy)
+            self._events = [event.copy() for event in self._events]
+            self._events_shared = False
+
+        return self._events
+
+    @events.setter
+    def events(self, events: List[Event]) -> None:
+        self._events = events
+        self._events_shared = False
+
     @property
     def simulated(self):
         """Checks if the simulation has any events.
@@ -164,7 +184,7 @@ class System:
         Returns:
             bool: True if there are events, False otherwise.
         """
-        return bool(len(self.events))
+        return bool(len(self._events))
 
     def set_ballset(self, ballset: BallSet) -> None:
         """Sets the ballset for each ball in the system.
@@ -196,6 +216,9 @@ class System:
     def _update_history(self, event: Event):
         """Updates the history for all balls based on the given event.
 
+        Each ball's history is given a copy of its state, so the state can be modified
+        afterwards without modifying the history.
+
         Args:
             event (Event): The event to update the ball histories with.
         """
@@ -203,7 +226,7 @@ class System:
 
         for ball in self.balls.values():
             ball.state.t = event.time
-            ball.history.add(ball.state)
+            ball.history.add(ball.state.copy())
 
         self.events.append(event)
 
@@ -378,37 +401,48 @@ class System:
         return False
 
     def copy(self) -> System:
-        """Creates a deep-`ish` copy of the system.
-
-        This method generates a copy of the system with a level of deep copying that is
-        contingent on the mutability of the objects within the system. Immutable
-        objects, frozen data structures, and read-only numpy arrays
-        (``array.flags["WRITEABLE"] = False``) remain shared between the original and the
-        copied system.
-
-        TLDR For all intents and purposes, mutating the system copy will not impact the
-        original system, and vice versa.
+        """Creates a copy of the system.
+
+        Mutating the copy doesn't impact the original system, and vice versa. However,
+        to keep copying cheap, the two share as much as they can:
+
+        - Immutable objects, frozen data structures, and read-only numpy arrays
+          (``array.flags["WRITEABLE"] = False``) are shared.
+        - The table's cushion segments are shared (see
+          :meth:`pooltool.objects.table.datatypes.Table.copy`).
+        - Ball histories (:attr:`pooltool.objects.ball.datatypes.Ball.history` and
+          :attr:`pooltool.objects.ball.datatypes.Ball.history_cts`) are copy-on-write
+          (see :meth:`pooltool.objects.ball.datatypes.BallHistory.copy`).
+        - :attr:`events` is copy-on-write: the two systems share the list of events,
+          and each makes its own copy of it (and of the events in it) the first time
+          it accesses :attr:`events`. The events' agents are shared (see
+          :meth:`pooltool.events.datatypes.Event.copy`).
+
+        The cost of a copy therefore depends on the number of balls, not on the length
+        of the shot.
 
         Returns:
-            System: A deepcopy of the system.
+            System: A copy of the system.
 
         Example:
             >>> import pooltool as pt
             >>> system = pt.System.example()
-            >>> system_copy = pt.System.example()
+            >>> system_copy = system.copy()
             >>> pt.simulate(system, inplace=True)
             >>> system.simulated
             True
             >>> system_copy.simulated
             False
         """
-        return System(
+        system = System(
             cue=self.cue.copy(),
             table=self.table.copy(),
             balls={k: v.copy() for k, v in self.balls.items()},
             t=self.t,
-            events=[event.copy() for event in self.events],
+            events=self._events,
         )
+        self._events_shared = system._events_shared = True
+        return system
 
     def save(self, path: Pathish, drop_continuized_history: bool = False) -> None:
         """Save a System to file in a serialized format.
@@ -417,6 +451,7 @@ class System:
 
         (1) ``.json``
         (2) ``.msgpack``
+        (3) ``.trace`` (see :mod:`pooltool.system.trace`)
 
         Args:
             path:
@@ -505,35 +540,59 @@ class System:
             >>> pt.continuize(loaded_system, inplace=True)
             >>> assert loaded_system == system
 
+        Example:
+
+            For large collections of simulated shots, the columnar ``.trace`` format
+            (see :mod:`pooltool.system.trace`) stores events and ball histories as flat
+            arrays rather than nested objects, which is smaller and faster to save and
+            load than MSGPACK:
+
+            >>> import pooltool as pt
+            >>> system = pt.simulate(pt.System.example(), continuous=True)
+            >>> system.save("columnar.trace")
+            >>> assert pt.System.load("columnar.trace") == system
+
         See Also:
             Load systems with :meth:`load`.
         """
+        system = self
+
         if drop_continuized_history:
             # We're dropping the continuized histories. To avoid losing them in `self`,
             # we make a copy.
-            copy = self.copy()
+            system = self.copy()
 
-            for ball in copy.balls.values():
+            for ball in system.balls.values():
                 ball.history_cts = BallHistory()
 
-            conversion.unstructure_to(copy, path)
+        if is_trace(path):
+            save_trace(system, path)
             return
 
-        conversion.unstructure_to(self, path)
+        conversion.unstructure_to(system, path)
 
     @classmethod
-    def load(cls, path: Pathish) -> System:
+    def load(cls, path: Pathish, lazy: bool = False) -> System:
         """Load a System from a file in a serialized format.
 
         Supported file extensions:
 
         (1) ``.json``
         (2) ``.msgpack``
+        (3) ``.trace`` (see :mod:`pooltool.system.trace`)
 
         Args:
             path:
                 Either a ``pathlib.Path`` object or a string representing the file path. The
                 extension should match the supported filetypes mentioned above.
+            lazy:
+                If True, the initial and final states of each event's agents
+                (:attr:`pooltool.events.datatypes.Agent.initial` and
+                :attr:`pooltool.events.datatypes.Agent.final`) are built the first time
+                they're accessed, rather than up front. Event types, times, and agent
+                IDs are loaded as usual, so code that only needs those (*e.g.*
+                :mod:`pooltool.events.filter`) never pays for the states. The loaded
+                system is equal to the eagerly loaded one.
 
         Returns:
             System: The deserialized System object loaded from the file.
@@ -546,10 +605,31 @@ class System:
 
         Please refer to the examples in :meth:`save`.
 
+        Example:
+
+            Ruleset checks only need the types, times, and agents of events, so
+            they're faster with lazy loading:
+
+            >>> import pooltool as pt
+            >>> system = pt.System.load("case2.msgpack", lazy=True)
+            >>> pt.ruleset.utils.get_id_of_first_ball_hit(system, cue="cue")
+            '1'
+
         See Also:
             Save systems with :meth:`save`.
         """
-        return conversion.structure_from(path, cls)
+        if is_trace(path):
+            assert Path(path).exists()
+            return load_trace(path, cls, lazy=lazy)
+
+        if not lazy:
+            return conversion.structure_from(path, cls)
+
+        converter, unstructured = conversion.deserialize_from(path)
+        events = unstructured.pop("events", [])
+        system = converter.structure(unstructured, cls)
+        system.events = structure_events_lazily(events, converter)
+        return system
 
     @classmethod
     def example(cls) -> System:
@@ -594,6 +674,30 @@ class System:
         return system
 
 
+# The events are stored privately (see System.copy), but serialized as "events". The
+# hooks are made when first needed, so that they use the hooks of the system's parts
+_serialize_formats = (SerializeFormat.JSON, SerializeFormat.MSGPACK)
+for _fmt in _serialize_formats:
+    conversion.register_unstructure_hook_factory(
+        lambda cl: cl is System,
+        partial(
+            make_dict_unstructure_fn,
+            converter=conversion[_fmt],
+            _events=override(rename="events"),
+        ),
+        which=(_fmt,),
+    )
+    conversion.register_structure_hook_factory(
+        lambda cl: cl is System,
+        partial(
+            make_dict_structure_fn,
+            converter=conversion[_fmt],
+            _events=override(rename="events"),
+        ),
+        which=(_fmt,),
+    )
+
+
 @define
 class MultiSystem:
     """A storage for System objects
@@ -726,6 +830,8 @@ class MultiSystem:
         See Also:
             - To load a multisystem, see :meth:`load`.
             - To save/load single systems, see :meth:`System.save` and :meth:`System.load`
+            - To append systems to a file one at a time, and load any one of them
+              without loading the others, see :class:`pooltool.system.archive.Archive`.
         """
         conversion.unstructure_to(self, path)
 
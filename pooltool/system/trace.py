@@ -0,0 +1,733 @@
+"""A columnar binary format for simulated systems
+
+Saving a simulated system with :meth:`pooltool.system.datatypes.System.save` to JSON or
+MSGPACK unstructures every event, agent, and ball state into nested dictionaries, which
+dominates save and load times. The *trace* format instead stores the bulk of a
+simulated system, namely the event times, event types, agent IDs, agent states, and
+ball histories, as flat arrays:
+
+    - Event times, event types, and offsets into the agent arrays.
+    - Agent IDs and agent types, and the ``rvw``, ``s``, and ``t`` of every ball agent's
+      initial and final state.
+    - The ``rvw``, ``s``, and ``t`` of every ball's :attr:`history
+      <pooltool.objects.ball.datatypes.Ball.history>` and :attr:`history_cts
+      <pooltool.objects.ball.datatypes.Ball.history_cts>`, concatenated, with offsets.
+
+Everything else (the cue, the table, ball parameters, and non-ball agents) is small, and
+is stored in a JSON header. Agent objects that don't change from event to event (*e.g.*
+cushion segments and ball parameters) are stored once and referenced by index.
+
+The file layout is:
+
+    - 8 bytes: :data:`MAGIC`.
+    - 8 bytes: The length of the header, as a little-endian unsigned integer.
+    - The UTF-8 encoded JSON header. Among other things, it holds the dtype, shape, and
+      offset of each array.
+    - The raw array data, each array aligned to :data:`ALIGNMENT` bytes.
+
+Because the arrays are stored raw and aligned, they can be memory-mapped (see
+:func:`load_trace`).
+
+Round trips are lossless:
+
+    >>> import pooltool as pt
+    >>> system = pt.simulate(pt.System.example(), continuous=True)
+    >>> system.save("shot.trace")
+    >>> assert pt.System.load("shot.trace") == system
+"""
+
+from __future__ import annotations
+
+import json
+from functools import partial
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+import numpy as np
+from attrs import define
+from numpy.typing import NDArray
+
+from pooltool.events import Agent, AgentType, Event, EventType
+from pooltool.events.datatypes import Object, _type_to_class
+from pooltool.objects.ball.datatypes import Ball, BallHistory, BallState
+from pooltool.objects.cue.datatypes import Cue
+from pooltool.objects.table.datatypes import Table
+from pooltool.serialize import SerializeFormat, conversion
+from pooltool.serialize.serializers import Pathish
+
+if TYPE_CHECKING:
+    from pooltool.system.datatypes import System
+
+T = TypeVar("T", bound="System")
+
+MAGIC = b"PTTRACE\x00"
+"""The first 8 bytes of every trace file"""
+
+VERSION = 1
+"""The version of the trace format"""
+
+ALIGNMENT = 64
+"""The byte alignment of each array in a trace file"""
+
+EXT = "trace"
+"""The file extension of trace files"""
+
+_EVENT_TYPES: List[EventType] = list(EventType)
+_AGENT_TYPES: List[AgentType] = list(AgentType)
+_HISTORIES: Tuple[str, ...] = ("history", "history_cts")
+
+_converter = conversion[SerializeFormat.JSON]
+
+
+def is_trace(path: Pathish) -> bool:
+    """Whether a path has the trace file extension"""
+    return Path(path).suffix == f".{EXT}"
+
+
+def _pad(offset: int) -> int:
+    return -offset % ALIGNMENT
+
+
+class _ObjectPool:
+    """Deduplicates the agent objects stored in the header
+
+    Objects are first matched by identity (*e.g.* cushion segments, which are shared
+    between events), and then by their unstructured value.
+    """
+
+    def __init__(self) -> None:
+        self.entries: List[Dict[str, Any]] = []
+        self._by_identity: Dict[int, int] = {}
+        self._by_value: Dict[str, int] = {}
+        self._by_ball: Dict[Tuple[Any, ...], int] = {}
+
+    def _add(self, entry: Dict[str, Any]) -> int:
+        key = json.dumps(entry, sort_keys=True)
+        if (index := self._by_value.get(key)) is None:
+            index = self._by_value[key] = len(self.entries)
+            self.entries.append(entry)
+        return index
+
+    def add(self, agent_type: AgentType, obj: Object) -> int:
+        if (index := self._by_identity.get(id(obj))) is not None:
+            return index
+
+        index = self._add(
+            {
+                "agent_type": agent_type.value,
+                "object": _converter.unstructure(obj, _type_to_class[agent_type]),
+                "state": False,
+            }
+        )
+        self._by_identity[id(obj)] = index
+        return index
+
+    def add_ball(self, ball: Ball) -> int:
+        """Add a ball whose state is stored in the state columns
+
+        Only the ball's ID, parameters, ballset, and orientation are stored, so ball
+        agents of the same ball share an entry.
+        """
+        key = (ball.id, ball.params, ball.ballset, ball.initial_orientation)
+        if (index := self._by_ball.get(key)) is not None:
+            return index
+
+        template = Ball(
+            id=ball.id,
+            params=ball.params,
+            ballset=ball.ballset,
+            initial_orientation=ball.initial_orientation,
+        )
+        index = self._by_ball[key] = self._add(
+            {
+                "agent_type": AgentType.BALL.value,
+                "object": _converter.unstructure(template, Ball),
+                "state": True,
+            }
+        )
+        return index
+
+
+def _stack_histories(
+    histories: List[BallHistory],
+) -> Dict[str, NDArray[Any]]:
+    offsets = np.zeros(len(histories) + 1, dtype=np.int64)
+    rvws: List[NDArray[np.float64]] = []
+    ss: List[NDArray[np.int64]] = []
+    ts: List[NDArray[np.float64]] = []
+
+    for i, history in enumerate(histories):
+        offsets[i + 1] = offsets[i] + len(history)
+        if (vectorization := history.vectorize()) is not None:
+            rvw, s, t = vectorization
+            rvws.append(rvw)
+            ss.append(s)
+            ts.append(t)
+
+    return {
+        "offsets": offsets,
+        "rvw": np.concatenate(rvws) if rvws else np.empty((0, 3, 3), np.float64),
+        "s": np.concatenate(ss) if ss else np.empty(0, np.int64),
+        "t": np.concatenate(ts) if ts else np.empty(0, np.float64),
+    }
+
+
+def save_trace(system: System, path: Pathish) -> None:
+    """Save a system to a trace file
+
+    Args:
+        system:
+            The system. It need not be simulated.
+        path:
+            The file path. By convention, the extension is ``.trace`` (see :data:`EXT`).
+
+    See Also:
+        - :func:`load_trace`
+        - :meth:`pooltool.system.datatypes.System.save`
+    """
+    with open(path, "wb") as fp:
+        write_trace(system, fp)
+
+
+@define(frozen=True)
+class EncodedTrace:
+    """A system encoded in the trace format, ready to be written
+
+    Encoding a system (see :func:`encode_trace`) lays out its trace, so the size of the
+    trace is known before it's written, *e.g.* to allocate memory for it.
+
+    Attributes:
+        prefix:
+            The magic number, the header length, the header, and the padding that
+            aligns the array data.
+        arrays:
+            The arrays, by name.
+        offsets:
+            The offset of each array, relative to the end of :attr:`prefix`.
+        nbytes:
+            The size of the trace, in bytes.
+    """
+
+    prefix: bytes
+    arrays: Dict[str, NDArray[Any]]
+    offsets: Dict[str, int]
+    nbytes: int
+
+    def write(self, fp: BinaryIO) -> int:
+        """Write the trace at the current position of an open binary file
+
+        Returns:
+            int: The number of bytes written.
+        """
+        fp.write(self.prefix)
+
+        position = 0
+        for name, array in self.arrays.items():
+            fp.write(b"\x00" * (self.offsets[name] - position))
+            fp.write(np.ascontiguousarray(array).tobytes())
+            position = self.offsets[name] + array.nbytes
+
+        return self.nbytes
+
+    def write_into(self, buffer: Any) -> int:
+        """Write the trace at the start of a writable buffer
+
+        The arrays are copied straight into the buffer, without being converted to
+        bytes first. The padding between them is left as is.
+
+        Args:
+            buffer:
+                A writable object supporting the buffer protocol (*e.g.* a
+                ``memoryview`` of shared memory), of at least :attr:`nbytes` bytes.
+
+        Returns:
+            int: The number of bytes written.
+        """
+        data = np.frombuffer(buffer, dtype=np.uint8, count=self.nbytes)
+        data[: len(self.prefix)] = np.frombuffer(self.prefix, dtype=np.uint8)
+
+        for name, array in self.arrays.items():
+            offset = len(self.prefix) + self.offsets[name]
+            data[offset : offset + array.nbytes] = (
+                np.ascontiguousarray(array).reshape(-1).view(np.uint8)
+            )
+
+        return self.nbytes
+
+
+def encode_trace(system: System) -> EncodedTrace:
+    """Encode a system in the trace format
+
+    Args:
+        system:
+            The system. It need not be simulated.
+
+    Returns:
+        EncodedTrace: The trace, which can be written with :meth:`EncodedTrace.write`
+        or :meth:`EncodedTrace.write_into`.
+    """
+    ids: Dict[str, int] = {}
+    pool = _ObjectPool()
+
+    num_events = len(system.events)
+    num_agents = sum(len(event.agents) for event in system.events)
+
+    event_time = np.empty(num_events, dtype=np.float64)
+    event_type = np.empty(num_events, dtype=np.uint8)
+    event_agents = np.zeros(num_events + 1, dtype=np.int64)
+
+    agent_id = np.empty(num_agents, dtype=np.int32)
+    agent_type = np.empty(num_agents, dtype=np.uint8)
+    agent_object = np.full((2, num_agents), -1, dtype=np.int32)
+    agent_rvw = np.zeros((2, num_agents, 3, 3), dtype=np.float64)
+    agent_s = np.zeros((2, num_agents), dtype=np.int64)
+    agent_t = np.zeros((2, num_agents), dtype=np.float64)
+
+    event_type_codes = {member: code for code, member in enumerate(_EVENT_TYPES)}
+    agent_type_codes = {member: code for code, member in enumerate(_AGENT_TYPES)}
+
+    k = 0
+    for i, event in enumerate(system.events):
+        event_time[i] = event.time
+        event_type[i] = event_type_codes[event.event_type]
+
+        for agent in event.agents:
+            agent_id[k] = ids.setdefault(agent.id, len(ids))
+            agent_type[k] = agent_type_codes[agent.agent_type]
+
+            for j, obj in enumerate(agent.peek()):
+                if obj is None:
+                    continue
+
+                if (
+                    isinstance(obj, Ball)
+                    and obj.history.empty
+                    and obj.history_cts.empty
+                ):
+                    agent_object[j, k] = pool.add_ball(obj)
+                    agent_rvw[j, k] = obj.state.rvw
+                    agent_s[j, k] = obj.state.s
+                    agent_t[j, k] = obj.state.t
+                else:
+                    agent_object[j, k] = pool.add(agent.agent_type, obj)
+
+            k += 1
+
+        event_agents[i + 1] = k
+
+    balls = list(system.balls.values())
+
+    arrays: Dict[str, NDArray[Any]] = {
+        "event_time": event_time,
+        "event_type": event_type,
+        "event_agents": event_agents,
+        "agent_id": agent_id,
+        "agent_type": agent_type,
+        "agent_object": agent_object,
+        "agent_rvw": agent_rvw,
+        "agent_s": agent_s,
+        "agent_t": agent_t,
+    }
+    for name in _HISTORIES:
+        stacked = _stack_histories([getattr(ball, name) for ball in balls])
+        for key, array in stacked.items():
+            arrays[f"{name}_{key}"] = array
+
+    layout: Dict[str, Tuple[str, List[int], int]] = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset += _pad(offset)
+        layout[name] = (array.dtype.str, list(array.shape), offset)
+        offset += array.nbytes
+    data_len = offset
+
+    header = {
+        "version": VERSION,
+        "t": system.t,
+        "cue": _converter.unstructure(system.cue, Cue),
+        "table": _converter.unstructure(system.table, Table),
+        "balls": [
+            _converter.unstructure(ball.copy(drop_history=True), Ball)
+            for ball in balls
+        ],
+        "buffered": [
+            [getattr(ball, name).is_buffered for name in _HISTORIES] for ball in balls
+        ],
+        "event_types": [member.value for member in _EVENT_TYPES],
+        "agent_types": [member.value for member in _AGENT_TYPES],
+        "ids": list(ids),
+        "objects": pool.entries,
+        "arrays": layout,
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+
+    data_start = len(MAGIC) + 8 + len(header_bytes)
+    data_start += _pad(data_start)
+
+    prefix = b"".join(
+        [
+            MAGIC,
+            len(header_bytes).to_bytes(8, "little"),
+            header_bytes,
+            b"\x00" * (data_start - len(MAGIC) - 8 - len(header_bytes)),
+        ]
+    )
+
+    return EncodedTrace(
+        prefix=prefix,
+        arrays=arrays,
+        offsets={name: array_offset for name, (_, _, array_offset) in layout.items()},
+        nbytes=data_start + data_len,
+    )
+
+
+def write_trace(system: System, fp: BinaryIO) -> int:
+    """Write a system in the trace format to an open binary file
+
+    The trace is written at the current position of ``fp``. Arrays are aligned relative
+    to that position, so for memory-mapped reads (see :func:`read_trace`) it should be
+    a multiple of :data:`ALIGNMENT`.
+
+    Returns:
+        int: The number of bytes written.
+    """
+    return encode_trace(system).write(fp)
+
+
+def _read_header(
+    read: Callable[[int], bytes], source: str
+) -> Tuple[Dict[str, Any], int]:
+    """Read the header of a trace with a reader function
+
+    Returns:
+        Tuple[Dict[str, Any], int]:
+            The header, and the position of the array data relative to the start of
+            the trace.
+    """
+    if read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{source} is not a trace file")
+    header_len = int.from_bytes(read(8), "little")
+    header = json.loads(read(header_len).decode("utf-8"))
+
+    if header["version"] != VERSION:
+        raise ValueError(
+            f"Unsupported trace version {header['version']} (expected {VERSION})"
+        )
+
+    data_start = len(MAGIC) + 8 + header_len
+    return header, data_start + _pad(data_start)
+
+
+def _array_sizes(header: Dict[str, Any]) -> Dict[str, Tuple[np.dtype, int]]:
+    sizes: Dict[str, Tuple[np.dtype, int]] = {}
+    for name, (dtype_str, shape, _) in header["arrays"].items():
+        dtype = np.dtype(dtype_str)
+        sizes[name] = (dtype, int(np.prod(shape, dtype=np.int64)) * dtype.itemsize)
+    return sizes
+
+
+def _data_len(header: Dict[str, Any]) -> int:
+    sizes = _array_sizes(header)
+    return max(
+        (
+            array_offset + sizes[name][1]
+            for name, (_, _, array_offset) in header["arrays"].items()
+        ),
+        default=0,
+    )
+
+
+def _view_arrays(
+    header: Dict[str, Any], buffer: NDArray[np.uint8]
+) -> Dict[str, NDArray[Any]]:
+    sizes = _array_sizes(header)
+    arrays: Dict[str, NDArray[Any]] = {}
+    for name, (_, shape, array_offset) in header["arrays"].items():
+        dtype, nbytes = sizes[name]
+        arrays[name] = (
+            buffer[array_offset : array_offset + nbytes].view(dtype).reshape(shape)
+        )
+    return arrays
+
+
+def read_trace(
+    path: Pathish, mmap: bool = False, offset: int = 0
+) -> Tuple[Dict[str, Any], Dict[str, NDArray[Any]]]:
+    """Read the header and arrays of a trace file, without building a system
+
+    This is useful for analyses that only need a few columns (*e.g.* event times),
+    since no :class:`Event` or :class:`Ball` objects are created.
+
+    Args:
+        path:
+            The file path.
+        mmap:
+            If True, the arrays are read-only views of a memory-mapped file, so nothing
+            is read from disk until it's accessed. Otherwise the arrays are read into
+            memory.
+        offset:
+            The byte position of the trace within the file (see :func:`write_trace`).
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, NDArray[Any]]]:
+            The header, and the arrays by name.
+
+    Raises:
+        ValueError: If the file isn't a trace file, or its version is unsupported.
+    """
+    with open(path, "rb") as fp:
+        fp.seek(offset)
+        header, data_start = _read_header(fp.read, f"'{path}'")
+        data_start += offset
+        data_len = _data_len(header)
+
+        if not data_len:
+            buffer = np.empty(0, dtype=np.uint8)
+        elif mmap:
+            buffer = np.memmap(
+                path, dtype=np.uint8, mode="r", offset=data_start, shape=(data_len,)
+            )
+        else:
+            fp.seek(data_start)
+            buffer = np.fromfile(fp, dtype=np.uint8, count=data_len)
+
+    return header, _view_arrays(header, buffer)
+
+
+def read_trace_buffer(
+    buffer: Any,
+) -> Tuple[Dict[str, Any], Dict[str, NDArray[Any]]]:
+    """Read the header and arrays of a trace held in memory
+
+    This is the in-memory counterpart of :func:`read_trace`, *e.g.* for traces written
+    to shared memory with :meth:`EncodedTrace.write_into`.
+
+    Args:
+        buffer:
+            An object supporting the buffer protocol that starts with a trace.
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, NDArray[Any]]]:
+            The header, and the arrays by name. The arrays are views of ``buffer``,
+            not copies.
+
+    Raises:
+        ValueError: If the buffer doesn't hold a trace, or its version is unsupported.
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    position = 0
+
+    def read(size: int) -> bytes:
+        nonlocal position
+        chunk = data[position : position + size].tobytes()
+        position += size
+        return chunk
+
+    header, data_start = _read_header(read, "The buffer")
+    return header, _view_arrays(
+        header, data[data_start : data_start + _data_len(header)]
+    )
+
+
+def _unstack_history(
+    arrays: Dict[str, NDArray[Any]],
+    name: str,
+    i: int,
+    buffered: bool,
+    owned: bool,
+    share: bool,
+) -> BallHistory:
+    offsets = arrays[f"{name}_offsets"]
+    start, stop = offsets[i], offsets[i + 1]
+
+    if start == stop:
+        return BallHistory.buffered() if buffered else BallHistory()
+
+    vectorization = (
+        arrays[f"{name}_rvw"][start:stop],
+        arrays[f"{name}_s"][start:stop],
+        arrays[f"{name}_t"][start:stop],
+    )
+
+    if not owned and not buffered:
+        # The states of unbuffered histories are views of the arrays, and must be
+        # writeable
+        vectorization = tuple(np.array(array) for array in vectorization)
+
+    return BallHistory.from_vectorization(
+        vectorization, buffered=buffered, copy=not share  # type: ignore
+    )
+
+
+def load_trace(
+    path: Pathish,
+    cl: Type[T],
+    mmap: bool = False,
+    offset: int = 0,
+    lazy: bool = False,
+) -> T:
+    """Load a system from a trace file
+
+    Args:
+        path:
+            The file path.
+        cl:
+            The system class, *i.e.* :class:`pooltool.system.datatypes.System`.
+        mmap:
+            If True, the file is memory-mapped rather than read into memory. Ball
+            histories that were buffered when saved (see
+            :meth:`pooltool.objects.ball.datatypes.BallHistory.buffered`) are then
+            read-only views of the file, rather than copies. Adding states to them is
+            still safe, since full buffers are reallocated before being appended to.
+        offset:
+            The byte position of the trace within the file (see :func:`write_trace`).
+        lazy:
+            If True, the initial and final states of event agents are built the first
+            time they're accessed (see :attr:`pooltool.events.datatypes.Agent.decoder`).
+
+    Returns:
+        System: The system, equal to the one that was saved.
+
+    See Also:
+        - :func:`save_trace`
+        - :func:`read_trace`
+        - :meth:`pooltool.system.datatypes.System.load`
+    """
+    header, arrays = read_trace(path, mmap=mmap, offset=offset)
+    return _structure_trace(header, arrays, cl, owned=not mmap, share=mmap, lazy=lazy)
+
+
+def load_trace_buffer(buffer: Any, cl: Type[T], lazy: bool = False) -> T:
+    """Load a system from a trace held in memory
+
+    This is the in-memory counterpart of :func:`load_trace`, *e.g.* for traces written
+    to shared memory with :meth:`EncodedTrace.write_into`.
+
+    Args:
+        buffer:
+            An object supporting the buffer protocol that starts with a trace.
+        cl:
+            The system class, *i.e.* :class:`pooltool.system.datatypes.System`.
+        lazy:
+            See :func:`load_trace`.
+
+    Returns:
+        System:
+            The system, equal to the one that was encoded. Everything it holds is
+            copied out of ``buffer``, so the buffer can be released once this returns.
+    """
+    header, arrays = read_trace_buffer(buffer)
+    return _structure_trace(header, arrays, cl, owned=False, share=False, lazy=lazy)
+
+
+def _structure_trace(
+    header: Dict[str, Any],
+    arrays: Dict[str, NDArray[Any]],
+    cl: Type[T],
+    owned: bool,
+    share: bool,
+    lazy: bool,
+) -> T:
+    """Build a system from the header and arrays of a trace
+
+    Args:
+        owned:
+            Whether the arrays are writeable memory that the system may keep views of.
+        share:
+            Whether buffered ball histories may be backed by the arrays themselves,
+            rather than by copies of them.
+    """
+    event_types = [EventType(value) for value in header["event_types"]]
+    agent_types = [AgentType(value) for value in header["agent_types"]]
+    ids: List[str] = header["ids"]
+
+    templates: List[Object] = [
+        _converter.structure(
+            entry["object"], _type_to_class[AgentType(entry["agent_type"])]
+        )
+        for entry in header["objects"]
+    ]
+    stateful: List[bool] = [entry["state"] for entry in header["objects"]]
+
+    agent_id = arrays["agent_id"].tolist()
+    agent_type = arrays["agent_type"].tolist()
+    agent_object = arrays["agent_object"].tolist()
+    agent_rvw = np.array(arrays["agent_rvw"])
+    agent_s = arrays["agent_s"].tolist()
+    agent_t = arrays["agent_t"].tolist()
+
+    def build(j: int, k: int) -> Optional[Object]:
+        index = agent_object[j][k]
+        if index < 0:
+            return None
+
+        template = templates[index]
+        if not stateful[index]:
+            return template.copy()
+
+        assert isinstance(template, Ball)
+        return Ball(
+            id=template.id,
+            state=BallState(agent_rvw[j, k].copy(), agent_s[j][k], agent_t[j][k]),
+            params=template.params,
+            ballset=template.ballset,
+            initial_orientation=template.initial_orientation,
+        )
+
+    def build_states(k: int) -> Tuple[Optional[Object], Optional[Object]]:
+        return build(0, k), build(1, k)
+
+    def make_agent(k: int) -> Agent:
+        if lazy:
+            return Agent(
+                id=ids[agent_id[k]],
+                agent_type=agent_types[agent_type[k]],
+                decoder=partial(build_states, k),
+            )
+
+        initial, final = build_states(k)
+        return Agent(
+            id=ids[agent_id[k]],
+            agent_type=agent_types[agent_type[k]],
+            initial=initial,  # type: ignore
+            final=final,  # type: ignore
+        )
+
+    event_agents = arrays["event_agents"].tolist()
+    events: List[Event] = []
+    for i, (time, code) in enumerate(
+        zip(arrays["event_time"].tolist(), arrays["event_type"].tolist())
+    ):
+        agents = tuple(
+            make_agent(k) for k in range(event_agents[i], event_agents[i + 1])
+        )
+        events.append(Event(event_type=event_types[code], agents=agents, time=time))
+
+    balls: Dict[str, Ball] = {}
+    for i, (unstructured, buffered) in enumerate(
+        zip(header["balls"], header["buffered"])
+    ):
+        ball = _converter.structure(unstructured, Ball)
+        for name, is_buffered in zip(_HISTORIES, buffered):
+            history = _unstack_history(arrays, name, i, is_buffered, owned, share)
+            setattr(ball, name, history)
+        balls[ball.id] = ball
+
+    return cl(
+        cue=_converter.structure(header["cue"], Cue),
+        table=_converter.structure(header["table"], Table),
+        balls=balls,
+        t=header["t"],
+        events=events,
+    )
@@ -413,7 +413,7 @@ class Run:
         mc="yellow",
         nl_before=0,
         nl_after=0,
-        cut_after=80,
+        cut_after: Optional[int] = 80,
         level=1,
         progress=None,
     ):
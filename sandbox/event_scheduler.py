@@ -0,0 +1,114 @@
+#! /usr/bin/env python
+"""Benchmark heap-based next-event selection against full min-scans
+
+Each step of the shot evolution algorithm selects the soonest of all cached events.
+The caches are HeapDicts, which find the soonest event in O(log n). This script
+compares that against the O(n) ``min(cache, key=cache.get)`` scan that it replaced,
+on 22-ball snooker breaks.
+"""
+
+from contextlib import contextmanager
+
+import attrs
+import numpy as np
+
+import pooltool as pt
+from pooltool.evolution.event_based.cache import HeapDict
+from pooltool.objects.table.specs import PocketTableSpecs, SnookerTableSpecs
+
+
+def _min_scan(self):
+    """The pre-heap selection: a full scan over the cache"""
+    if not len(self):
+        raise ValueError("peek from an empty HeapDict")
+    return min(self, key=lambda k: self._priority(self[k]))
+
+
+@contextmanager
+def min_scans():
+    peek = HeapDict.peek
+    HeapDict.peek = _min_scan  # type: ignore
+    try:
+        yield
+    finally:
+        HeapDict.peek = peek  # type: ignore
+
+
+def snooker_table() -> pt.Table:
+    # Snooker specs are a clone of pocket table specs with different defaults
+    specs = SnookerTableSpecs()
+    fields = {
+        field.name: getattr(specs, field.name)
+        for field in attrs.fields(SnookerTableSpecs)
+        if field.init
+    }
+    return pt.Table.from_table_specs(PocketTableSpecs(**fields))
+
+
+def snooker_break(table: pt.Table, V0: float, phi_noise: float) -> pt.System:
+    shot = pt.System(
+        cue=pt.Cue(cue_ball_id="white"),
+        table=table,
+        balls=pt.get_rack(pt.GameType.SNOOKER, table),
+    )
+    shot.strike(V0=V0, phi=pt.aim.at_ball(shot, "red_01") + phi_noise)
+    return shot
+
+
+def main(args):
+    np.random.seed(args.seed)
+
+    table = snooker_table()
+    shots = [
+        snooker_break(table, V0=args.V0, phi_noise=np.random.uniform(-1, 1))
+        for _ in range(args.N)
+    ]
+
+    # Burn a run (numba cache loading)
+    pt.simulate(shots[0])
+
+    heap_times = np.zeros(args.N)
+    scan_times = np.zeros(args.N)
+    num_events = np.zeros(args.N)
+
+    for i, shot in enumerate(shots):
+        copy = shot.copy()
+        with pt.terminal.TimeCode(quiet=True) as timer:
+            pt.simulate(copy, inplace=True)
+        heap_times[i] = timer.time.total_seconds()
+        num_events[i] = len(copy.events)
+
+        reference = shot.copy()
+        with min_scans():
+            with pt.terminal.TimeCode(quiet=True) as timer:
+                pt.simulate(reference, inplace=True)
+        scan_times[i] = timer.time.total_seconds()
+
+        assert copy == reference, "Heap and min-scan selection disagree"
+
+    run = pt.terminal.Run()
+    run.info_single(f"Snooker breaks: {args.N} ({np.mean(num_events):.0f} events avg)")
+    for name, times in (("Min-scan", scan_times), ("Heap", heap_times)):
+        mu, stdev = np.mean(times), np.std(times)
+        run.info_single(f"{name}: ({mu:.3f} +- {stdev:.3f}) s/shot")
+    run.info_single(f"Speedup: {np.mean(scan_times) / np.mean(heap_times):.2f}x")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(
+        "Benchmark heap-based event selection against min-scans on snooker breaks"
+    )
+    ap.add_argument("--N", type=int, default=10, help="Number of breaks to simulate")
+    ap.add_argument(
+        "--V0",
+        type=float,
+        default=6,
+        help="With what speed should the cue stick strike the cue ball?",
+    )
+    ap.add_argument("--seed", type=int, default=42, help="Random seed")
+
+    args = ap.parse_args()
+
+    main(args)
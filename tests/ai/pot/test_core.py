@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from pooltool.ai.pot.core import (
+    analyze_pots,
+    calc_cut_angle,
+    calc_shadow_ball_center,
+    get_pocket_geometry,
+    get_potting_point,
+    is_jaw_in_way,
+    is_object_ball_occluded,
+    is_pocket_occluded,
+    is_room_for_cue_ball,
+    required_precision,
+)
+from pooltool.game.datatypes import GameType
+from pooltool.layouts import get_rack
+from pooltool.objects import Table
+
+
+def _scattered_rack(seed: int):
+    table = Table.from_game_type(GameType.NINEBALL)
+    balls = get_rack(GameType.NINEBALL, table)
+
+    rng = np.random.default_rng(seed)
+    for ball in balls.values():
+        R = ball.params.R
+        ball.state.rvw[0, 0] = rng.uniform(R, table.w - R)
+        ball.state.rvw[0, 1] = rng.uniform(R, table.l - R)
+
+    return table, balls
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_analyze_pots_matches_scalar(seed: int):
+    table, balls = _scattered_rack(seed)
+    cue = balls["cue"]
+    analysis = analyze_pots(cue, list(balls.values()), table)
+
+    assert set(analysis.ball_ids) == set(balls) - {"cue"}
+    assert set(analysis.pocket_ids) == set(table.pockets)
+
+    for i, ball_id in enumerate(analysis.ball_ids):
+        ball = balls[ball_id]
+        for j, pocket_id in enumerate(analysis.pocket_ids):
+            pocket = table.pockets[pocket_id]
+            potting_point = get_potting_point(ball, table, pocket)
+
+            np.testing.assert_allclose(analysis.potting_point[i, j], potting_point)
+            np.testing.assert_allclose(
+                analysis.shadow_ball[i, j], calc_shadow_ball_center(ball, table, pocket)
+            )
+            assert analysis.cut_angle[i, j] == pytest.approx(
+                abs(calc_cut_angle(cue.xyz[:2], ball.xyz[:2], potting_point))
+            )
+            assert analysis.precision[i, j] == pytest.approx(
+                required_precision(cue.state, ball.state, table, pocket)
+            )
+            assert analysis.pocket_occluded[i, j] == is_pocket_occluded(
+                ball, table, pocket, balls.values()
+            )
+            assert analysis.room_for_cue_ball[i, j] == is_room_for_cue_ball(
+                ball, table, pocket, balls.values()
+            )
+            assert analysis.jaw_in_way[i, j] == is_jaw_in_way(ball, table, pocket)
+            assert analysis.object_ball_occluded[i, j] == is_object_ball_occluded(
+                cue, ball, table, pocket, balls.values()
+            )
+
+
+def test_pocket_geometry_is_cached():
+    table = Table.default()
+    geometry = get_pocket_geometry(table)
+
+    assert get_pocket_geometry(table) is geometry
+    assert get_pocket_geometry(table.copy()) is geometry
+    assert get_pocket_geometry(Table.default()) is not geometry
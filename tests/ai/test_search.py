@@ -0,0 +1,57 @@
+import pytest
+
+from pooltool.ai.action import Action
+from pooltool.ai.search import CEMPlayer, score_shot
+from pooltool.evolution import simulate
+from pooltool.game.datatypes import GameType
+from pooltool.layouts import get_rack
+from pooltool.objects import Cue, Table
+from pooltool.ruleset import Player, get_ruleset
+from pooltool.system.datatypes import System
+
+
+@pytest.fixture
+def system():
+    table = Table.from_game_type(GameType.NINEBALL)
+    return System(
+        cue=Cue(cue_ball_id="cue"),
+        table=table,
+        balls=get_rack(GameType.NINEBALL, table),
+    )
+
+
+@pytest.fixture
+def game():
+    return get_ruleset(GameType.NINEBALL)(players=[Player("A"), Player("B")])
+
+
+def test_score_shot(system, game):
+    # Whiffing the 1-ball is a foul
+    shot = system.copy()
+    shot.strike(V0=0.5, phi=270)
+    simulate(shot, inplace=True)
+    assert score_shot(shot, game) < 0
+
+
+def test_decide(system, game):
+    ai = CEMPlayer(population=8, elite=2, iterations=2, seed=0)
+    improvements = []
+
+    action = ai.decide(system, game, callback=improvements.append)
+
+    assert isinstance(action, Action)
+    assert improvements and improvements[-1] == action
+    assert 0 <= action.phi < 360
+    assert ai.bounds.V0[0] <= action.V0 <= ai.bounds.V0[1]
+
+    # The system isn't modified, and decisions are reproducible
+    assert not system.simulated
+    assert ai.decide(system, game) == action
+
+    ai.apply(system, action)
+    assert Action.from_cue(system.cue) == action
+
+
+def test_invalid_elite():
+    with pytest.raises(ValueError):
+        CEMPlayer(population=4, elite=5)
@@ -4,12 +4,17 @@ from typing import List
 import pytest
 
 from pooltool.events.datatypes import Event, EventType
+from pooltool.events.filter import filter_ball
 from pooltool.objects.ball.datatypes import Ball
 from pooltool.objects.table.components import (
     CircularCushionSegment,
     LinearCushionSegment,
     Pocket,
 )
+from pooltool.ruleset.utils import (
+    get_id_of_first_ball_hit,
+    get_pocketed_ball_ids_during_shot,
+)
 from pooltool.system.datatypes import System
 
 
@@ -126,3 +131,37 @@ def test_get_pocket_missing_id(example_events: List[Event]):
         ValueError, match="No agent of type pocket with ID 'non_existent_pocket_id'"
     ):
         pocket_event.get_pocket("non_existent_pocket_id")
+
+
+def test_lazy_load():
+    """
+    Agent states of a lazily loaded system are only built when they're accessed.
+    """
+    path = Path(__file__).parent / "example_system.msgpack"
+    system = System.load(path)
+    lazy = System.load(path, lazy=True)
+
+    agents = [agent for event in lazy.events for agent in event.agents]
+    assert not any(agent.decoded for agent in agents)
+
+    # Rulesets and filters only need event types, times, and agent IDs
+    assert get_id_of_first_ball_hit(lazy) == get_id_of_first_ball_hit(system)
+    pocketed = get_pocketed_ball_ids_during_shot(system)
+    assert get_pocketed_ball_ids_during_shot(lazy) == pocketed
+    assert len(filter_ball(lazy.events, "cue")) == len(
+        filter_ball(system.events, "cue")
+    )
+    assert not any(agent.decoded for agent in agents)
+
+    # Representing agents doesn't build their states either
+    repr(lazy.events)
+    assert not any(agent.decoded for agent in agents)
+
+    # Accessing an agent's state only builds that agent's states
+    event = next(e for e in lazy.events if e.event_type == EventType.BALL_BALL)
+    assert isinstance(event.get_ball("cue"), Ball)
+    assert [agent.decoded for agent in event.agents] == [
+        agent.id == "cue" for agent in event.agents
+    ]
+
+    assert lazy == system
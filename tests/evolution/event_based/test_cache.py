@@ -0,0 +1,188 @@
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+from pooltool.events import EventType, ball_ball_collision, null_event
+from pooltool.evolution.event_based.cache import (
+    CacheStats,
+    CollisionCache,
+    CollisionTimes,
+    HeapDict,
+    TransitionCache,
+)
+from pooltool.objects.ball.datatypes import Ball
+from pooltool.system import System
+
+
+def _min_key(d):
+    return min(d, key=lambda k: d[k])
+
+
+def test_heap_dict_matches_min():
+    rng = np.random.default_rng(42)
+    heap_dict: HeapDict[int, float] = HeapDict()
+    reference = {}
+
+    for _ in range(2000):
+        key = int(rng.integers(50))
+        op = rng.random()
+
+        if op < 0.6:
+            # Coarse values, so that there are plenty of ties
+            value = float(rng.integers(10))
+            heap_dict[key] = value
+            reference[key] = value
+        elif key in reference:
+            del heap_dict[key]
+            del reference[key]
+
+        assert heap_dict == reference
+        if reference:
+            assert heap_dict.peek() == _min_key(reference)
+
+    # Stale entries don't pile up
+    assert len(heap_dict._heap) <= 2 * len(heap_dict) + 64
+
+
+def test_heap_dict_ties_follow_insertion_order():
+    heap_dict = HeapDict({"a": 1.0, "b": 0.0, "c": 0.0})
+    assert heap_dict.peek() == "b"
+
+    # Updating a value retains the key's position
+    heap_dict["b"] = 0.0
+    assert heap_dict.peek() == "b"
+
+    # Removing and re-adding a key moves it to the end
+    del heap_dict["b"]
+    heap_dict["b"] = 0.0
+    assert heap_dict.peek() == "c"
+
+
+def test_heap_dict_mutators():
+    heap_dict = HeapDict({"a": 3.0, "b": 2.0, "c": 1.0})
+
+    assert heap_dict.pop("c") == 1.0
+    assert heap_dict.peek() == "b"
+
+    heap_dict.update({"d": 0.0})
+    assert heap_dict.peek() == "d"
+
+    assert heap_dict.setdefault("e", -1.0) == -1.0
+    assert heap_dict.peek() == "e"
+
+    heap_dict.clear()
+    with pytest.raises(ValueError):
+        heap_dict.peek()
+
+
+def test_heap_dict_copy_and_pickle():
+    heap_dict = HeapDict(
+        {"a": null_event(2.0), "b": null_event(1.0)}, priority=lambda e: e.time
+    )
+    for other in (heap_dict.copy(), copy.deepcopy(heap_dict)):
+        assert isinstance(other, HeapDict)
+        assert other.peek() == "b"
+
+    transitions = TransitionCache().transitions
+    assert isinstance(transitions, HeapDict)
+    unpickled = pickle.loads(pickle.dumps(transitions))
+    assert isinstance(unpickled, HeapDict)
+    assert unpickled.peek() == transitions.peek()
+
+
+def test_transition_cache_get_next():
+    system = System.example()
+    system.strike(V0=2)
+    system.balls["cue"].state.s = 2
+
+    cache = TransitionCache.create(system)
+    assert isinstance(cache.transitions, HeapDict)
+    assert cache.get_next() is min(
+        cache.transitions.values(), key=lambda event: event.time
+    )
+
+
+def test_collision_cache_get_next():
+    cache = CollisionCache(times={EventType.BALL_BALL: {("1", "2"): 1.0}})
+    assert isinstance(cache.times[EventType.BALL_BALL], HeapDict)
+
+    cache.get_times(EventType.BALL_BALL)[("1", "3")] = 0.5
+    assert cache.get_next(EventType.BALL_BALL) == (("1", "3"), 0.5)
+
+    with pytest.raises(ValueError):
+        cache.get_next(EventType.BALL_POCKET)
+
+
+def test_collision_times_index():
+    times = CollisionTimes(
+        {("1", "2"): 1.0, ("1", "3"): 2.0, ("2", "3"): 3.0}, ball_indices=(0, 1)
+    )
+    assert times.keys_involving("1") == {("1", "2"), ("1", "3")}
+    assert times.keys_involving("4") == set()
+
+    del times[("1", "2")]
+    times.pop(("2", "3"))
+    assert times.keys_involving("1") == {("1", "3")}
+    assert times.keys_involving("2") == set()
+
+    # Only the ball positions are indexed
+    cushion_times = CollisionTimes({("1", "cushion"): 1.0}, ball_indices=(0,))
+    assert cushion_times.keys_involving("1") == {("1", "cushion")}
+    assert cushion_times.keys_involving("cushion") == set()
+
+    for other in (
+        times.copy(),
+        copy.deepcopy(times),
+        pickle.loads(pickle.dumps(times)),
+    ):
+        assert isinstance(other, CollisionTimes)
+        assert other == times
+        assert other.keys_involving("1") == {("1", "3")}
+
+    times.clear()
+    assert times.keys_involving("1") == set()
+
+
+def test_collision_cache_invalidate():
+    cache = CollisionCache(
+        times={
+            EventType.BALL_BALL: {("1", "2"): 1.0, ("2", "3"): 2.0, ("1", "4"): 3.0},
+            EventType.BALL_LINEAR_CUSHION: {("1", "c1"): 1.0, ("3", "c1"): 2.0},
+        }
+    )
+    assert isinstance(cache.times[EventType.BALL_BALL], CollisionTimes)
+
+    event = ball_ball_collision(Ball.create("2"), Ball.create("3"), time=0.0)
+    cache.invalidate(event)
+
+    assert cache.times[EventType.BALL_BALL] == {("1", "4"): 3.0}
+    assert cache.times[EventType.BALL_LINEAR_CUSHION] == {("1", "c1"): 1.0}
+    assert cache.stats.invalidations == 3
+
+
+def test_collision_cache_stats():
+    cache = CollisionCache.create()
+    times = cache.get_times(EventType.BALL_BALL)
+    times[("1", "2")] = 1.0
+    times[("1", "3")] = 2.0
+
+    # The soonest collision was just calculated
+    cache.get_next(EventType.BALL_BALL)
+    assert cache.stats == CacheStats(hits=0, misses=1, invalidations=0)
+
+    # A later collision is calculated, so the cached soonest collision is reused
+    times[("2", "3")] = 3.0
+    cache.get_next(EventType.BALL_BALL)
+    assert cache.stats == CacheStats(hits=1, misses=1, invalidations=0)
+
+    # A sooner collision is calculated
+    times[("3", "4")] = 0.5
+    cache.get_next(EventType.BALL_BALL)
+    assert cache.stats == CacheStats(hits=1, misses=2, invalidations=0)
+
+    # Nothing is calculated
+    cache.get_next(EventType.BALL_BALL)
+    assert cache.stats == CacheStats(hits=2, misses=2, invalidations=0)
+    assert cache.stats.hit_rate == 0.5
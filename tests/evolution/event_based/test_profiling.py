@@ -0,0 +1,72 @@
+from pooltool.ai.aim import at_ball
+from pooltool.evolution.event_based.profiling import Phase, SimulationStats
+from pooltool.evolution.event_based.simulate import (
+    DEFAULT_ENGINE,
+    simulate,
+    simulate_many,
+)
+from pooltool.game.datatypes import GameType
+from pooltool.layouts import get_rack
+from pooltool.objects import Cue, Table
+from pooltool.system import System
+
+
+def _break(V0: float = 6) -> System:
+    shot = System(
+        cue=Cue.default(),
+        table=(table := Table.default()),
+        balls=get_rack(GameType.NINEBALL, table),
+    )
+    shot.strike(V0=V0, phi=at_ball(shot, "1"))
+    return shot
+
+
+def test_stats():
+    shot = _break()
+
+    stats = SimulationStats()
+    profiled = simulate(shot, stats=stats)
+
+    # Profiling doesn't change the simulation
+    assert profiled == simulate(shot)
+
+    # The initial null event, the strike, and the final null event aren't detected
+    assert stats.shots == 1
+    assert stats.num_events == len(profiled.events) - 3
+    assert stats.num_quartics > 0
+    assert stats.cache.misses > 0
+
+    assert set(stats.phases) == set(Phase)
+    assert stats.time >= stats.phases[Phase.DETECT] >= stats.phases[Phase.QUARTIC]
+    assert stats.phases[Phase.RESOLVE] >= stats.resolver.snapshot
+
+    resolver = DEFAULT_ENGINE.resolver
+    for strategy in (resolver.ball_ball, resolver.stick_ball, resolver.transition):
+        assert type(strategy).__name__ in stats.resolver.strategies
+
+
+def test_stats_aggregate():
+    shots = [_break(V0) for V0 in (2, 4, 6)]
+
+    per_shot = [SimulationStats() for _ in shots]
+    for shot, stats in zip(shots, per_shot):
+        simulate(shot, stats=stats)
+
+    accumulated = SimulationStats()
+    for shot in shots:
+        simulate(shot, stats=accumulated)
+
+    total = sum(per_shot, SimulationStats())
+    assert total.shots == accumulated.shots == len(shots)
+    assert total.events == accumulated.events
+    assert total.quartic_batches == accumulated.quartic_batches
+    assert total.cache == accumulated.cache
+
+    # Adding stats doesn't modify them
+    assert per_shot[0].shots == 1
+
+    batched = SimulationStats()
+    simulate_many(shots, stats=batched)
+    assert batched.shots == len(shots)
+    assert batched.events == total.events
+    assert batched.num_quartics == total.num_quartics
@@ -4,14 +4,28 @@ from numpy.typing import NDArray
 
 import pooltool.constants as const
 import pooltool.ptmath as ptmath
-from pooltool.events import EventType, ball_ball_collision, ball_pocket_collision
+from pooltool.ai.aim import at_ball
+from pooltool.events import (
+    AgentType,
+    EventType,
+    ball_ball_collision,
+    ball_pocket_collision,
+)
 from pooltool.evolution.event_based.cache import CollisionCache
+from pooltool.evolution.event_based.config import RecordMode
+from pooltool.evolution.event_based.profiling import SimulationStats
 from pooltool.evolution.event_based.simulate import (
+    checkpoint,
     get_next_ball_ball_collision,
     get_next_event,
+    resume,
     simulate,
+    simulate_iter,
+    simulate_many,
 )
 from pooltool.evolution.event_based.solve import ball_ball_collision_coeffs
+from pooltool.game.datatypes import GameType
+from pooltool.layouts import get_rack
 from pooltool.objects import Ball, BilliardTableSpecs, Cue, Table
 from pooltool.ptmath.roots import quadratic, quartic
 from pooltool.system import System
@@ -483,3 +497,226 @@ def test_no_ball_ball_collisions_for_intersecting_balls(solver: quartic.QuarticS
         get_next_ball_ball_collision(system, CollisionCache(), solver=solver).time
         == np.inf
     )
+
+
+@pytest.mark.parametrize(
+    "solver", [quartic.QuarticSolver.NUMERIC, quartic.QuarticSolver.HYBRID]
+)
+def test_simulate_many(solver: quartic.QuarticSolver):
+    """Batched simulation matches simulating each system individually"""
+    shots = []
+    for V0, phi in [(0.5, 90), (1.5, 94), (3.0, 120), (2.0, 45), (0.0, 0)]:
+        shot = System.example()
+        shot.strike(V0=V0, phi=phi)
+        shots.append(shot)
+
+    batched = simulate_many(shots, quartic_solver=solver)
+    serial = [simulate(shot, quartic_solver=solver) for shot in shots]
+
+    # The passed systems are not simulated
+    assert not any(shot.simulated for shot in shots)
+
+    assert len(batched) == len(serial)
+    for batched_shot, serial_shot in zip(batched, serial):
+        assert batched_shot == serial_shot
+
+    # In place
+    simulate_many(shots, inplace=True, quartic_solver=solver)
+    assert shots == serial
+
+
+@pytest.mark.parametrize("case", ["case1", "case2", "case3", "case4"])
+def test_broad_phase_matches_exhaustive(case: str):
+    """Broad phase culling doesn't change the simulation"""
+    shot = System.load(TEST_DIR / f"{case}.msgpack")
+    if shot.simulated:
+        for ball in shot.balls.values():
+            ball.state = ball.history[0]
+        shot.reset_history()
+
+    assert simulate(shot, broad_phase=True) == simulate(shot, broad_phase=False)
+
+
+def test_broad_phase_matches_exhaustive_breaks():
+    rng = np.random.default_rng(42)
+    for _ in range(5):
+        shot = System(
+            cue=Cue.default(),
+            table=(table := Table.default()),
+            balls=get_rack(GameType.NINEBALL, table, spacing_factor=1e-3),
+        )
+        shot.strike(V0=rng.uniform(2, 8), phi=at_ball(shot, "1") + rng.uniform(-2, 2))
+
+        assert simulate(shot, broad_phase=True) == simulate(shot, broad_phase=False)
+
+
+def test_compact_events():
+    """Compact events store ball states in a log, yet simulate the same"""
+    shot = System(
+        cue=Cue.default(),
+        table=(table := Table.default()),
+        balls=get_rack(GameType.NINEBALL, table),
+    )
+    shot.strike(V0=6, phi=at_ball(shot, "1"))
+
+    compact = simulate(shot, compact_events=True)
+    expected = simulate(shot)
+
+    ball_agents = [
+        agent
+        for event in compact.events
+        for agent in event.agents
+        if agent.agent_type == AgentType.BALL
+    ]
+    assert len(ball_agents)
+    assert not any(agent.decoded for agent in ball_agents)
+
+    assert compact == expected
+    assert not any(agent.decoded for agent in ball_agents)
+
+    # Balls are built from the log on access
+    idx = next(
+        i for i, e in enumerate(compact.events) if e.event_type == EventType.BALL_BALL
+    )
+    ball_id = compact.events[idx].ids[0]
+    ball = compact.events[idx].get_ball(ball_id, initial=False)
+    assert ball == expected.events[idx].get_ball(ball_id, initial=False)
+    assert ball.params is compact.balls[ball_id].params
+
+
+def test_checkpoint_resume():
+    """Resuming a checkpoint matches simulating from scratch"""
+    shot = System(
+        cue=Cue.default(),
+        table=(table := Table.default()),
+        balls=get_rack(GameType.NINEBALL, table),
+    )
+    shot.strike(V0=6, phi=at_ball(shot, "1"))
+    expected = simulate(shot)
+
+    for event_index in (1, 5, len(expected.events) // 2):
+        paused = checkpoint(shot, event_index)
+        assert not paused.finished
+        assert paused.shot.events == expected.events[: event_index + 1]
+
+        # Resuming doesn't modify the checkpoint, so it can be resumed again
+        assert resume(paused) == expected
+        assert len(paused.shot.events) == event_index + 1
+        assert resume(paused, inplace=True) == expected
+        assert paused.finished
+
+    # The simulation finishes before the checkpoint
+    paused = checkpoint(shot, len(expected.events) + 10)
+    assert paused.finished
+    assert paused.shot == expected
+    assert resume(paused) == expected
+
+
+def test_checkpoint_perturbation():
+    """Perturbing a copy of a checkpoint branches the simulation"""
+    shot = System.example()
+    paused = checkpoint(shot, 3)
+
+    branch = paused.copy()
+    branch.shot.balls["cue"].state.rvw[1] *= 1.1
+    branch.invalidate(["cue"])
+    perturbed = resume(branch, inplace=True)
+    unperturbed = resume(paused)
+
+    assert perturbed.events[:4] == unperturbed.events[:4]
+    assert perturbed.events[4:] != unperturbed.events[4:]
+
+    # The checkpoint itself isn't perturbed
+    assert unperturbed == simulate(shot)
+
+
+@pytest.mark.parametrize("record", [RecordMode.EVENTS, RecordMode.FINAL])
+def test_record(record: RecordMode):
+    """Lighter record modes reach the same outcome, recording less"""
+    shot = System(
+        cue=Cue.default(),
+        table=(table := Table.default()),
+        balls=get_rack(GameType.NINEBALL, table),
+    )
+    shot.strike(V0=6, phi=at_ball(shot, "1"))
+
+    expected = simulate(shot)
+    outcome = simulate(shot, record=record)
+
+    assert outcome.t == expected.t
+    for ball_id, ball in outcome.balls.items():
+        assert ball.state == expected.balls[ball_id].state
+        assert ball.history.empty
+
+    if record == RecordMode.FINAL:
+        assert not len(outcome.events)
+    else:
+        assert [(e.event_type, e.ids, e.time) for e in outcome.events] == [
+            (e.event_type, e.ids, e.time) for e in expected.events
+        ]
+        for event in outcome.events:
+            for agent in event.agents:
+                assert agent.initial is None and agent.final is None
+
+    with pytest.raises(ValueError):
+        simulate(shot, record=record, continuous=True)
+
+
+@pytest.mark.parametrize("record", [RecordMode.FULL, RecordMode.FINAL])
+def test_simulate_iter(record: RecordMode):
+    """Streamed events are those of simulate, and the simulated system is returned"""
+    shot = System(
+        cue=Cue.default(),
+        table=(table := Table.default()),
+        balls=get_rack(GameType.NINEBALL, table),
+    )
+    shot.strike(V0=6, phi=at_ball(shot, "1"))
+
+    expected = simulate(shot)
+
+    events = []
+    stream = simulate_iter(shot, record=record)
+    with pytest.raises(StopIteration) as exhausted:
+        while True:
+            events.append(next(stream))
+    streamed = exhausted.value.value
+
+    assert not shot.simulated
+    assert [(e.event_type, e.ids, e.time) for e in events] == [
+        (e.event_type, e.ids, e.time) for e in expected.events
+    ]
+    # Only ball and pocket agents get final states
+    for event in events:
+        for agent in event.agents:
+            if agent.agent_type == AgentType.BALL:
+                assert agent.initial is not None and agent.final is not None
+
+    if record == RecordMode.FULL:
+        assert events == expected.events
+        assert streamed == expected
+    else:
+        assert not len(streamed.events)
+        for ball_id, ball in streamed.balls.items():
+            assert ball.state == expected.balls[ball_id].state
+
+
+@pytest.mark.parametrize("broad_phase", [True, False])
+def test_quartics_bounded_by_transitions(broad_phase: bool):
+    """Quartics without a root before a transition aren't solved, culled or not"""
+    system = System.example()
+
+    # The cue ball slides away from the 1 ball
+    system.balls["cue"].state.rvw[1] = [0, -0.5, 0]
+    system.balls["cue"].state.s = const.sliding
+
+    # Unbounded, the quartic is solved, and has a root after the cue ball transitions
+    # (where the quartic no longer holds)
+    cache = CollisionCache.create(broad_phase=broad_phase, bounded=False)
+    stats = SimulationStats()
+    get_next_ball_ball_collision(system, cache, stats=stats)
+    assert stats.num_quartics == int(not broad_phase)
+
+    cache = CollisionCache.create(broad_phase=broad_phase)
+    stats = SimulationStats()
+    assert get_next_ball_ball_collision(system, cache, stats=stats).time == np.inf
+    assert stats.num_quartics == 0
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import pooltool.constants as const
+import pooltool.physics.evolve as evolve
+import pooltool.ptmath as ptmath
+from pooltool.evolution.event_based.solve import ball_swept_bounds
+from pooltool.objects import BallParams
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("s", [const.sliding, const.rolling])
+def test_ball_swept_bounds(seed: int, s: int):
+    """The swept bounds contain the path until the next transition, and are tight"""
+    rng = np.random.default_rng(seed)
+    params = BallParams.default()
+    R = params.R
+
+    rvw = np.zeros((3, 3), dtype=np.float64)
+    rvw[0] = [rng.uniform(0, 1), rng.uniform(0, 2), R]
+    rvw[1] = [rng.uniform(-2, 2), rng.uniform(-2, 2), 0]
+
+    if s == const.rolling:
+        rvw[2] = ptmath.coordinate_rotation(rvw[1] / R, np.pi / 2)
+        T = ptmath.get_roll_time(rvw, params.u_r, params.g)
+    else:
+        rvw[2] = rng.uniform(-100, 100, size=3)
+        T = ptmath.get_slide_time(rvw, R, params.u_s, params.g)
+
+    x_lo, x_hi, y_lo, y_hi = ball_swept_bounds(
+        rvw, s, params.u_s, params.u_r, params.g, R
+    )
+
+    xys = np.array(
+        [
+            evolve.evolve_ball_motion(
+                s, rvw, R, params.m, params.u_s, params.u_sp, params.u_r, params.g, t
+            )[0][0, :2]
+            for t in np.linspace(0, T, 1000)
+        ]
+    )
+
+    eps = 1e-9
+    assert (xys[:, 0] >= x_lo - eps).all() and (xys[:, 0] <= x_hi + eps).all()
+    assert (xys[:, 1] >= y_lo - eps).all() and (xys[:, 1] <= y_hi + eps).all()
+
+    # Tight (up to the sampling resolution)
+    tol = 1e-3
+    assert xys[:, 0].min() == pytest.approx(x_lo, abs=tol)
+    assert xys[:, 0].max() == pytest.approx(x_hi, abs=tol)
+    assert xys[:, 1].min() == pytest.approx(y_lo, abs=tol)
+    assert xys[:, 1].max() == pytest.approx(y_hi, abs=tol)
+
+
+def test_ball_swept_bounds_nontranslating():
+    rvw = np.zeros((3, 3), dtype=np.float64)
+    rvw[0] = [0.3, 0.4, 0.028575]
+    rvw[2] = [0, 0, 10]
+
+    for s in (const.stationary, const.spinning, const.pocketed):
+        assert ball_swept_bounds(rvw, s, 0.2, 0.01, 9.8, 0.028575) == (
+            0.3,
+            0.3,
+            0.4,
+            0.4,
+        )
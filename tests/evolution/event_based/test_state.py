@@ -0,0 +1,151 @@
+from itertools import combinations
+
+import numpy as np
+
+import pooltool.constants as const
+from pooltool.evolution.event_based.solve import (
+    ball_ball_collision_coeffs,
+    ball_ball_collision_coeffs_many,
+    ball_pocket_collision_coeffs,
+    ball_pocket_collision_coeffs_many,
+)
+from pooltool.evolution.event_based.state import ObjectPairs, SystemState
+from pooltool.system import System
+
+
+def _moving_system() -> System:
+    system = System.example()
+    system.balls["cue"].state.rvw[1] = [0.5, 1.0, 0.0]
+    system.balls["cue"].state.s = const.sliding
+    system.balls["1"].state.rvw[1] = [-0.2, 0.3, 0.0]
+    system.balls["1"].state.s = const.rolling
+    return system
+
+
+def test_from_system():
+    system = _moving_system()
+    state = SystemState.from_system(system)
+
+    assert state.ball_ids == list(system.balls)
+    assert len(state) == len(system.balls)
+
+    for ball_id, ball in system.balls.items():
+        i = state.index[ball_id]
+        assert np.array_equal(state.rvw[i], ball.state.rvw)
+        assert state.s[i] == ball.state.s
+        assert state.R[i] == ball.params.R
+        assert state.u_sp[i] == ball.params.u_sp
+        assert state.mu[i] == (
+            ball.params.u_s if ball.state.s == const.sliding else ball.params.u_r
+        )
+
+    assert state.ball_ball_pairs.keys == list(combinations(system.balls, 2))
+    assert len(state.ball_pocket_pairs) == len(system.balls) * len(system.table.pockets)
+    assert state.pockets.shape == (len(system.table.pockets), 3)
+
+
+def test_push_and_pull():
+    system = _moving_system()
+    system.balls["1"].state.s = const.stationary
+    system.balls["1"].state.rvw[1] = 0.0
+    state = SystemState.from_system(system)
+    assert state.moving.tolist() == [state.index["cue"]]
+
+    stationary = system.balls["1"].state.copy()
+    state.rvw[:, 0, 0] += 0.1
+    state.push(system, t=1.0)
+
+    # Only the moving balls are pushed, in place
+    cue = system.balls["cue"].state
+    assert np.array_equal(cue.rvw, state.rvw[state.index["cue"]])
+    assert cue.t == 1.0
+    assert system.balls["1"].state == stationary
+    assert not np.shares_memory(cue.rvw, state.rvw)
+
+    system.balls["1"].state.s = const.rolling
+    system.balls["1"].state.rvw[1] = [-0.2, 0.3, 0.0]
+    state.pull(system, ["1"])
+    i = state.index["1"]
+    assert state.s[i] == const.rolling
+    assert np.array_equal(state.rvw[i], system.balls["1"].state.rvw)
+    assert sorted(state.moving.tolist()) == sorted([i, state.index["cue"]])
+
+
+def test_object_pairs_uncached():
+    pairs = ObjectPairs.ball_object(["1", "2", "3"], ["a", "b"])
+    assert pairs.keys == [
+        ("1", "a"),
+        ("1", "b"),
+        ("2", "a"),
+        ("2", "b"),
+        ("3", "a"),
+        ("3", "b"),
+    ]
+    assert pairs.idx.tolist() == [[0, 0, 1, 1, 2, 2], [0, 1, 0, 1, 0, 1]]
+
+    assert pairs.uncached({}).tolist() == list(range(6))
+    assert pairs.uncached({("2", "b"): 1.0, ("1", "a"): 0.0}).tolist() == [1, 2, 4, 5]
+    assert not len(pairs.uncached(dict.fromkeys(pairs.keys, 0.0)))
+
+
+def test_batched_coeffs_match_scalar():
+    system = _moving_system()
+    state = SystemState.from_system(system)
+
+    idx1, idx2 = state.ball_ball_pairs.idx
+    coeffs = ball_ball_collision_coeffs_many(
+        state.rvw, state.s, state.mu, state.m, state.g, state.R, idx1, idx2
+    )
+    for row, (i, j) in zip(coeffs, zip(idx1, idx2)):
+        expected = ball_ball_collision_coeffs(
+            state.rvw[i],
+            state.rvw[j],
+            state.s[i],
+            state.s[j],
+            state.mu[i],
+            state.mu[j],
+            state.m[i],
+            state.m[j],
+            state.g[i],
+            state.g[j],
+            state.R[i],
+        )
+        assert np.array_equal(row, expected)
+
+    ball_idx, pocket_idx = state.ball_pocket_pairs.idx
+    coeffs = ball_pocket_collision_coeffs_many(
+        state.rvw,
+        state.s,
+        state.mu,
+        state.m,
+        state.g,
+        state.R,
+        state.pockets,
+        ball_idx,
+        pocket_idx,
+    )
+    for row, (i, j) in zip(coeffs, zip(ball_idx, pocket_idx)):
+        expected = ball_pocket_collision_coeffs(
+            state.rvw[i],
+            state.s[i],
+            *state.pockets[j],
+            state.mu[i],
+            0,
+            state.g[i],
+            state.R[i],
+        )
+        assert np.array_equal(row, expected)
+
+
+def test_moving():
+    system = _moving_system()
+    state = SystemState.from_system(system)
+    assert [state.ball_ids[i] for i in state.moving] == ["cue", "1"]
+
+    # Only updated when balls are pulled (i.e. when an event is resolved)
+    system.balls["cue"].state.s = const.spinning
+    system.balls["1"].state.s = const.pocketed
+    assert [state.ball_ids[i] for i in state.moving] == ["cue", "1"]
+
+    state.pull(system, ["cue", "1"])
+    assert [state.ball_ids[i] for i in state.moving] == ["cue"]
@@ -0,0 +1,110 @@
+from typing import Optional
+
+import pytest
+
+from pooltool.ai.aim import at_ball
+from pooltool.events import EventType, filter_type
+from pooltool.evolution.event_based.simulate import checkpoint, resume, simulate
+from pooltool.evolution.event_based.stop import (
+    AllOf,
+    BallBallCollision,
+    BallPocketed,
+    CushionHits,
+    EventOccurs,
+    StopCondition,
+)
+from pooltool.game.datatypes import GameType
+from pooltool.layouts import get_rack
+from pooltool.objects import Cue, Table
+from pooltool.system import System
+
+
+@pytest.fixture
+def shot():
+    shot = System(
+        cue=Cue.default(),
+        table=(table := Table.default()),
+        balls=get_rack(GameType.NINEBALL, table),
+    )
+    shot.strike(V0=6, phi=at_ball(shot, "1"))
+    return shot
+
+
+@pytest.fixture
+def expected(shot):
+    return simulate(shot)
+
+
+def _stopping_index(expected: System, condition: StopCondition) -> Optional[int]:
+    """The index of the event that meets the condition in a full simulation"""
+    monitor = condition.monitor()
+    for i, event in enumerate(expected.events):
+        if monitor(expected, event):
+            return i
+    return None
+
+
+@pytest.mark.parametrize(
+    "condition",
+    [
+        BallBallCollision(),
+        BallBallCollision("cue"),
+        BallPocketed(),
+        CushionHits("cue", 2),
+        EventOccurs(EventType.BALL_BALL, ("cue", "1")),
+        BallPocketed() | CushionHits("cue", 1),
+        AllOf([BallBallCollision("cue"), CushionHits("1", 1)]),
+    ],
+)
+def test_stop_when(shot, expected, condition: StopCondition):
+    stopped = simulate(shot, stop_when=condition)
+    idx = _stopping_index(expected, condition)
+
+    if idx is None or idx == len(expected.events) - 1:
+        assert stopped == expected
+        return
+
+    # The simulation stops right after the event that meets the condition
+    assert stopped.events[:-1] == expected.events[: idx + 1]
+    assert stopped.events[-1].event_type == EventType.NONE
+    assert stopped.t == expected.events[idx].time
+
+    # Conditions are reusable
+    assert simulate(shot, stop_when=condition) == stopped
+
+
+def test_stop_when_never_met(shot, expected):
+    assert simulate(shot, stop_when=CushionHits("9", 1000)) == expected
+
+
+def test_cushion_hits(expected):
+    cushion_events = filter_type(
+        expected.events,
+        [EventType.BALL_LINEAR_CUSHION, EventType.BALL_CIRCULAR_CUSHION],
+    )
+    assert len(cushion_events)
+
+    # The rack is random, so count the hits of whichever ball hits a cushion first
+    ball_id = cushion_events[0].ids[0]
+    hits = [event for event in cushion_events if event.ids[0] == ball_id]
+
+    # The monitor is met by the last hit, and stays met
+    monitor = CushionHits(ball_id, len(hits)).monitor()
+    met = [monitor(expected, event) for event in expected.events]
+    assert met.index(True) == expected.events.index(hits[-1])
+    assert all(met[met.index(True) :])
+
+
+def test_resume_stop_when(shot):
+    condition = BallBallCollision("cue")
+    paused = checkpoint(shot, 1)
+
+    assert resume(paused, stop_when=condition) == simulate(shot, stop_when=condition)
+
+    # The condition was already met before the checkpoint
+    idx = _stopping_index(simulate(shot), condition)
+    assert idx is not None
+    later = checkpoint(shot, idx + 1)
+    stopped = resume(later, stop_when=condition)
+    assert stopped.events[:-1] == later.shot.events
+    assert stopped.events[-1].event_type == EventType.NONE
@@ -1,5 +1,11 @@
-from pooltool.evolution.continuize import continuize
+import numpy as np
+import pytest
+
+import pooltool.physics.evolve as evolve
+from pooltool.events import filter_ball
+from pooltool.evolution.continuize import continuize, sample, sample_all
 from pooltool.evolution.event_based.simulate import simulate
+from pooltool.objects.ball.datatypes import BallHistory, BallState
 from pooltool.system import System
 
 
@@ -30,3 +36,139 @@ def test_continuize_inplace():
 
     # They are the same object
     assert continuized_system is system
+
+
+def _continuize_reference(system: System, dt: float) -> System:
+    """The original, pure-python continuize loop"""
+    system = system.copy()
+    num_timestamps = int(system.events[-1].time // dt) + 1
+
+    for ball in system.balls.values():
+        history = BallHistory()
+        history.add(ball.history[0])
+        rvw, s = ball.history[0].rvw, ball.history[0].s
+        events = filter_ball(system.events, ball.id, keep_nonevent=True)
+        count = 0
+        elapsed = 0.0
+
+        for n in range(num_timestamps):
+            if n == (num_timestamps - 1):
+                assert events[-1].time - elapsed < dt
+                break
+
+            if events[count + 1].time - elapsed > dt:
+                evolve_time = dt
+            else:
+                while True:
+                    count += 1
+                    if events[count + 1].time - elapsed > dt:
+                        break
+
+                state = events[count].get_ball(ball.id, initial=False).state.copy()
+                rvw, s = state.rvw, state.s
+                evolve_time = elapsed + dt - events[count].time
+
+            rvw, s = evolve.evolve_ball_motion(
+                state=s,
+                rvw=rvw,
+                R=ball.params.R,
+                m=ball.params.m,
+                u_s=ball.params.u_s,
+                u_sp=ball.params.u_sp,
+                u_r=ball.params.u_r,
+                g=ball.params.g,
+                t=evolve_time,
+            )
+
+            history.add(BallState(rvw, s, elapsed + dt))
+            elapsed += dt
+
+        history.add(ball.history[-1])
+        ball.history_cts = history
+
+    return system
+
+
+@pytest.mark.parametrize("dt", [0.01, 0.0037])
+@pytest.mark.parametrize("seed", range(4))
+def test_continuize_matches_reference(dt: float, seed: int):
+    rng = np.random.default_rng(seed)
+    system = System.example()
+    system.strike(
+        V0=rng.uniform(0.5, 4), phi=rng.uniform(0, 360), b=rng.uniform(-0.3, 0.3)
+    )
+    simulate(system, inplace=True)
+
+    continuized = continuize(system, dt=dt)
+    reference = _continuize_reference(system, dt)
+
+    for ball_id, ball in continuized.balls.items():
+        expected = reference.balls[ball_id].history_cts
+        assert ball.history_cts.is_buffered
+        assert len(ball.history_cts) == len(expected)
+
+        # Bitwise identical to the original implementation
+        for actual_vec, expected_vec in zip(
+            ball.history_cts.vectorize(), expected.vectorize()
+        ):
+            assert np.array_equal(actual_vec, expected_vec, equal_nan=True)
+
+
+def test_sample():
+    system = simulate(System.example())
+    continuized = continuize(system, dt=0.01)
+
+    for ball_id, ball in continuized.balls.items():
+        rvws_cts, ss_cts, ts = ball.history_cts.vectorize()
+
+        # Skip t=0, where the sampled state is the state after the cue strike
+        sampled = sample(system, ball_id, ts[1:])
+        assert sampled.is_buffered
+        assert len(sampled) == len(ts) - 1
+
+        rvws, ss, sampled_ts = sampled.vectorize()
+        assert np.array_equal(sampled_ts, ts[1:])
+        assert np.array_equal(ss, ss_cts[1:])
+        assert np.allclose(rvws, rvws_cts[1:], atol=1e-10)
+
+    # Sampling at event times yields the outgoing state of the (last) event
+    rvws, ss, ts = system.balls["cue"].history.vectorize()
+    sampled_rvws, sampled_ss, _ = sample(system, "cue", ts).vectorize()
+    last = np.searchsorted(ts, ts, side="right") - 1
+    assert np.array_equal(sampled_ss, ss[last])
+    assert np.allclose(sampled_rvws, rvws[last])
+
+    # Nothing is stored on the system
+    assert not system.continuized
+
+
+def test_sample_all():
+    system = simulate(System.example())
+    times = np.linspace(0, system.t, 50)
+
+    sampled = sample_all(system, times)
+    assert set(sampled) == set(system.balls)
+
+    for ball_id, history in sampled.items():
+        assert history == sample(system, ball_id, times)
+
+
+def test_sample_invalid():
+    system = System.example()
+
+    # Not simulated
+    with pytest.raises(ValueError):
+        sample(system, "cue", [0.0])
+
+    simulate(system, inplace=True)
+
+    # Decreasing timepoints
+    with pytest.raises(ValueError):
+        sample(system, "cue", [0.2, 0.1])
+
+    # Out of bounds
+    with pytest.raises(ValueError):
+        sample(system, "cue", [system.t + 1])
+
+    # No timepoints
+    assert sample(system, "cue", []).empty
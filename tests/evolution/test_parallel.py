@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+
+from pooltool.evolution.event_based.simulate import simulate
+from pooltool.evolution.parallel import simulate_pool, simulate_pool_iter
+from pooltool.system import System
+
+
+@pytest.fixture
+def shots():
+    shots = []
+    for phi in (0, 45, 90, 135, 180):
+        shot = System.example()
+        shot.strike(phi=phi)
+        shots.append(shot)
+    return shots
+
+
+def test_simulate_pool(shots):
+    simulated = simulate_pool(shots, workers=2, chunksize=2)
+
+    # Results are returned in input order and match serial simulation
+    assert simulated == [simulate(shot) for shot in shots]
+
+    # The passed systems are not simulated
+    assert not any(shot.simulated for shot in shots)
+
+
+def test_simulate_pool_continuous(shots):
+    simulated = simulate_pool(shots, workers=2, continuous=True)
+    assert simulated == [simulate(shot, continuous=True) for shot in shots]
+    assert all(system.continuized for system in simulated)
+
+
+def test_simulate_pool_iter(shots):
+    serial = [simulate(shot) for shot in shots]
+
+    # Unordered streaming yields every index exactly once
+    streamed = dict(simulate_pool_iter(shots, workers=2, chunksize=1))
+    assert sorted(streamed) == list(range(len(shots)))
+    assert [streamed[idx] for idx in range(len(shots))] == serial
+
+    # Ordered streaming yields in input order
+    indices = [idx for idx, _ in simulate_pool_iter(shots, workers=2, ordered=True)]
+    assert indices == list(range(len(shots)))
+
+    # Consumers may stop early
+    for idx, system in simulate_pool_iter(shots, workers=2, chunksize=1):
+        assert system == serial[idx]
+        break
+
+
+def _shared_memory_blocks():
+    return set(Path("/dev/shm").glob("psm_*"))
+
+
+@pytest.mark.skipif(not Path("/dev/shm").is_dir(), reason="Requires /dev/shm")
+def test_simulate_pool_iter_releases_shared_memory(shots):
+    before = _shared_memory_blocks()
+
+    # Stopping early leaves uncollected results in the current chunk, in other
+    # finished chunks, and in chunks still being simulated
+    for _ in simulate_pool_iter(shots, workers=2, chunksize=2):
+        break
+
+    assert _shared_memory_blocks() <= before
@@ -12,6 +12,7 @@ from pooltool.objects.ball.datatypes import (
     _null_rvw,
 )
 from pooltool.objects.ball.sets import get_ballset
+from pooltool.serialize import SerializeFormat, conversion
 
 
 def test__null_rvw():
@@ -128,6 +129,31 @@ def test_ball_history_copy():
     assert copy != history
 
 
+def test_ball_history_copy_on_write():
+    history = BallHistory()
+    for t in range(10):
+        history.add(BallState(np.ones((3, 3)), 1, t))
+
+    # The copy shares the states until either history exposes them
+    copy = history.copy()
+    assert copy._states is history._states
+    assert copy == history
+    assert len(copy) == 10
+    assert np.array_equal(copy.vectorize()[0], history.vectorize()[0])
+    assert copy._states is history._states
+
+    # Indexing makes copies of the states, just for the indexed history
+    copy[0].rvw[0] = [0, 0, 0]
+    assert copy._states is not history._states
+    assert np.array_equal(history[0].rvw, np.ones((3, 3)))
+
+    # Adding to a history doesn't add to its copy
+    other_copy = history.copy()
+    history.add(BallState(np.ones((3, 3)), 1, 10))
+    assert len(history) == 11
+    assert len(other_copy) == 10
+
+
 def test_ball_history_add():
     # Init history
     history = BallHistory()
@@ -161,6 +187,101 @@ def test_ball_history_add():
     assert len(history) == 2
 
 
+def test_buffered_ball_history():
+    history = BallHistory()
+    buffered = BallHistory.buffered(capacity=1)
+    assert buffered.is_buffered and not history.is_buffered
+    assert buffered.empty
+    assert buffered.vectorize() is None
+
+    for i in range(5):
+        state = BallState(rvw=np.full((3, 3), float(i)), s=i % 5, t=float(i))
+        history.add(state.copy())
+        buffered.add(state)
+
+    # The buffer grew to fit the states
+    assert len(buffered) == len(history) == 5
+
+    # Buffered states are built on access, and setting them replaces the buffer
+    assert buffered.states == history.states
+    buffered.states[0].t = -1.0
+    assert buffered[0].t == 0.0
+    copy = buffered.copy()
+    copy.states = history.states[:2]
+    assert copy.is_buffered and copy == BallHistory(states=history.states[:2])
+    assert len(buffered) == 5
+
+    # Indexing and iteration match the list-based history
+    assert buffered[-1] == history[-1]
+    assert list(buffered) == list(history)
+    assert buffered == history
+
+    # The vectorizations match
+    for buffered_vec, vec in zip(buffered.vectorize(), history.vectorize()):
+        assert np.array_equal(buffered_vec, vec)
+
+    # States are copied into the buffer when added
+    state = BallState(rvw=np.zeros((3, 3)), s=0, t=10.0)
+    buffered.add(state)
+    state.rvw[0, 0] = 1.0
+    assert buffered[-1].rvw[0, 0] == 0.0
+
+    # Vectorizations are views of the buffer, not copies
+    rvws, ss, ts = buffered.vectorize()
+    assert ss.dtype == np.int64
+    for array, again in zip((rvws, ss, ts), buffered.vectorize()):
+        assert np.shares_memory(array, again)
+
+    # Indexed and iterated states are copies, and vectorizations are read-only
+    expected = rvws.copy()
+    buffered[-1].rvw[0, 0] = 1.0
+    next(iter(buffered)).rvw[0, 0] = 1.0
+    assert np.array_equal(rvws, expected)
+    with pytest.raises(ValueError):
+        rvws[-1, 0, 0] = 1.0
+    with pytest.raises(ValueError):
+        ts[-1] = 0.0
+
+    # Copies are buffered and independent
+    copy = buffered.copy()
+    assert copy.is_buffered
+    assert copy == buffered
+    copy.add(BallState(rvw=np.zeros((3, 3)), s=0, t=11.0))
+    assert len(copy) == len(buffered) + 1
+    buffered.add(BallState(rvw=np.ones((3, 3)), s=0, t=12.0))
+    assert copy[-1].t == 11.0 and buffered[-1].t == 12.0
+
+    # Time must not decrease
+    with pytest.raises(AssertionError):
+        buffered.add(BallState(rvw=np.zeros((3, 3)), s=0, t=0.0))
+
+
+def test_buffered_ball_history_vectorization_round_trip():
+    history = BallHistory()
+    for i in range(5):
+        history.add(BallState(rvw=np.full((3, 3), float(i)), s=i % 5, t=float(i)))
+
+    buffered = BallHistory.from_vectorization(history.vectorize(), buffered=True)
+    assert buffered.is_buffered
+    assert buffered == history
+    assert BallHistory.from_vectorization(buffered.vectorize()) == history
+
+    empty = BallHistory.from_vectorization(None, buffered=True)
+    assert empty.is_buffered and empty.empty
+
+
+def test_buffered_ball_history_serialization():
+    buffered = BallHistory.buffered()
+    for i in range(5):
+        buffered.add(BallState(rvw=np.full((3, 3), float(i)), s=i % 5, t=float(i)))
+
+    for fmt in (SerializeFormat.JSON, SerializeFormat.MSGPACK):
+        converter = conversion[fmt]
+        assert converter.structure(converter.unstructure(buffered), BallHistory) == (
+            buffered
+        )
+
+
 # ------ BallParams
 
 
@@ -15,8 +15,10 @@ def test_table_copy(table):
     assert new is not table
     assert new == table
 
-    assert new.cushion_segments is not table.cushion_segments
     assert new.pockets is not table.pockets
 
+    # The geometry _is_ shared, since it isn't modified once the table is built
+    assert new.cushion_segments is table.cushion_segments
+
     # `model_descr` object _is_ shared, but its frozen so its OK
     assert new.model_descr is table.model_descr
@@ -0,0 +1,53 @@
+import numpy as np
+
+import pooltool.constants as const
+from pooltool.evolution.event_based.state import SystemState
+from pooltool.physics.evolve import evolve_ball_motion, evolve_balls_motion
+from pooltool.system import System
+
+
+def test_evolve_balls_motion():
+    system = System.example()
+    system.balls["cue"].state.rvw[1] = [0.5, 1.0, 0.0]
+    system.balls["cue"].state.s = const.sliding
+    system.balls["1"].state.rvw[2] = [0.0, 0.0, 10.0]
+    system.balls["1"].state.s = const.spinning
+
+    state = SystemState.from_system(system)
+    initial = state.rvw.copy()
+    idx = np.array([state.index["cue"], state.index["1"]], dtype=np.intp)
+
+    evolve_balls_motion(
+        state.s,
+        state.rvw,
+        state.R,
+        state.m,
+        state.u_s,
+        state.u_sp,
+        state.u_r,
+        state.g,
+        idx,
+        0.1,
+    )
+
+    for i, ball in enumerate(system.balls.values()):
+        if i not in idx:
+            # Balls not in idx aren't touched
+            assert np.array_equal(state.rvw[i], initial[i])
+            continue
+
+        expected, _ = evolve_ball_motion(
+            ball.state.s,
+            ball.state.rvw,
+            ball.params.R,
+            ball.params.m,
+            ball.params.u_s,
+            ball.params.u_sp,
+            ball.params.u_r,
+            ball.params.g,
+            0.1,
+        )
+        assert np.array_equal(state.rvw[i], expected)
+
+    # Motion states are left untouched
+    assert state.s[state.index["cue"]] == const.sliding
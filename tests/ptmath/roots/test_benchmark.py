@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from pooltool.game.datatypes import GameType
+from pooltool.ptmath.roots import benchmark
+from pooltool.ptmath.roots.quartic import QuarticSolver
+
+
+def test_hybrid_paths():
+    ps = np.array(
+        [
+            [1.0, -10.0, 35.0, -50.0, 24.0],
+            [0.9604, -22.342, 131.14, -13.969, 0.0],
+        ]
+    )
+    paths = benchmark.hybrid_paths(ps)
+    assert len(paths) == len(benchmark.HYBRID_PATHS)
+    assert paths.sum() == len(ps)
+    assert paths[0] == 1
+
+
+def test_accuracy():
+    truth = np.array([1.0, 2.0, np.inf, 0.0, 4.0])
+    roots = np.array([1.0, 2.2, 3.0, 0.0, np.inf])
+
+    result = benchmark.accuracy(roots, truth)
+    assert result.missed == 1
+    assert result.spurious == 1
+    assert result.rel_errors == pytest.approx([0.0, 0.1, 0.0])
+    assert result.percentile(100) == pytest.approx(0.1)
+
+
+def test_gate():
+    results = {
+        QuarticSolver.HYBRID: benchmark.Accuracy(0, 0, np.array([1e-9])),
+        QuarticSolver.NUMERIC: benchmark.Accuracy(2, 0, np.array([1e-3])),
+    }
+    assert not benchmark.gate(results, [QuarticSolver.HYBRID])
+    assert len(benchmark.gate(results, [QuarticSolver.NUMERIC])) == 2
+
+
+def test_save_load_batches(tmp_path):
+    rng = np.random.default_rng(0)
+    batches = {
+        GameType.NINEBALL: [rng.random((n, 5)) for n in (3, 1, 12)],
+        GameType.SNOOKER: [rng.random((2, 5))],
+    }
+
+    path = tmp_path / "coeffs.npz"
+    benchmark.save_batches(path, batches)
+    loaded = benchmark.load_batches(path)
+
+    assert loaded.keys() == batches.keys()
+    for game_type, game_batches in batches.items():
+        assert len(loaded[game_type]) == len(game_batches)
+        for expected, ps in zip(game_batches, loaded[game_type]):
+            np.testing.assert_array_equal(expected, ps)
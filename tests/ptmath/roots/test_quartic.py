@@ -4,9 +4,7 @@ import pytest
 from pooltool.ptmath.roots import quartic
 
 
-@pytest.mark.parametrize(
-    "solver", [quartic.QuarticSolver.NUMERIC, quartic.QuarticSolver.HYBRID]
-)
+@pytest.mark.parametrize("solver", list(quartic.QuarticSolver))
 def test_case1(solver: quartic.QuarticSolver):
     coeffs = (
         0.9604000000000001,
@@ -34,3 +32,92 @@ def test_e_equals_0():
 
     expected = np.zeros(4, dtype=np.complex128)
     assert (expected == quartic.solve(*coeffs)).all()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_solve_many_smallest(seed: int):
+    """Compare against quartics constructed from known roots"""
+    rng = np.random.default_rng(seed)
+    roots = rng.uniform(-3, 3, size=(1000, 4))
+    ps = np.array([np.poly(row) for row in roots]) * rng.uniform(0.1, 10, (1000, 1))
+
+    expected = np.where(roots >= 0, roots, np.inf).min(axis=1)
+    assert quartic.solve_many_smallest(ps) == pytest.approx(expected, abs=1e-9)
+
+
+def test_solve_many_smallest_edge_cases():
+    ps = np.array(
+        [
+            # e == 0
+            [1.0, 2.0, 3.0, 4.0, 0.0],
+            # Degenerate quadratic with roots 1 and 2
+            [0.0, 0.0, 1.0, -3.0, 2.0],
+            # Degenerate linear with root 2
+            [0.0, 0.0, 0.0, 1.0, -2.0],
+            # Degenerate constant
+            [0.0, 0.0, 0.0, 0.0, 1.0],
+            # No real roots
+            [1.0, 0.0, 0.0, 0.0, 1.0],
+            # Only negative real roots
+            [1.0, 10.0, 35.0, 50.0, 24.0],
+        ]
+    )
+    expected = [0.0, 1.0, 2.0, np.inf, np.inf, np.inf]
+    assert quartic.solve_many_smallest(ps).tolist() == expected
+
+
+def test_solve_many_smallest_near_zero_root():
+    """A ball-ball collision quartic with a root very close to 0
+
+    Lifted from a simulation, where the real root is isolated from the others by ~4
+    orders of magnitude.
+    """
+    coeffs = (
+        6.0147562500000005,
+        -3.9771213286860645,
+        0.8672109763867436,
+        -0.06935604401376716,
+        4.434610105794219e-06,
+    )
+    expected = 6.399096459639824e-05
+
+    coeffs_array = np.array(coeffs)[np.newaxis, :]
+    root = quartic.solve_quartics(coeffs_array, quartic.QuarticSolver.BRACKET)[0]
+    assert root == pytest.approx(expected, rel=1e-9)
+    assert abs(quartic.evaluate(np.array(coeffs), root)) < 1e-15
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_no_roots_until(seed: int):
+    """Quartics are never flagged if they have a root in the interval"""
+    rng = np.random.default_rng(seed)
+    roots = rng.uniform(-3, 3, size=(1000, 4))
+    ps = np.array([np.poly(row) for row in roots]) * rng.uniform(-10, 10, (1000, 1))
+    t_max = rng.uniform(0, 4, size=1000)
+
+    flags = quartic.no_roots_until(ps, t_max)
+    has_root = ((roots >= 0) & (roots <= t_max[:, np.newaxis])).any(axis=1)
+
+    assert not (flags & has_root).any()
+    # The test isn't exact, but it should flag most of the root-free intervals
+    assert flags.sum() > 0.5 * (~has_root).sum()
+
+
+def test_no_roots_until_edge_cases():
+    ps = np.array(
+        [
+            # Roots 1, 2, 3, 4
+            [1.0, -10.0, 35.0, -50.0, 24.0],
+            [1.0, -10.0, 35.0, -50.0, 24.0],
+            [1.0, -10.0, 35.0, -50.0, 24.0],
+            # Only negative real roots
+            [1.0, 10.0, 35.0, 50.0, 24.0],
+            # e == 0
+            [1.0, 2.0, 3.0, 4.0, 0.0],
+            # Degenerate quadratic with roots 1 and 2
+            [0.0, 0.0, 1.0, -3.0, 2.0],
+        ]
+    )
+    t_max = np.array([0.5, 1.0, np.inf, np.inf, 1.0, 0.9])
+    expected = [True, False, False, True, False, True]
+    assert quartic.no_roots_until(ps, t_max).tolist() == expected
@@ -0,0 +1,80 @@
+import pytest
+
+from pooltool.evolution import simulate
+from pooltool.system.archive import Archive
+from pooltool.system.datatypes import MultiSystem, System
+
+
+@pytest.fixture(scope="module")
+def systems():
+    systems = []
+    for V0 in (0.5, 1.0, 1.5, 2.0):
+        system = System.example()
+        system.strike(V0=V0)
+        systems.append(simulate(system))
+    return systems
+
+
+def test_append_and_load(tmp_path, systems):
+    archive = Archive(tmp_path / "shots.archive", durable=False)
+    assert len(archive) == 0
+
+    for system in systems:
+        archive.append(system)
+
+    assert len(archive) == len(systems)
+    assert archive[2] == systems[2]
+    assert archive[-1] == systems[-1]
+    assert list(archive) == systems
+
+    with pytest.raises(IndexError):
+        archive[len(systems)]
+
+
+def test_reopen(tmp_path, systems):
+    path = tmp_path / "shots.archive"
+    Archive(path).extend(systems[:2])
+
+    archive = Archive(path)
+    assert list(archive) == systems[:2]
+
+    archive.extend(systems[2:])
+    assert list(Archive(path, mmap=True)) == systems
+
+
+def test_multisystem(tmp_path, systems):
+    archive = Archive(tmp_path / "shots.archive")
+    archive.extend(MultiSystem(systems))
+
+    multisystem = archive.to_multisystem()
+    assert multisystem.multisystem == systems
+
+
+@pytest.mark.parametrize("cut", [1, 100, 1000])
+def test_recover_from_crash(tmp_path, systems, cut: int):
+    """An interrupted append loses only the appended system"""
+    path = tmp_path / "shots.archive"
+    archive = Archive(path)
+    archive.extend(systems[:3])
+    size = path.stat().st_size
+
+    archive.append(systems[3])
+
+    # Simulate a crash while writing the last record, which also clobbered the footer
+    with open(path, "r+b") as fp:
+        fp.truncate(size + cut)
+
+    recovered = Archive(path)
+    assert list(recovered) == systems[:3]
+
+    # The archive can still be appended to
+    recovered.append(systems[3])
+    assert list(Archive(path)) == systems
+
+
+def test_not_an_archive(tmp_path):
+    path = tmp_path / "bogus.archive"
+    path.write_bytes(b"not an archive file")
+
+    with pytest.raises(ValueError):
+        Archive(path)
@@ -1,5 +1,6 @@
 import pytest
 
+from pooltool.evolution import simulate
 from pooltool.system.datatypes import System
 
 
@@ -14,3 +15,46 @@ def test_cue_ball_id_mismatch():
             balls=system.balls,
             table=system.table,
         )
+
+
+def test_copy():
+    system = simulate(System.example(), continuous=True)
+    copy = system.copy()
+    assert copy == system
+
+    # Modifying the states of the original doesn't modify its copies
+    other_copy = system.copy()
+    ball = system.balls["cue"]
+    ball.state.rvw[0] = [0, 0, 0]
+    ball.history[-1].rvw[0] = [0, 0, 0]
+    event = next(event for event in system.events if event.event_type.has_ball())
+    event.agents[0].final = None
+    assert system != copy
+    assert copy == other_copy
+
+    # Resimulating the copy doesn't modify the original
+    expected = system.copy()
+    copy.strike(V0=1)
+    simulate(copy, inplace=True, continuous=True)
+    assert copy != system
+    assert system == expected
+
+
+def test_copy_is_copy_on_write():
+    system = simulate(System.example())
+    copy = system.copy()
+
+    # The copy shares the events, ball histories, and table geometry
+    assert copy._events is system._events
+    assert copy.balls["cue"].history._states is system.balls["cue"].history._states
+    assert copy.table.cushion_segments is system.table.cushion_segments
+    assert copy.simulated
+    assert copy == system
+
+    # Accessing the events of one makes its own copy of them
+    num_events = len(system._events)
+    copy.events.pop()
+    assert copy._events is not system._events
+    assert len(system.events) == num_events
+    assert len(copy.events) == num_events - 1
+    assert copy.events == system.events[:-1]
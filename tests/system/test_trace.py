@@ -0,0 +1,145 @@
+import io
+
+import numpy as np
+import pytest
+
+from pooltool.events import AgentType
+from pooltool.evolution import simulate
+from pooltool.objects import Ball
+from pooltool.system.datatypes import System
+from pooltool.system.trace import (
+    encode_trace,
+    load_trace,
+    load_trace_buffer,
+    read_trace,
+    write_trace,
+)
+from tests.evolution.event_based.test_data import TEST_DIR
+
+
+@pytest.mark.parametrize("case", ["case1", "case2", "case3", "case4"])
+def test_round_trip(tmp_path, case: str):
+    system = System.load(TEST_DIR / f"{case}.msgpack")
+
+    path = tmp_path / f"{case}.trace"
+    system.save(path)
+
+    assert System.load(path) == system
+
+
+def test_round_trip_unsimulated(tmp_path):
+    system = System.example()
+
+    path = tmp_path / "unsimulated.trace"
+    system.save(path)
+
+    assert System.load(path) == system
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_round_trip_continuized(tmp_path, mmap: bool):
+    system = simulate(System.example(), continuous=True)
+
+    path = tmp_path / "continuized.trace"
+    system.save(path)
+    loaded = load_trace(path, System, mmap=mmap)
+
+    assert loaded == system
+    for ball in loaded.balls.values():
+        assert ball.history_cts.is_buffered
+        assert not ball.history.is_buffered
+
+    # Memory-mapped histories can still be added to
+    history = loaded.balls["cue"].history_cts
+    history.add(history[-1].copy())
+    assert len(history) == len(system.balls["cue"].history_cts) + 1
+
+
+def test_drop_continuized_history(tmp_path):
+    system = simulate(System.example(), continuous=True)
+
+    path = tmp_path / "drop.trace"
+    system.save(path, drop_continuized_history=True)
+    loaded = System.load(path)
+
+    assert system.continuized
+    assert not loaded.continuized
+    assert loaded.events == system.events
+
+
+def test_read_trace(tmp_path):
+    system = simulate(System.example())
+
+    path = tmp_path / "columns.trace"
+    system.save(path)
+    _, arrays = read_trace(path, mmap=True)
+
+    np.testing.assert_array_equal(
+        arrays["event_time"], [event.time for event in system.events]
+    )
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_round_trip_buffer(lazy: bool):
+    system = simulate(System.example(), continuous=True)
+
+    trace = encode_trace(system)
+    buffer = bytearray(trace.nbytes)
+    assert trace.write_into(buffer) == trace.nbytes
+
+    # Writing into a buffer produces the same bytes as writing to a file
+    fp = io.BytesIO()
+    assert write_trace(system, fp) == trace.nbytes
+    assert fp.getvalue() == buffer
+
+    # Nothing the loaded system holds is a view of the buffer
+    view = memoryview(buffer)
+    loaded = load_trace_buffer(view, System, lazy=lazy)
+    view.release()
+    buffer[:] = bytes(len(buffer))
+    assert loaded == system
+
+
+def test_not_a_trace(tmp_path):
+    path = tmp_path / "bogus.trace"
+    path.write_bytes(b"not a trace file")
+
+    with pytest.raises(ValueError):
+        System.load(path)
+
+
+def test_lazy_load(tmp_path):
+    system = simulate(System.example())
+
+    path = tmp_path / "lazy.trace"
+    system.save(path)
+    loaded = System.load(path, lazy=True)
+
+    agents = [agent for event in loaded.events for agent in event.agents]
+    assert not any(agent.decoded for agent in agents)
+    assert [event.ids for event in loaded.events] == [
+        event.ids for event in system.events
+    ]
+
+    # Comparing doesn't keep the states
+    assert loaded == system
+    assert not any(agent.decoded for agent in agents)
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_lazy_load_states_are_independent(tmp_path, mmap: bool):
+    system = simulate(System.example())
+
+    path = tmp_path / "lazy.trace"
+    system.save(path)
+    loaded = load_trace(path, System, mmap=mmap, lazy=True)
+
+    event = next(e for e in loaded.events if e.event_type.has_ball())
+    agent = next(a for a in event.agents if a.agent_type == AgentType.BALL)
+
+    # Peeked states don't share memory with the trace's arrays, so they can be
+    # modified (even if the arrays are read-only) without modifying the agent
+    ball, _ = agent.peek()
+    assert isinstance(ball, Ball)
+    ball.state.rvw[0] = [0, 0, 0]
+    assert agent.peek()[0] == event.get_ball(agent.id) != ball